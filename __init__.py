@@ -8,9 +8,21 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_PIN, DOMAIN
+from .const import (
+    CONF_KEEP_ALIVE,
+    CONF_MAX_CONCURRENCY,
+    CONF_PIN,
+    CONF_POLL_MODE,
+    CONF_STALE_LIMIT,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POLL_MODE,
+    DEFAULT_STALE_LIMIT,
+    DOMAIN,
+    WRITE_DELAY,
+)
 from .coordinator import ProAirCoordinator
-from .proair_lib import ProAir
+from .proair_lib import AsyncProAir, ProAirFleet
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,24 +39,63 @@ type ProAirConfigEntry = ConfigEntry[ProAirCoordinator]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ProAirConfigEntry) -> bool:
     """Set up ProAir from a config entry."""
-    proair = ProAir(
+    # Un'unica flotta per tutte le centraline: trasporto condiviso per host,
+    # limite globale di comandi in corso e polling sfasati
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = ProAirFleet()
+    fleet: ProAirFleet = hass.data[DOMAIN]
+    proair = fleet.add_unit(
         host=entry.data[CONF_HOST],
         port=entry.data[CONF_PORT],
         pin=entry.data[CONF_PIN],
+        keep_alive=entry.options.get(CONF_KEEP_ALIVE, DEFAULT_KEEP_ALIVE),
+        max_concurrency=int(
+            entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        ),
+        write_delay=WRITE_DELAY,
     )
 
-    coordinator = ProAirCoordinator(hass, proair)
+    coordinator = ProAirCoordinator(
+        hass,
+        proair,
+        poll_mode=entry.options.get(CONF_POLL_MODE, DEFAULT_POLL_MODE),
+        fleet=fleet,
+        stale_limit=float(entry.options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT)),
+    )
+    entry.async_on_unload(proair.add_metrics_listener(coordinator.stats.add))
 
     # Primo fetch dei dati
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await _async_remove_unit(hass, proair)
+        raise
 
     entry.runtime_data = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ProAirConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        await _async_remove_unit(hass, entry.runtime_data.proair)
+    return unload_ok
+
+
+async def _async_remove_unit(hass: HomeAssistant, proair: AsyncProAir) -> None:
+    """Remove a unit from the fleet, dropping the fleet with the last one."""
+    fleet: ProAirFleet = hass.data[DOMAIN]
+    await fleet.remove_unit(proair)
+    if not len(fleet):
+        hass.data.pop(DOMAIN)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ProAirConfigEntry) -> None:
+    """Reload the config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
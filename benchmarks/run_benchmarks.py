@@ -0,0 +1,441 @@
+"""Benchmark di protocollo, parsing e cicli di polling della libreria ProAir.
+
+Misura:
+  - build:  costruzione dei comandi JSON (build_*)
+  - decode: decodifica delle risposte del corpus (codec della libreria e json)
+  - parse:  ControlUnit/Zone.from_status_json sul corpus (completo e ridotto),
+            confrontato con il parser originale (baseline_parse)
+  - poll:   ciclo di polling end-to-end con AsyncProAir contro il simulatore
+            locale (FakeProAirServer) a 1, 8, 32 e 64 zone, nelle modalità
+            full (stato + stato_zona per zona), reduced (stato_r) e sync
+
+I risultati vengono scritti in JSON, per confrontarli tra una release e l'altra:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --quick --filter parse
+    python benchmarks/run_benchmarks.py --filter parse --check
+
+Con --check il comando termina con errore se un parse è più lento del
+parser originale oltre PARSE_TOLERANCE.
+
+Il corpus in benchmarks/corpus/ contiene risposte nel formato del firmware
+(stato, stato_r, stato_zona, stato_sync), una per riga come arrivano dal
+socket; si rigenera con --write-corpus.
+"""
+
+# asyncio (e quindi select/selectors) va importato prima di aggiungere la root
+# del repo al path: la piattaforma select.py dell'integrazione nasconderebbe
+# il modulo select della libreria standard.
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+sys.path.append(str(ROOT))
+
+from proair_lib import AsyncProAir  # noqa: E402
+from proair_lib.models import ControlUnit, Zone  # noqa: E402
+from proair_lib.protocol import CommandTemplates, RateLimiter, codec  # noqa: E402
+from proair_lib.protocol.commands import (  # noqa: E402
+    CMD_STATO,
+    CMD_STATO_R,
+    CMD_STATO_SYNC,
+    CMD_STATO_ZONA,
+    DEFAULT_PIN,
+    build_get_stato,
+    build_get_stato_zona,
+    build_upd_cu,
+    build_upd_zona,
+)
+from proair_lib.testing import FakeProAirServer  # noqa: E402
+
+ZONE_COUNTS = (1, 8, 32, 64)
+POLL_MODES = ("full", "reduced", "sync")
+
+# Il simulatore non ha bisogno di protezione: la cadenza dei comandi non
+# deve entrare nelle misure
+UNPACED = {"rate": 1e6, "burst": 1000, "min_interval": 0.0}
+
+# Margine sul parser originale per --check, sui tempi minimi (meno
+# sensibili al rumore della mediana)
+PARSE_TOLERANCE = 1.10
+
+
+class Bench:
+    """Raccoglie i tempi dei singoli benchmark."""
+
+    def __init__(self, quick: bool, name_filter: str | None) -> None:
+        self.quick = quick
+        self.name_filter = name_filter
+        self.results: list[dict] = []
+
+    def wanted(self, name: str) -> bool:
+        return self.name_filter is None or self.name_filter in name
+
+    def record(self, name: str, group: str, samples: list[float], **extra) -> None:
+        """Registra i campioni (secondi per operazione) di un benchmark."""
+        samples = sorted(samples)
+        result = {
+            "name": name,
+            "group": group,
+            **extra,
+            "samples": len(samples),
+            "mean_us": statistics.fmean(samples) * 1e6,
+            "median_us": statistics.median(samples) * 1e6,
+            "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e6,
+            "min_us": samples[0] * 1e6,
+        }
+        self.results.append(result)
+        print(
+            f"{name:<40} median {result['median_us']:>11.1f} us"
+            f"   p95 {result['p95_us']:>11.1f} us",
+            file=sys.stderr,
+        )
+
+    def run(self, name: str, group: str, func, **extra) -> dict | None:
+        """Misura una funzione sincrona: campioni da `number` chiamate.
+
+        Ritorna il risultato registrato (None se escluso dal filtro).
+        """
+        if not self.wanted(name):
+            return None
+        number = _calibrate(func)
+        repeat = 5 if self.quick else 25
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+        self.record(name, group, samples, iterations=number * repeat, **extra)
+        return self.results[-1]
+
+
+def _calibrate(func, target: float = 0.01) -> int:
+    """Numero di chiamate per campione, in modo che duri circa target secondi."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= target or number >= 1_000_000:
+            return number
+        number *= 2
+
+
+# --- Corpus ---
+
+
+def _corpus_name(command: str, zones: int | None = None) -> str:
+    return f"{command}.json" if zones is None else f"{command}_{zones}.json"
+
+
+def write_corpus() -> None:
+    """Rigenera il corpus con il simulatore, nel formato del firmware."""
+    CORPUS_DIR.mkdir(exist_ok=True)
+    for zones in ZONE_COUNTS:
+        server = FakeProAirServer(zones=zones)
+        for command in (CMD_STATO, CMD_STATO_R):
+            response = server.handle_command({"c": command, "pin": server.pin})
+            (CORPUS_DIR / _corpus_name(command, zones)).write_text(
+                json.dumps(response) + "\n"
+            )
+
+    server = FakeProAirServer(zones=8)
+    response = server.handle_command(
+        {"c": CMD_STATO_ZONA, "pin": server.pin, "id_zona": 3}
+    )
+    (CORPUS_DIR / _corpus_name(CMD_STATO_ZONA)).write_text(json.dumps(response) + "\n")
+
+    since = server.version
+    server.set_zone_value(2, "t", 231)
+    server.set_zone_value(5, "is_off", 1)
+    server.set_cu_value("t_can", 380)
+    response = server.handle_command(
+        {"c": CMD_STATO_SYNC, "pin": server.pin, "sync": since}
+    )
+    (CORPUS_DIR / _corpus_name(CMD_STATO_SYNC)).write_text(json.dumps(response) + "\n")
+
+
+def load_corpus(command: str, zones: int | None = None) -> bytes:
+    return (CORPUS_DIR / _corpus_name(command, zones)).read_bytes().strip()
+
+
+# --- Parser originale ---
+
+
+def _baseline_zone(data: dict) -> Zone:
+    """Zone.from_status_json della prima versione, per confronto."""
+    zone = Zone()
+    zone.zone_id = data.get("id_zona", data.get("nr", 0))
+    zone.name = data.get("name", data.get("n", ""))
+    zone.is_off = bool(data.get("is_off", data.get("off", 0)))
+    zone.temp = data.get("t", 0) / 10.0
+    zone.set_temp = data.get("t_set", data.get("ts", 0)) / 10.0
+    zone.fancoil = data.get("fan", 0)
+    zone.fancoil_set = data.get("fan_set", 0)
+    zone.serranda = data.get("shu", 0)
+    zone.serranda_set = data.get("shu_set", 0)
+    zone.ev = data.get("EV", 0)
+    zone.is_crono_mode = bool(data.get("is_crono", 0))
+    zone.is_crono_active = bool(data.get("crono_on", 0))
+    raw_umd = data.get("u", 0)
+    zone.umd = int(raw_umd) / 10.0 if raw_umd else 0.0
+    raw_umd_set = data.get("u_set", data.get("us", 0))
+    zone.set_umd = int(raw_umd_set) / 10.0 if raw_umd_set else 0.0
+    zone.c_win = data.get("c_win", data.get("w", 0))
+    zone.c_badge = data.get("c_badge", data.get("b", 0))
+    zone.c_off = data.get("co", 0)
+    zone.error = data.get("err", 0)
+    return zone
+
+
+def baseline_parse(data: dict) -> ControlUnit:
+    """ControlUnit.from_status_json della prima versione, per confronto.
+
+    Stessa logica (una get con ripiego per ogni chiave, attributo per
+    attributo), sui modelli attuali.
+    """
+    cu = ControlUnit()
+    if data.get("c", "") == "stato_r":
+        cu.is_off = bool(data.get("off", 0))
+        cu.is_cooling = bool(data.get("cl", 0))
+        cu.operating_mode = data.get("cl_m", 0)
+        cu.master_nr = data.get("m_nr", 0)
+        cu.ir_present = bool(data.get("ir", 0))
+        cu.temp_can = data.get("tc", 0) / 10.0
+        cu.f_est = data.get("fe", 0)
+        cu.f_inv = data.get("fi", 0)
+    else:
+        cu.is_off = bool(data.get("is_off", 0))
+        cu.is_cooling = bool(data.get("is_cool", 0))
+        cu.operating_mode = data.get("cool_mod", 0)
+        cu.master_nr = data.get("master_nr", 0)
+        cu.ir_present = bool(data.get("ir_present", 0))
+        cu.temp_can = data.get("t_can", 0) / 10.0
+        cu.f_est = data.get("f_est", 0)
+        cu.f_inv = data.get("f_inv", 0)
+    cu.error_cu = data.get("err_cu", 0)
+    cu.zones = [_baseline_zone(z) for z in data.get("zone", [])]
+    return cu
+
+
+# --- Benchmark ---
+
+
+def bench_build(bench: Bench) -> None:
+    bench.run("build/get_stato", "build", lambda: build_get_stato(DEFAULT_PIN))
+    bench.run(
+        "build/get_stato_zona", "build", lambda: build_get_stato_zona(DEFAULT_PIN, 3)
+    )
+    bench.run(
+        "build/upd_cu",
+        "build",
+        lambda: build_upd_cu(DEFAULT_PIN, False, True, 2, 35.0, 0, 0),
+    )
+    bench.run(
+        "build/upd_zona",
+        "build",
+        lambda: build_upd_zona(DEFAULT_PIN, 3, "Zona 3", False, 21.5, 0, 0),
+    )
+
+    templates = CommandTemplates(DEFAULT_PIN)
+    bench.run(
+        "template/get_stato_zona", "build", lambda: templates.get_stato_zona(3)
+    )
+    bench.run(
+        "template/get_stato_sync", "build", lambda: templates.get_stato_sync(1234)
+    )
+    bench.run(
+        "template/upd_cu",
+        "build",
+        lambda: templates.upd_cu(False, True, 2, 35.0, 0, 0),
+    )
+    bench.run(
+        "template/upd_zona",
+        "build",
+        lambda: templates.upd_zona(3, "Zona 3", False, 21.5, 0, 0),
+    )
+
+
+def bench_decode_parse(bench: Bench) -> list[dict]:
+    """Ritorna i parse più lenti del parser originale oltre PARSE_TOLERANCE."""
+    regressions = []
+    for zones in ZONE_COUNTS:
+        for command, label in ((CMD_STATO, "full"), (CMD_STATO_R, "reduced")):
+            raw = load_corpus(command, zones)
+            data = json.loads(raw)
+            extra = {"zones": zones, "format": label, "bytes": len(raw)}
+            view = memoryview(bytearray(raw))
+            bench.run(
+                f"decode/{label}/{zones}",
+                "decode",
+                lambda v=view: codec.loads(v),
+                backend=codec.BACKEND,
+                **extra,
+            )
+            bench.run(
+                f"decode_stdlib/{label}/{zones}",
+                "decode",
+                lambda r=raw: json.loads(r),
+                backend="json",
+                **extra,
+            )
+            parsed = bench.run(
+                f"parse/{label}/{zones}",
+                "parse",
+                lambda d=data: ControlUnit.from_status_json(d),
+                **extra,
+            )
+            baseline = bench.run(
+                f"parse/{label}/{zones}/baseline",
+                "parse",
+                lambda d=data: baseline_parse(d),
+                **extra,
+            )
+            if parsed is not None and baseline is not None:
+                ratio = parsed["min_us"] / baseline["min_us"]
+                parsed["vs_baseline"] = round(ratio, 3)
+                print(f"{'':<40} {ratio:.2f}x il parser originale", file=sys.stderr)
+                if ratio > PARSE_TOLERANCE:
+                    regressions.append(parsed)
+            bench.run(
+                f"decode+parse/{label}/{zones}",
+                "parse",
+                lambda v=view: ControlUnit.from_status_json(codec.loads(v)),
+                **extra,
+            )
+
+    zone_data = json.loads(load_corpus(CMD_STATO_ZONA))["zone"][0]
+    bench.run("parse/zone", "parse", lambda: Zone.from_status_json(zone_data))
+
+    sync_data = json.loads(load_corpus(CMD_STATO_SYNC))
+    base = ControlUnit.from_status_json(json.loads(load_corpus(CMD_STATO, 8)))
+
+    def apply_sync() -> None:
+        base.copy().apply_delta(sync_data)
+
+    bench.run("parse/sync_delta/8", "parse", apply_sync, zones=8)
+    return regressions
+
+
+async def _poll_once(proair: AsyncProAir, mode: str) -> None:
+    """Un ciclo di polling, come lo esegue il coordinator per ogni modalità."""
+    if mode == "full":
+        cu = await proair.get_status()
+        await proair.get_zones_status(z.zone_id for z in cu.zones)
+    elif mode == "reduced":
+        await proair.get_status_reduced()
+    else:
+        await proair.get_status_sync()
+
+
+async def bench_poll(bench: Bench, latency: float, keep_alive: bool) -> None:
+    cycles = 5 if bench.quick else 30
+    for zones in ZONE_COUNTS:
+        for mode in POLL_MODES:
+            name = f"poll/{mode}/{zones}"
+            if not bench.wanted(name):
+                continue
+            async with FakeProAirServer(
+                zones=zones, latency=latency, keep_alive=keep_alive
+            ) as server:
+                proair = AsyncProAir(
+                    server.host,
+                    server.port,
+                    server.pin,
+                    keep_alive=keep_alive,
+                    rate_limiter=RateLimiter(**UNPACED),
+                )
+                try:
+                    # Primo ciclo fuori misura: prime connessioni e token sync
+                    await proair.get_status()
+                    samples = []
+                    for _ in range(cycles):
+                        start = time.perf_counter()
+                        await _poll_once(proair, mode)
+                        samples.append(time.perf_counter() - start)
+                finally:
+                    await proair.close()
+                commands = sum(server.commands.values())
+            bench.record(
+                name,
+                "poll",
+                samples,
+                zones=zones,
+                mode=mode,
+                latency_s=latency,
+                keep_alive=keep_alive,
+                commands_per_cycle=round(commands / (cycles + 1), 2),
+            )
+
+
+def _metadata(args: argparse.Namespace) -> dict:
+    manifest = json.loads((ROOT / "manifest.json").read_text())
+    return {
+        "version": manifest.get("version"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "json_backend": codec.BACKEND,
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "quick": args.quick,
+        "poll_latency_s": args.latency,
+        "keep_alive": args.keep_alive,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", help="file JSON dei risultati (default stdout)")
+    parser.add_argument("--filter", "-k", help="esegue solo i benchmark che contengono il testo")
+    parser.add_argument("--quick", action="store_true", help="meno ripetizioni")
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="latenza simulata per comando nei benchmark di polling (secondi)",
+    )
+    parser.add_argument(
+        "--keep-alive", action="store_true", help="polling con connessioni persistenti"
+    )
+    parser.add_argument(
+        "--write-corpus", action="store_true", help="rigenera il corpus ed esce"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="errore se un parse è più lento del parser originale",
+    )
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        write_corpus()
+        return 0
+
+    bench = Bench(args.quick, args.filter)
+    bench_build(bench)
+    regressions = bench_decode_parse(bench)
+    asyncio.run(bench_poll(bench, args.latency, args.keep_alive))
+
+    report = json.dumps({"meta": _metadata(args), "results": bench.results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+    else:
+        print(report)
+    if args.check and regressions:
+        for result in regressions:
+            print(
+                f"{result['name']}: {result['vs_baseline']:.2f}x il parser originale",
+                file=sys.stderr,
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,14 +12,11 @@ from homeassistant.components.climate import (
 )
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ProAirConfigEntry
 from .const import (
     DAMPER_TO_HA_FAN,
-    DOMAIN,
     FAN_MODE_AUTO,
     FAN_MODE_HIGH,
     FAN_MODE_LOW,
@@ -27,6 +24,7 @@ from .const import (
     HA_FAN_TO_DAMPER,
 )
 from .coordinator import ProAirCoordinator
+from .entity import ProAirZoneEntity
 from .proair_lib.models.control_unit import (
     MODE_COOLING,
     MODE_DEHUMIDIFY,
@@ -43,6 +41,7 @@ CU_MODE_TO_HVAC = {
     MODE_DEHUMIDIFY: HVACMode.DRY,
     MODE_VENTILATION: HVACMode.FAN_ONLY,
 }
+HVAC_TO_CU_MODE = {hvac: mode for mode, hvac in CU_MODE_TO_HVAC.items()}
 
 
 async def async_setup_entry(
@@ -61,10 +60,10 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class ProAirClimate(CoordinatorEntity[ProAirCoordinator], ClimateEntity):
+class ProAirClimate(ProAirZoneEntity, ClimateEntity):
     """Climate entity for a ProAir zone."""
 
-    _attr_has_entity_name = True
+    _uses_cu_data = True
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_min_temp = 10.0
     _attr_max_temp = 35.0
@@ -92,19 +91,10 @@ class ProAirClimate(CoordinatorEntity[ProAirCoordinator], ClimateEntity):
         zone_id: int,
     ) -> None:
         """Initialize the climate entity."""
-        super().__init__(coordinator)
-        self._zone_id = zone_id
+        super().__init__(coordinator, zone_id)
         self._attr_unique_id = f"{entry.data['host']}_{zone_id}_climate"
         self._attr_translation_key = "zone_climate"
 
-    @property
-    def _zone(self):
-        """Get the zone data from coordinator."""
-        for z in self.coordinator.data.zones:
-            if z.zone_id == self._zone_id:
-                return z
-        return None
-
     @property
     def _cu(self):
         """Get the control unit data from coordinator."""
@@ -118,20 +108,6 @@ class ProAirClimate(CoordinatorEntity[ProAirCoordinator], ClimateEntity):
             return zone.name
         return f"Zone {self._zone_id}"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this zone."""
-        host = self.coordinator.proair.host
-        zone = self._zone
-        zone_name = zone.name if zone else f"Zone {self._zone_id}"
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{host}_zone_{self._zone_id}")},
-            name=f"ProAir {zone_name}",
-            manufacturer="Tecnosystemi",
-            model="ProAir Zone",
-            via_device=(DOMAIN, host),
-        )
-
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current HVAC mode."""
@@ -174,65 +150,67 @@ class ProAirClimate(CoordinatorEntity[ProAirCoordinator], ClimateEntity):
         temp = kwargs.get(ATTR_TEMPERATURE)
         if temp is None:
             return
-        await self.hass.async_add_executor_job(
-            self.coordinator.proair.set_zone_temperature, self._zone_id, temp
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_zone_temperature(self._zone_id, temp),
+            self._zone_id,
+            zone_fields={"set_temp": temp},
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new HVAC mode."""
-        proair = self.coordinator.proair
-
         if hvac_mode == HVACMode.OFF:
-            await self.hass.async_add_executor_job(
-                proair.set_zone_off, self._zone_id
-            )
-        elif hvac_mode == HVACMode.HEAT:
-            # Accendi zona + CU + imposta riscaldamento
-            await self.hass.async_add_executor_job(proair.set_heating_mode)
-            await self.hass.async_add_executor_job(proair.set_cu_on)
-            await self.hass.async_add_executor_job(
-                proair.set_zone_on, self._zone_id
-            )
-        elif hvac_mode == HVACMode.COOL:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 1)
-            await self.hass.async_add_executor_job(proair.set_cu_on)
-            await self.hass.async_add_executor_job(
-                proair.set_zone_on, self._zone_id
-            )
-        elif hvac_mode == HVACMode.DRY:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 2)
-            await self.hass.async_add_executor_job(proair.set_cu_on)
-            await self.hass.async_add_executor_job(
-                proair.set_zone_on, self._zone_id
-            )
-        elif hvac_mode == HVACMode.FAN_ONLY:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 3)
-            await self.hass.async_add_executor_job(proair.set_cu_on)
-            await self.hass.async_add_executor_job(
-                proair.set_zone_on, self._zone_id
-            )
-
-        await self.coordinator.async_request_refresh()
+            await self.async_turn_off()
+            return
+
+        mode = HVAC_TO_CU_MODE.get(hvac_mode)
+        if mode is None:
+            return
+        # Accendi CU + imposta la modalità (un solo upd_cu), poi la zona se spenta
+        zone = self._zone
+        zone_is_off = zone is None or zone.is_off
+        await self.coordinator.async_write(
+            self._async_turn_on_with_mode(mode, zone_is_off),
+            self._zone_id,
+            zone_fields={"is_off": False},
+            cu_fields={
+                "is_off": False,
+                "is_cooling": mode != MODE_HEATING,
+                "operating_mode": mode,
+            },
+        )
+
+    async def _async_turn_on_with_mode(self, mode: int, zone_is_off: bool) -> None:
+        """Turn on the CU in the given mode, then the zone if it is off."""
+        proair = self.coordinator.proair
+        await proair.apply_cu_state(
+            is_off=False,
+            is_cooling=mode != MODE_HEATING,
+            operating_mode=mode,
+        )
+        if zone_is_off:
+            await proair.set_zone_on(self._zone_id)
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new fan mode (maps to damper opening)."""
         damper_value = HA_FAN_TO_DAMPER.get(fan_mode, 7)
-        await self.hass.async_add_executor_job(
-            self.coordinator.proair.set_zone_damper, self._zone_id, damper_value
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_zone_damper(self._zone_id, damper_value),
+            self._zone_id,
+            zone_fields={"serranda_set": damper_value},
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_on(self) -> None:
         """Turn the zone on."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.proair.set_zone_on, self._zone_id
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_zone_on(self._zone_id),
+            self._zone_id,
+            zone_fields={"is_off": False},
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self) -> None:
         """Turn the zone off."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.proair.set_zone_off, self._zone_id
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_zone_off(self._zone_id),
+            self._zone_id,
+            zone_fields={"is_off": True},
         )
-        await self.coordinator.async_request_refresh()
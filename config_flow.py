@@ -7,11 +7,38 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+)
 
-from .const import CONF_PIN, DEFAULT_PIN, DEFAULT_PORT, DOMAIN
-from .proair_lib import ProAir
+from .const import (
+    CONF_KEEP_ALIVE,
+    CONF_MAX_CONCURRENCY,
+    CONF_PIN,
+    CONF_POLL_MODE,
+    CONF_STALE_LIMIT,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PIN,
+    DEFAULT_POLL_MODE,
+    DEFAULT_PORT,
+    DEFAULT_STALE_LIMIT,
+    DOMAIN,
+    POLL_MODES,
+)
+from .proair_lib import AsyncProAir
 from .proair_lib.protocol.socket_client import SocketError
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,6 +57,12 @@ class ProAirConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> ProAirOptionsFlow:
+        """Get the options flow for this handler."""
+        return ProAirOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -46,9 +79,9 @@ class ProAirConfigFlow(ConfigFlow, domain=DOMAIN):
             self._abort_if_unique_id_configured()
 
             # Tenta connessione e verifica PIN
-            proair = ProAir(host, port, pin)
+            proair = AsyncProAir(host, port, pin)
             try:
-                pin_ok = await self.hass.async_add_executor_job(proair.check_pin)
+                pin_ok = await proair.check_pin()
             except SocketError:
                 errors["base"] = "cannot_connect"
             except Exception:
@@ -68,3 +101,51 @@ class ProAirConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class ProAirOptionsFlow(OptionsFlow):
+    """Handle ProAir options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_KEEP_ALIVE,
+                    default=options.get(CONF_KEEP_ALIVE, DEFAULT_KEEP_ALIVE),
+                ): bool,
+                vol.Optional(
+                    CONF_POLL_MODE,
+                    default=options.get(CONF_POLL_MODE, DEFAULT_POLL_MODE),
+                ): SelectSelector(
+                    SelectSelectorConfig(options=POLL_MODES, translation_key=CONF_POLL_MODE)
+                ),
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY,
+                    default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=1, max=8, step=1, mode=NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Optional(
+                    CONF_STALE_LIMIT,
+                    default=options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0,
+                        max=3600,
+                        step=30,
+                        unit_of_measurement="s",
+                        mode=NumberSelectorMode.BOX,
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
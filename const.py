@@ -6,6 +6,27 @@ DEFAULT_PIN = "0000"
 
 CONF_PIN = "pin"
 
+# Scritture ravvicinate (slider, termostato) entro questa finestra vengono unite
+WRITE_DELAY = 0.4  # secondi
+
+# Opzioni
+CONF_KEEP_ALIVE = "keep_alive"
+DEFAULT_KEEP_ALIVE = False
+CONF_POLL_MODE = "poll_mode"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_MAX_CONCURRENCY = 4
+# Per quanto tempo (secondi) l'ultimo stato letto resta valido se la centralina
+# non risponde, prima che le entità diventino non disponibili
+CONF_STALE_LIMIT = "stale_limit"
+DEFAULT_STALE_LIMIT = 300
+
+# Modalità di polling
+POLL_MODE_FULL = "full"          # stato + stato_zona per ogni zona
+POLL_MODE_REDUCED = "reduced"    # stato_r, con un polling completo ogni tanto
+POLL_MODE_SYNC = "sync"          # stato_sync (solo variazioni), idem
+POLL_MODES = [POLL_MODE_FULL, POLL_MODE_REDUCED, POLL_MODE_SYNC]
+DEFAULT_POLL_MODE = POLL_MODE_FULL
+
 # Mappatura fan_mode HA <-> valore serranda
 FAN_MODE_AUTO = "auto"
 FAN_MODE_LOW = "low"
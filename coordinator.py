@@ -2,27 +2,203 @@
 
 from __future__ import annotations
 
+from collections import Counter, deque
+from collections.abc import Awaitable
 from datetime import timedelta
 import logging
+import statistics
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .proair_lib import ProAir, ProAirError
+from .const import (
+    DEFAULT_POLL_MODE,
+    DEFAULT_STALE_LIMIT,
+    POLL_MODE_FULL,
+    POLL_MODE_SYNC,
+)
+from .proair_lib import AsyncProAir, CommandMetrics, ProAirError, ProAirFleet
 from .proair_lib.models import ControlUnit, Zone
 from .proair_lib.protocol.socket_client import SocketError
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=30)
+# Polling adattivo: veloce dopo un comando o una variazione delle impostazioni,
+# poi rallenta
+FAST_SCAN_INTERVAL = timedelta(seconds=5)
+IDLE_SCAN_INTERVAL = timedelta(seconds=120)
+FAILURE_SCAN_INTERVAL = timedelta(minutes=5)   # massimo con centralina in errore
+FAST_WINDOW = 60.0                              # secondi di polling veloce
+# In modalità ridotta/sync, un polling completo (stato + stato_zona) ogni N cicli
+FULL_POLL_EVERY = 10
+# Comandi considerati per le statistiche di latenza
+STATS_WINDOW = 200
+# Contesto dei listener che dipendono dai campi della centralina; le entità
+# di zona usano come contesto lo zone_id, quelle senza contesto ricevono
+# sempre l'aggiornamento
+CONTEXT_CU = "cu"
+# Campi impostati dall'utente (anche da app o pannello): una loro variazione
+# conta come attività. Temperature e umidità misurate cambiano quasi a ogni
+# polling e non la contano.
+_ACTIVITY_CU_FIELDS = ("is_off", "is_cooling", "operating_mode", "temp_can")
+_ACTIVITY_ZONE_FIELDS = (
+    "is_off",
+    "set_temp",
+    "set_umd",
+    "fancoil_set",
+    "serranda_set",
+    "is_crono_mode",
+)
+
+
+class AdaptivePollScheduler:
+    """Calcola l'intervallo di polling in base all'attività recente.
+
+    Per FAST_WINDOW secondi dopo un comando o una variazione rilevata delle
+    impostazioni (accensione, modalità, temperature impostate) usa
+    l'intervallo veloce, poi lo raddoppia a ogni polling fino a quello di
+    riposo. Con la centralina in errore raddoppia fino a FAILURE_SCAN_INTERVAL.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.interval = SCAN_INTERVAL
+        self.failures = 0
+        self._last_activity: float | None = None
+
+    def note_activity(self) -> None:
+        """Registra un comando inviato o una variazione delle impostazioni."""
+        self._last_activity = time.monotonic()
+
+    def next_interval(self, success: bool) -> timedelta:
+        """Intervallo fino al prossimo polling, dato l'esito di quello appena fatto."""
+        if not success:
+            self.failures += 1
+            self.interval = min(
+                max(self.interval, SCAN_INTERVAL) * 2, FAILURE_SCAN_INTERVAL
+            )
+        else:
+            self.failures = 0
+            if (
+                self._last_activity is not None
+                and time.monotonic() - self._last_activity < FAST_WINDOW
+            ):
+                self.interval = FAST_SCAN_INTERVAL
+            else:
+                self.interval = min(self.interval * 2, IDLE_SCAN_INTERVAL)
+        return self.interval
+
+
+class CommandStats:
+    """Statistiche mobili sugli ultimi STATS_WINDOW comandi inviati."""
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        """Initialize the statistics."""
+        self._recent: deque[CommandMetrics] = deque(maxlen=window)
+        self.total = 0
+        self.failures: Counter[str] = Counter()
+
+    @callback
+    def add(self, metrics: CommandMetrics) -> None:
+        """Registra le misure di un comando (listener di AsyncProAir)."""
+        self._recent.append(metrics)
+        self.total += 1
+        if not metrics.success:
+            self.failures[metrics.error or "unknown"] += 1
+
+    def latency_percentile(self, percent: int) -> float | None:
+        """Percentile della latenza dei comandi riusciti, in millisecondi."""
+        latencies = [m.total for m in self._recent if m.success]
+        if not latencies:
+            return None
+        if len(latencies) == 1:
+            return latencies[0] * 1000
+        return (
+            statistics.quantiles(latencies, n=100, method="inclusive")[percent - 1]
+            * 1000
+        )
+
+    @property
+    def success_rate(self) -> float | None:
+        """Percentuale di comandi riusciti nella finestra."""
+        if not self._recent:
+            return None
+        ok = sum(1 for m in self._recent if m.success)
+        return ok * 100 / len(self._recent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Riepilogo per i diagnostics."""
+        recent = list(self._recent)
+        return {
+            "commands_total": self.total,
+            "window": len(recent),
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p95_ms": self.latency_percentile(95),
+            "success_rate": self.success_rate,
+            "retries": sum(m.retries for m in recent),
+            "token_wait_ms": _ms(sum(m.wait for m in recent)),
+            "failures": dict(self.failures),
+            "per_command": _per_command(recent),
+            "last_commands": [_metrics_dict(m) for m in recent[-20:]],
+        }
+
+
+def _per_command(recent: list[CommandMetrics]) -> dict[str, dict[str, Any]]:
+    """Conteggi e latenza mediana per tipo di comando."""
+    by_command: dict[str, list[CommandMetrics]] = {}
+    for m in recent:
+        by_command.setdefault(m.command, []).append(m)
+    return {
+        command: {
+            "count": len(items),
+            "failed": sum(1 for m in items if not m.success),
+            "median_ms": (
+                statistics.median(m.total for m in items if m.success) * 1000
+                if any(m.success for m in items)
+                else None
+            ),
+        }
+        for command, items in by_command.items()
+    }
+
+
+def _metrics_dict(m: CommandMetrics) -> dict[str, Any]:
+    return {
+        "command": m.command,
+        "success": m.success,
+        "res": m.res,
+        "error": m.error,
+        "attempts": m.attempts,
+        "reused": m.reused,
+        "timeout_ms": _ms(m.timeout),
+        "connect_ms": _ms(m.connect_time),
+        "ttfb_ms": _ms(m.ttfb),
+        "total_ms": _ms(m.total),
+        "wait_ms": _ms(m.wait),
+        "bytes_out": m.bytes_out,
+        "bytes_in": m.bytes_in,
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
 
 
 class ProAirCoordinator(DataUpdateCoordinator[ControlUnit]):
     """Coordinator per il polling dello stato della centralina ProAir."""
 
-    def __init__(self, hass: HomeAssistant, proair: ProAir) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        proair: AsyncProAir,
+        poll_mode: str = DEFAULT_POLL_MODE,
+        fleet: ProAirFleet | None = None,
+        stale_limit: float = DEFAULT_STALE_LIMIT,
+    ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
@@ -31,34 +207,303 @@ class ProAirCoordinator(DataUpdateCoordinator[ControlUnit]):
             update_interval=SCAN_INTERVAL,
         )
         self.proair = proair
+        self.poll_mode = poll_mode
+        self.fleet = fleet
+        self._polls_since_full = 0
+        self.scheduler = AdaptivePollScheduler()
+        self.stats = CommandStats()
+        self.last_cycle_duration: float | None = None   # secondi
+        # Con la centralina non raggiungibile si continua a servire l'ultimo
+        # stato letto per stale_limit secondi
+        self.stale_limit = stale_limit
+        self.stale = False
+        self._last_success: float | None = None         # time.monotonic()
+        # Valori scritti in attesa di conferma: (zone_id o None per la CU, campo)
+        # -> (valore, istante di conferma della scrittura o None se in corso)
+        self._expected: dict[tuple[int | None, str], tuple[Any, float | None]] = {}
+        # Valori precedenti alle scritture in corso, da ripristinare se
+        # falliscono: (zone_id o None, campo) -> (valore, scritture in corso).
+        # Con più scritture ravvicinate (unite dal coalescer) resta il valore
+        # di prima della prima scrittura.
+        self._before_writes: dict[tuple[int | None, str], tuple[Any, int]] = {}
+        # Ultimo stato notificato alle entità, per notificare solo le variazioni
+        self._notified_data: ControlUnit | None = None
+        self._notified_success = True
 
     async def _async_update_data(self) -> ControlUnit:
         """Fetch data from the centralina."""
+        if self.fleet is not None:
+            # Non insieme ai polling delle altre centraline
+            await self.fleet.wait_poll_turn()
+        started = time.monotonic()
         try:
-            # get_status è bloccante, lo eseguiamo nel thread pool
-            cu = await self.hass.async_add_executor_job(self.proair.get_status)
-        except SocketError as err:
-            raise UpdateFailed(f"Errore di comunicazione: {err}") from err
-        except ProAirError as err:
-            # Se il PIN è errato, segnala auth failure
-            if "res=2" in str(err):
-                raise ConfigEntryAuthFailed("PIN errato") from err
-            raise UpdateFailed(f"Errore ProAir: {err}") from err
+            cu = await self._async_poll()
+        except UpdateFailed as err:
+            self.update_interval = self.scheduler.next_interval(success=False)
+            if not self._can_serve_stale(started):
+                raise
+            if not self.stale:
+                _LOGGER.warning(
+                    "%s: uso l'ultimo stato letto per al più %.0f s",
+                    err, self.stale_limit,
+                )
+                self.stale = True
+            return self.data
+        finally:
+            self.last_cycle_duration = time.monotonic() - started
 
-        # Aggiorna i dati dettagliati per ogni zona
-        updated_zones: list[Zone] = []
-        for zone in cu.zones:
-            try:
-                detailed = await self.hass.async_add_executor_job(
-                    self.proair.get_zone_status, zone.zone_id
+        if self.stale:
+            _LOGGER.info("Stato della centralina di nuovo aggiornato")
+            self.stale = False
+        self._last_success = time.monotonic()
+
+        if self._expected:
+            self._reconcile(cu, started)
+
+        if self.data is not None and _settings_changed(cu, self.data):
+            self.scheduler.note_activity()
+        self.update_interval = self.scheduler.next_interval(success=True)
+        return cu
+
+    @property
+    def data_age(self) -> float | None:
+        """Seconds since the last successful status read."""
+        if self._last_success is None:
+            return None
+        return time.monotonic() - self._last_success
+
+    def _can_serve_stale(self, now: float) -> bool:
+        """Whether the last status is recent enough to be served after a failure."""
+        return (
+            self.data is not None
+            and self._last_success is not None
+            and now - self._last_success < self.stale_limit
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose zone or control unit data changed.
+
+        A change of availability notifies every listener.
+        """
+        data = self.data
+        previous = self._notified_data
+        self._notified_data = data
+        if (
+            previous is None
+            or data is None
+            or self.last_update_success != self._notified_success
+        ):
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        cu_changed, changed = data.changes(previous)
+        if cu_changed:
+            changed.add(CONTEXT_CU)
+        for update_callback, context in list(self._listeners.values()):
+            if _wants_update(context, changed):
+                update_callback()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh after a command and poll quickly for a while."""
+        self.scheduler.note_activity()
+        await super().async_request_refresh()
+
+    async def async_write(
+        self,
+        write: Awaitable[Any],
+        zone_id: int | None = None,
+        zone_fields: dict[str, Any] | None = None,
+        cu_fields: dict[str, Any] | None = None,
+    ) -> None:
+        """Invia una scrittura mostrando subito il risultato atteso.
+
+        I campi indicati vengono applicati ai dati in cache e notificati alle
+        entità prima dell'invio; se la scrittura fallisce tornano ai valori
+        di prima delle scritture in corso sugli stessi campi. Il prossimo
+        polling (ravvicinato) conferma o corregge.
+        """
+        updates: list[tuple[int | None, dict[str, Any]]] = []
+        if cu_fields:
+            updates.append((None, cu_fields))
+        if zone_id is not None and zone_fields:
+            updates.append((zone_id, zone_fields))
+
+        self._apply_optimistic(updates)
+        try:
+            await write
+        except Exception:
+            self._apply_optimistic(self._end_write(updates), track=False)
+            raise
+        self._end_write(updates)
+
+        acked = time.monotonic()
+        for target_id, fields in updates:
+            for name in fields:
+                key = (target_id, name)
+                if key in self._expected:
+                    self._expected[key] = (self._expected[key][0], acked)
+
+        # Conferma a breve con il polling veloce
+        self.scheduler.note_activity()
+        self.update_interval = self.scheduler.next_interval(success=True)
+        self._schedule_refresh()
+
+    @callback
+    def _apply_optimistic(
+        self,
+        updates: list[tuple[int | None, dict[str, Any]]],
+        track: bool = True,
+    ) -> None:
+        """Applica i campi ai dati in cache e li notifica alle entità.
+
+        Con track=True i campi sono di una scrittura in corso: ne ricorda il
+        valore atteso e quello precedente, se non c'è già un'altra scrittura.
+        """
+        data = self.data.copy()
+        for target_id, fields in updates:
+            target = data if target_id is None else data.get_zone(target_id)
+            if target is None:
+                continue
+            for name, value in fields.items():
+                key = (target_id, name)
+                if track:
+                    before, pending = self._before_writes.get(
+                        key, (getattr(target, name), 0)
+                    )
+                    self._before_writes[key] = (before, pending + 1)
+                    self._expected[key] = (value, None)
+                else:
+                    self._expected.pop(key, None)
+                setattr(target, name, value)
+
+        self.data = data
+        self.async_update_listeners()
+
+    def _end_write(
+        self, updates: list[tuple[int | None, dict[str, Any]]]
+    ) -> list[tuple[int | None, dict[str, Any]]]:
+        """Chiude una scrittura e ritorna i valori di prima delle scritture in corso."""
+        before: list[tuple[int | None, dict[str, Any]]] = []
+        for target_id, fields in updates:
+            values: dict[str, Any] = {}
+            for name in fields:
+                key = (target_id, name)
+                if key not in self._before_writes:
+                    continue
+                value, pending = self._before_writes[key]
+                values[name] = value
+                if pending > 1:
+                    self._before_writes[key] = (value, pending - 1)
+                else:
+                    del self._before_writes[key]
+            if values:
+                before.append((target_id, values))
+        return before
+
+    def _reconcile(self, cu: ControlUnit, started: float) -> None:
+        """Confronta i valori scritti con lo stato letto dalla centralina."""
+        for key, (value, acked) in list(self._expected.items()):
+            target_id, name = key
+            target = cu if target_id is None else cu.get_zone(target_id)
+            if target is None:
+                del self._expected[key]
+                continue
+            actual = getattr(target, name)
+            if actual == value:
+                del self._expected[key]
+            elif acked is None or acked > started:
+                # Lettura partita prima della conferma: mantiene il valore atteso
+                setattr(target, name, value)
+            else:
+                _LOGGER.debug(
+                    "La centralina non conferma %s=%s (zona %s), ripristino %s",
+                    name, value, target_id, actual,
                 )
-                updated_zones.append(detailed)
-            except (SocketError, ProAirError) as err:
+                del self._expected[key]
+
+    async def _async_poll(self) -> ControlUnit:
+        """Legge lo stato secondo la modalità di polling configurata."""
+        if (
+            self.poll_mode != POLL_MODE_FULL
+            and self.data is not None
+            and self._polls_since_full < FULL_POLL_EVERY
+        ):
+            if self.poll_mode == POLL_MODE_SYNC:
+                cu = await self._async_fetch_status(self.proair.get_status_sync())
+                keep_details = self.proair.sync_fallback
+            else:
+                cu = await self._async_fetch_status(self.proair.get_status_reduced())
+                keep_details = True
+            if keep_details:
+                # stato_r/stato non hanno dettagli zona affidabili: restano quelli noti
+                cu.merge_details(self.data)
+            self._polls_since_full += 1
+            return cu
+
+        cu = await self._async_fetch_status(self.proair.get_status())
+
+        # Aggiorna i dati dettagliati per ogni zona (in parallelo)
+        results = await self.proair.get_zones_status(z.zone_id for z in cu.zones)
+        updated_zones: list[Zone] = []
+        for zone, result in zip(cu.zones, results):
+            if isinstance(result, Zone):
+                updated_zones.append(result)
+            elif isinstance(result, (SocketError, ProAirError, TimeoutError)):
                 _LOGGER.warning(
-                    "Impossibile leggere stato zona %d: %s", zone.zone_id, err
+                    "Impossibile leggere stato zona %d: %s", zone.zone_id, result
                 )
                 # Usa i dati base se il dettaglio fallisce
                 updated_zones.append(zone)
+            else:
+                raise result
 
         cu.zones = updated_zones
+        self._polls_since_full = 0
         return cu
+
+    async def _async_fetch_status(
+        self, request: Awaitable[ControlUnit]
+    ) -> ControlUnit:
+        """Attende una lettura di stato, traducendo gli errori per HA.
+
+        Ritorna una copia: lo stato letto è anche la cache write-through della
+        libreria, che non deve vedere le modifiche fatte qui (dettagli uniti,
+        valori attesi non ancora confermati).
+        """
+        try:
+            cu = await request
+        except SocketError as err:
+            raise UpdateFailed(f"Errore di comunicazione: {err}") from err
+        except ProAirError as err:
+            # Se il PIN è errato, segnala auth failure
+            if "res=2" in str(err):
+                raise ConfigEntryAuthFailed("PIN errato") from err
+            raise UpdateFailed(f"Errore ProAir: {err}") from err
+        return cu.copy()
+
+
+def _settings_changed(cu: ControlUnit, previous: ControlUnit) -> bool:
+    """Whether power, mode or setpoints differ from the previous status."""
+    if any(
+        getattr(cu, name) != getattr(previous, name) for name in _ACTIVITY_CU_FIELDS
+    ):
+        return True
+    for zone in cu.zones:
+        old = previous.get_zone(zone.zone_id)
+        if old is None or any(
+            getattr(zone, name) != getattr(old, name)
+            for name in _ACTIVITY_ZONE_FIELDS
+        ):
+            return True
+    return False
+
+
+def _wants_update(context: Any, changed: set[Any]) -> bool:
+    """Whether a listener context is affected by the changed zones/CU."""
+    if context is None:
+        return True
+    if isinstance(context, tuple):
+        return not changed.isdisjoint(context)
+    return context in changed
@@ -0,0 +1,64 @@
+"""Diagnostics support for Tecnosystemi ProAir."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+
+from . import ProAirConfigEntry
+from .const import CONF_PIN
+from .proair_lib.models import ControlUnit
+
+TO_REDACT = {CONF_PIN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ProAirConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The whole payload is redacted: the PIN is also a field of the status.
+    """
+    coordinator = entry.runtime_data
+    cu = coordinator.data
+
+    diagnostics = {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "polling": {
+            "poll_mode": coordinator.poll_mode,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_update_success": coordinator.last_update_success,
+            "last_cycle_duration": coordinator.last_cycle_duration,
+            "consecutive_failures": coordinator.scheduler.failures,
+            "stale": coordinator.stale,
+            "data_age": coordinator.data_age,
+            "stale_limit": coordinator.stale_limit,
+        },
+        "circuit_breaker": coordinator.proair.breaker.as_dict(),
+        "round_trip": coordinator.proair.rtt.as_dict(),
+        "rate_limit": (
+            coordinator.proair.rate_limiter.as_dict()
+            if coordinator.proair.rate_limiter is not None
+            else None
+        ),
+        "communication": coordinator.stats.as_dict(),
+        "status": _status_dict(cu) if cu is not None else None,
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
+
+
+def _status_dict(cu: ControlUnit) -> dict[str, Any]:
+    """Control unit snapshot without the internal zone index."""
+    status = asdict(cu)
+    status.pop("_zone_index", None)
+    return status
@@ -0,0 +1,77 @@
+"""Base entities for Tecnosystemi ProAir."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import CONTEXT_CU, ProAirCoordinator
+from .proair_lib.models import Zone
+
+
+class ProAirEntity(CoordinatorEntity[ProAirCoordinator]):
+    """Base entity attached to the ProAir control unit device.
+
+    It is only notified when the control unit fields change; pass
+    context=None to be notified after every refresh.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, coordinator: ProAirCoordinator, context: Any = CONTEXT_CU
+    ) -> None:
+        """Initialize the entity and its static device info."""
+        super().__init__(coordinator, context)
+        self._attr_device_info = self._build_device_info()
+
+    def _build_device_info(self) -> DeviceInfo:
+        """Return device info for the control unit."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.proair.host)},
+            name="ProAir Centralina",
+            manufacturer="Tecnosystemi",
+            model="ProAir",
+        )
+
+
+class ProAirZoneEntity(ProAirEntity):
+    """Base entity attached to a ProAir zone device.
+
+    The zone is resolved once per coordinator update instead of on every
+    property access. The entity is only notified when its zone changes, or
+    also when the control unit changes if _uses_cu_data is set.
+    """
+
+    _uses_cu_data = False
+
+    def __init__(self, coordinator: ProAirCoordinator, zone_id: int) -> None:
+        """Initialize the entity for a zone."""
+        self._zone_id = zone_id
+        self._zone: Zone | None = coordinator.data.get_zone(zone_id)
+        super().__init__(
+            coordinator, (zone_id, CONTEXT_CU) if self._uses_cu_data else zone_id
+        )
+
+    def _build_device_info(self) -> DeviceInfo:
+        """Return device info for this zone."""
+        host = self.coordinator.proair.host
+        zone = self._zone
+        zone_name = zone.name if zone else f"Zone {self._zone_id}"
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{host}_zone_{self._zone_id}")},
+            name=f"ProAir {zone_name}",
+            manufacturer="Tecnosystemi",
+            model="ProAir Zone",
+            via_device=(DOMAIN, host),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the zone in the new data, then write state."""
+        self._zone = self.coordinator.data.get_zone(self._zone_id)
+        super()._handle_coordinator_update()
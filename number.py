@@ -6,13 +6,11 @@ import logging
 from homeassistant.components.number import NumberDeviceClass, NumberEntity, NumberMode
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ProAirConfigEntry
-from .const import DOMAIN
 from .coordinator import ProAirCoordinator
+from .entity import ProAirEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,10 +25,9 @@ async def async_setup_entry(
     async_add_entities([ProAirCanalTempNumber(coordinator, entry)])
 
 
-class ProAirCanalTempNumber(CoordinatorEntity[ProAirCoordinator], NumberEntity):
+class ProAirCanalTempNumber(ProAirEntity, NumberEntity):
     """Number entity to set the canal temperature."""
 
-    _attr_has_entity_name = True
     _attr_device_class = NumberDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_native_min_value = 10.0
@@ -50,17 +47,6 @@ class ProAirCanalTempNumber(CoordinatorEntity[ProAirCoordinator], NumberEntity):
         self._attr_unique_id = f"{host}_canal_temp_set"
         self._attr_name = "Canal temperature setpoint"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for the control unit."""
-        host = self.coordinator.proair.host
-        return DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name="ProAir Centralina",
-            manufacturer="Tecnosystemi",
-            model="ProAir",
-        )
-
     @property
     def native_value(self) -> float | None:
         """Return the current canal temperature setpoint."""
@@ -68,7 +54,7 @@ class ProAirCanalTempNumber(CoordinatorEntity[ProAirCoordinator], NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the canal temperature."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.proair.set_canal_temperature, value
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_canal_temperature(value),
+            cu_fields={"temp_can": value},
         )
-        await self.coordinator.async_request_refresh()
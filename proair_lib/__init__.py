@@ -1,5 +1,8 @@
 """ProAir communication library (embedded sub-package)."""
 
+from .async_proair import AsyncProAir
+from .fleet import ProAirFleet
 from .proair import ProAir, ProAirError
+from .protocol.metrics import CommandMetrics
 
-__all__ = ["ProAir", "ProAirError"]
+__all__ = ["AsyncProAir", "CommandMetrics", "ProAir", "ProAirError", "ProAirFleet"]
@@ -0,0 +1,338 @@
+"""Classe facade AsyncProAir: versione asyncio di ProAir.
+
+Stessa API di ProAir, ma ogni comando è una coroutine che usa AsyncSocketClient,
+così da poter essere chiamata direttamente dall'event loop senza thread pool.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime
+from typing import Any
+
+from .coalescer import WriteCoalescer
+from .models import ControlUnit, Zone, ZoneSchedule
+from .proair import DEFAULT_MAX_STATUS_AGE, _ProAirBase
+from .protocol.async_socket_client import AsyncSocketClient
+from .protocol.commands import (
+    DEFAULT_PIN,
+    DEFAULT_PORT,
+    RES_OK,
+    build_get_fasce,
+    build_upd_date,
+)
+from .protocol.breaker import CircuitBreaker
+from .protocol.metrics import MetricsListener
+from .protocol.rate_limit import RateLimiter
+from .protocol.socket_client import SocketError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4     # letture zona in parallelo per centralina
+ZONE_STATUS_TIMEOUT = 5.0       # secondi, per singola zona (tentativi compresi)
+
+_CU_WRITE_KEY = "cu"            # chiave coalescer della centralina (le zone usano l'id)
+
+
+class AsyncProAir(_ProAirBase):
+    """Interfaccia asyncio ad alto livello per la centralina ProAir."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        pin: str = DEFAULT_PIN,
+        keep_alive: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        write_delay: float = 0.0,
+        max_status_age: float = DEFAULT_MAX_STATUS_AGE,
+        client: AsyncSocketClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        super().__init__(host, port, pin, max_status_age)
+        # Senza rate_limiter le connessioni aperte insieme sono max_concurrency.
+        # Con client dato (trasporto condiviso, vedi ProAirFleet) keep_alive,
+        # max_concurrency e rate_limiter sono quelli del client, che non viene
+        # chiuso da close()
+        self._owns_client = client is None
+        if client is None:
+            # Centralina non raggiungibile: niente tentativi per un po', poi
+            # check_pin come sonda (la risposta conta anche con PIN errato)
+            client = AsyncSocketClient(
+                host,
+                port,
+                keep_alive=keep_alive,
+                pool_size=max_concurrency,
+                breaker=CircuitBreaker(),
+                probe=self._commands.check_pin,
+                rate_limiter=rate_limiter
+                or RateLimiter(max_connections=max_concurrency),
+            )
+        self._client = client
+        self.breaker = client.breaker
+        self.rtt = client.rtt
+        self.rate_limiter = client.rate_limiter
+        self._zone_semaphore = asyncio.Semaphore(max_concurrency)
+        # Con write_delay > 0 le scritture ravvicinate vengono unite
+        self._writes = (
+            WriteCoalescer(self._flush_write, write_delay) if write_delay > 0 else None
+        )
+
+    def add_metrics_listener(self, listener: MetricsListener) -> Callable[[], None]:
+        """Registra una callback chiamata con le CommandMetrics di ogni comando.
+
+        Ritorna la funzione per rimuovere la callback.
+        """
+        return self._client.add_metrics_listener(listener)
+
+    async def close(self) -> None:
+        """Invia le scritture in attesa e chiude le connessioni persistenti."""
+        if self._writes is not None:
+            await self._writes.flush_all()
+        if self._owns_client:
+            await self._client.close()
+
+    async def check_pin(self) -> bool:
+        """Verifica che il PIN sia corretto."""
+        cmd = self._commands.check_pin
+        try:
+            resp = await self._client.send_command(cmd)
+            return resp.get("res") == RES_OK
+        except SocketError:
+            return False
+
+    async def get_status(self) -> ControlUnit:
+        """Legge lo stato completo della centralina e di tutte le zone."""
+        cmd = self._commands.get_stato
+        resp = await self._client.send_command(cmd)
+        return self._status_from_response(resp)
+
+    async def get_status_reduced(self) -> ControlUnit:
+        """Legge lo stato della centralina in formato ridotto (stato_r).
+
+        Risposta più compatta di get_status: non include fancoil, serranda,
+        elettrovalvola e crono delle zone, che restano quelli dell'ultimo stato noto.
+        """
+        cmd = self._commands.get_stato_r
+        resp = await self._client.send_command(cmd)
+        return self._reduced_status_from_response(resp)
+
+    async def get_status_sync(self) -> ControlUnit:
+        """Legge solo le variazioni rispetto all'ultimo stato noto (stato_sync).
+
+        Se non c'è uno stato precedente con un token valido, o la centralina
+        chiede una risincronizzazione o risponde con un token non valido,
+        legge lo stato completo (sync_fallback = True).
+        """
+        if self._can_sync:
+            cmd = self._commands.get_stato_sync(self._sync_token)
+            try:
+                resp = await self._client.send_command(cmd)
+            except ValueError as err:
+                logger.debug("Risposta stato_sync non decodificabile: %s", err)
+            else:
+                cu = self._sync_status_from_response(resp)
+                if cu is not None:
+                    self.sync_fallback = False
+                    return cu
+
+        self.sync_fallback = True
+        return await self.get_status()
+
+    async def get_zone_status(
+        self, zone_id: int, deadline: float | None = None
+    ) -> Zone:
+        """Legge lo stato di una singola zona, entro deadline (time.monotonic())."""
+        cmd = self._commands.get_stato_zona(zone_id)
+        resp = await self._client.send_command(cmd, deadline)
+        return self._zone_from_response(resp)
+
+    async def get_zones_status(
+        self,
+        zone_ids: Iterable[int],
+        timeout: float = ZONE_STATUS_TIMEOUT,
+    ) -> list[Zone | Exception]:
+        """Legge lo stato di più zone in parallelo.
+
+        Al più max_concurrency letture alla volta, ognuna con il proprio timeout
+        (tentativi compresi).
+        Ritorna un elemento per zona nello stesso ordine di zone_ids: la Zone
+        letta oppure l'eccezione che ne ha impedito la lettura.
+        """
+
+        async def fetch(zone_id: int) -> Zone:
+            async with self._zone_semaphore:
+                deadline = time.monotonic() + timeout
+                async with asyncio.timeout(timeout):
+                    return await self.get_zone_status(zone_id, deadline)
+
+        return await asyncio.gather(
+            *(fetch(zone_id) for zone_id in zone_ids), return_exceptions=True
+        )
+
+    async def _send_and_check(self, cmd: str) -> dict:
+        """Invia un comando e verifica che res == 1."""
+        return self._check_response(await self._client.send_command(cmd))
+
+    async def _get_current_status(self) -> ControlUnit:
+        """Ritorna l'ultimo stato noto, o lo legge se assente o troppo vecchio."""
+        cu = self._cached_status()
+        if cu is None:
+            cu = await self.get_status()
+        return cu
+
+    # --- Comandi centralina ---
+
+    async def _update_cu(self, **overrides) -> None:
+        """Invia upd_cu con lo stato corrente, sovrascrivendo i valori specificati."""
+        cu = await self._get_current_status()
+        await self._send_and_check(self._build_cu_command(cu, **overrides))
+        self._remember_cu_write(overrides)
+
+    async def _write_cu(self, **overrides: Any) -> None:
+        """Scrive sulla centralina, unendo le scritture ravvicinate se attivo."""
+        if self._writes is None:
+            await self._update_cu(**overrides)
+        else:
+            await self._writes.submit(_CU_WRITE_KEY, **overrides)
+
+    async def set_cu_on(self) -> None:
+        """Accende la centralina."""
+        await self._write_cu(is_off=False)
+
+    async def set_cu_off(self) -> None:
+        """Spegne la centralina."""
+        await self._write_cu(is_off=True)
+
+    async def set_canal_temperature(self, temp_celsius: float) -> None:
+        """Imposta la temperatura del canale."""
+        await self._write_cu(t_can=temp_celsius)
+
+    async def set_cooling_mode(self, mode: int) -> None:
+        """Imposta la modalità estiva (1=raff, 2=deum, 3=vent)."""
+        self._validate_cooling_mode(mode)
+        await self._write_cu(is_cooling=True, operating_mode=mode)
+
+    async def set_heating_mode(self) -> None:
+        """Imposta la modalità riscaldamento (invernale)."""
+        await self._write_cu(is_cooling=False, operating_mode=0)
+
+    async def apply_cu_state(
+        self,
+        is_off: bool | None = None,
+        is_cooling: bool | None = None,
+        operating_mode: int | None = None,
+    ) -> None:
+        """Imposta accensione e modalità della centralina con un solo upd_cu.
+
+        I parametri lasciati a None restano invariati. Con is_cooling=False
+        imposta il riscaldamento; con is_cooling=True operating_mode è la
+        modalità estiva (1=raff, 2=deum, 3=vent).
+        """
+        overrides = self._cu_state_overrides(is_off, is_cooling, operating_mode)
+        if overrides:
+            await self._write_cu(**overrides)
+
+    # --- Comandi zona ---
+
+    async def _get_zone_from_status(self, zone_id: int) -> Zone:
+        """Trova una zona nello stato corrente della centralina."""
+        return self._find_zone(await self._get_current_status(), zone_id)
+
+    async def _update_zone(self, zone: Zone, **overrides) -> None:
+        """Invia upd_zona con i valori della zona, sovrascrivendo quelli specificati."""
+        await self._send_and_check(self._build_zone_command(zone, **overrides))
+        self._remember_zone_write(zone.zone_id, overrides)
+
+    async def _write_zone(self, zone_id: int, **overrides: Any) -> None:
+        """Scrive su una zona, unendo le scritture ravvicinate se attivo."""
+        if self._writes is None:
+            zone = await self._get_zone_from_status(zone_id)
+            await self._update_zone(zone, **overrides)
+        else:
+            await self._writes.submit(zone_id, **overrides)
+
+    async def _flush_write(self, key: Hashable, overrides: dict[str, Any]) -> None:
+        """Invia una scrittura unificata dal coalescer."""
+        if key == _CU_WRITE_KEY:
+            await self._update_cu(**overrides)
+        else:
+            zone = await self._get_zone_from_status(key)
+            await self._update_zone(zone, **overrides)
+
+    async def set_zone_temperature(self, zone_id: int, temp_celsius: float) -> None:
+        """Imposta la temperatura target di una zona."""
+        await self._write_zone(zone_id, set_temp=temp_celsius)
+
+    async def set_zone_on(self, zone_id: int) -> None:
+        """Accende una zona."""
+        await self._write_zone(zone_id, is_off=False)
+
+    async def set_zone_off(self, zone_id: int) -> None:
+        """Spegne una zona."""
+        await self._write_zone(zone_id, is_off=True)
+
+    async def set_zone_fancoil(self, zone_id: int, speed: int) -> None:
+        """Imposta la velocità del fancoil di una zona (0, 1, 2, 3, 7=auto)."""
+        self._validate_fancoil(speed)
+        await self._write_zone(zone_id, fan_set=speed)
+
+    async def set_zone_damper(self, zone_id: int, opening: int) -> None:
+        """Imposta l'apertura della serranda di una zona (0, 1, 2, 3, 7=auto)."""
+        self._validate_damper(opening)
+        await self._write_zone(zone_id, shu_set=opening)
+
+    async def update_datetime(self, dt: datetime | None = None) -> None:
+        """Sincronizza l'orologio della centralina."""
+        cmd = build_upd_date(self.pin, dt)
+        await self._send_and_check(cmd)
+
+    # --- Fasce orarie ---
+
+    async def get_zone_schedule(
+        self, zone_id: int, refresh: bool = False
+    ) -> ZoneSchedule:
+        """Legge le fasce orarie settimanali di una zona.
+
+        Ritorna quelle in cache se già lette o scritte, salvo refresh=True.
+        """
+        schedule = self._cached_schedule(zone_id, refresh)
+        if schedule is None:
+            cmd = build_get_fasce(self.pin, zone_id)
+            resp = await self._client.send_command(cmd)
+            schedule = self._schedule_from_response(zone_id, resp)
+        return schedule
+
+    async def set_zone_schedule(
+        self, schedule: ZoneSchedule, refresh: bool = False
+    ) -> list[int]:
+        """Scrive le fasce orarie di una zona, inviando solo i giorni cambiati.
+
+        Il confronto è con le fasce in cache (lette prima se assenti, o se
+        refresh=True perché modificate da altri). Ritorna i giorni inviati.
+        """
+        await self.get_zone_schedule(schedule.zone_id, refresh)
+        days = self._changed_schedule_days(schedule)
+        for day in days:
+            await self._send_and_check(self._build_schedule_command(schedule, day))
+            self._remember_schedule_day(schedule, day)
+        return days
+
+    async def set_zone_schedules(
+        self, schedules: Iterable[ZoneSchedule], refresh: bool = False
+    ) -> dict[int, list[int]]:
+        """Scrive le fasce orarie di più zone in parallelo.
+
+        Ritorna i giorni inviati per zona. Se una zona fallisce le altre
+        vengono comunque completate, poi viene sollevato il primo errore.
+        """
+        schedules = list(schedules)
+        results = await asyncio.gather(
+            *(self.set_zone_schedule(s, refresh) for s in schedules),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return {s.zone_id: days for s, days in zip(schedules, results)}
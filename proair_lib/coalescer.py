@@ -0,0 +1,101 @@
+"""Raggruppamento delle scritture ravvicinate verso la centralina.
+
+Trascinando un termostato o uno slider arrivano molte scritture in pochi
+istanti: WriteCoalescer le accoda per chiave (una zona o la centralina),
+unisce i campi e invia solo lo stato finale quando la raffica si ferma.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_DELAY = 0.4       # secondi di quiete prima dell'invio
+MAX_WRITE_DELAY_FACTOR = 4      # invio comunque dopo delay * factor dalla prima scrittura
+
+
+class _PendingWrite:
+    """Scrittura in attesa per una chiave: campi uniti e waiter."""
+
+    __slots__ = ("fields", "future", "handle", "deadline")
+
+    def __init__(self, future: asyncio.Future, deadline: float):
+        self.fields: dict[str, Any] = {}
+        self.future = future
+        self.handle: asyncio.TimerHandle | None = None
+        self.deadline = deadline
+
+
+class WriteCoalescer:
+    """Unisce le scritture sulla stessa chiave arrivate entro una finestra breve.
+
+    flush(key, fields) viene chiamata una volta per raffica, con l'unione dei
+    campi richiesti (l'ultimo valore vince). Le scritture sulla stessa chiave
+    vengono inviate in ordine, mai in parallelo.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Hashable, dict[str, Any]], Awaitable[None]],
+        delay: float = DEFAULT_WRITE_DELAY,
+    ):
+        self._flush = flush
+        self.delay = delay
+        self._pending: dict[Hashable, _PendingWrite] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, **fields: Any) -> None:
+        """Accoda i campi per key e attende l'invio della scrittura unificata."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending.get(key)
+        if pending is None:
+            future = loop.create_future()
+            # Evita "exception was never retrieved" se tutti i chiamanti rinunciano
+            future.add_done_callback(_consume_exception)
+            pending = self._pending[key] = _PendingWrite(
+                future, now + self.delay * MAX_WRITE_DELAY_FACTOR
+            )
+        pending.fields.update(fields)
+
+        if pending.handle is not None:
+            pending.handle.cancel()
+        pending.handle = loop.call_at(
+            min(now + self.delay, pending.deadline), self._start_flush, key
+        )
+
+        await asyncio.shield(pending.future)
+
+    def _start_flush(self, key: Hashable) -> None:
+        pending = self._pending.pop(key)
+        task = asyncio.get_running_loop().create_task(self._run(key, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, pending: _PendingWrite) -> None:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            logger.debug("Scrittura unificata %s: %s", key, pending.fields)
+            try:
+                await self._flush(key, pending.fields)
+            except Exception as err:
+                pending.future.set_exception(err)
+            else:
+                pending.future.set_result(None)
+
+    async def flush_all(self) -> None:
+        """Invia subito tutte le scritture in attesa e attende il loro esito."""
+        for key, pending in list(self._pending.items()):
+            if pending.handle is not None:
+                pending.handle.cancel()
+            self._start_flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,153 @@
+"""Gestione di più centraline ProAir dallo stesso processo.
+
+ProAirFleet crea le AsyncProAir delle centraline e ne possiede il trasporto:
+- le centraline con stesso host, porta e PIN condividono un solo
+  AsyncSocketClient (connessioni, circuit breaker e stima dei tempi); il
+  PIN fa parte della chiave perché la sonda del circuit breaker è il
+  check_pin della centralina;
+- un semaforo comune limita i comandi in corso su tutte le centraline;
+- ogni host ha il proprio RateLimiter, che distanzia i tentativi verso di
+  esso anche da trasporti diversi;
+- wait_poll_turn() distanzia l'inizio dei polling delle diverse centraline,
+  che altrimenti partirebbero tutti insieme. Il ritardo si conserva nei
+  cicli successivi, perché ogni polling viene pianificato dalla fine del
+  precedente: dopo il primo giro le centraline restano sfasate.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from .async_proair import DEFAULT_MAX_CONCURRENCY, AsyncProAir
+from .protocol.async_socket_client import AsyncSocketClient
+from .protocol.breaker import CircuitBreaker
+from .protocol.commands import DEFAULT_PIN, DEFAULT_PORT, build_check_pin
+from .protocol.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 8       # comandi in corso su tutte le centraline
+MAX_POLL_SPACING = 2.0          # secondi tra l'inizio di due polling
+POLL_SPREAD = 10.0              # i polling di un giro si distribuiscono in al più 10 s
+
+
+@dataclass
+class _Transport:
+    client: AsyncSocketClient
+    users: int = 0
+
+
+class ProAirFleet:
+    """Insieme di centraline con trasporto condiviso e polling sfasati."""
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        poll_spread: float = POLL_SPREAD,
+    ):
+        self.max_in_flight = max_in_flight
+        self.poll_spread = poll_spread
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._transports: dict[tuple[str, int, str], _Transport] = {}
+        self._limiters: dict[tuple[str, int], RateLimiter] = {}
+        self._units: dict[AsyncProAir, tuple[str, int, str]] = {}
+        self._next_poll = 0.0           # time.monotonic() del prossimo turno libero
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    @property
+    def units(self) -> list[AsyncProAir]:
+        """Centraline gestite, nell'ordine di aggiunta."""
+        return list(self._units)
+
+    def add_unit(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        pin: str = DEFAULT_PIN,
+        keep_alive: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **options,
+    ) -> AsyncProAir:
+        """Crea l'AsyncProAir di una centralina sul trasporto del suo host.
+
+        keep_alive e max_concurrency valgono per il trasporto e vengono usati
+        solo dalla prima centralina di un host e PIN (max_concurrency anche come
+        max_connections del rate limiter dell'host, dalla prima centralina
+        dell'host); options va ad AsyncProAir.
+        """
+        key = (host, port, pin)
+        transport = self._transports.get(key)
+        if transport is None:
+            limiter = self._limiters.get((host, port))
+            if limiter is None:
+                limiter = self._limiters[(host, port)] = RateLimiter(
+                    max_connections=max_concurrency
+                )
+            transport = self._transports[key] = _Transport(
+                AsyncSocketClient(
+                    host,
+                    port,
+                    keep_alive=keep_alive,
+                    pool_size=max_concurrency,
+                    breaker=CircuitBreaker(),
+                    probe=build_check_pin(pin),
+                    in_flight=self._in_flight,
+                    rate_limiter=limiter,
+                )
+            )
+        else:
+            logger.debug("Trasporto condiviso per %s:%d", host, port)
+        transport.users += 1
+
+        proair = AsyncProAir(
+            host,
+            port,
+            pin,
+            max_concurrency=max_concurrency,
+            client=transport.client,
+            **options,
+        )
+        self._units[proair] = key
+        return proair
+
+    async def remove_unit(self, proair: AsyncProAir) -> None:
+        """Chiude una centralina e il suo trasporto se non è più usato."""
+        key = self._units.pop(proair, None)
+        if key is None:
+            return
+        await proair.close()
+        transport = self._transports[key]
+        transport.users -= 1
+        if transport.users == 0:
+            del self._transports[key]
+            await transport.client.close()
+            host_port = key[:2]
+            if not any(k[:2] == host_port for k in self._transports):
+                del self._limiters[host_port]
+
+    @property
+    def poll_spacing(self) -> float:
+        """Distanza minima tra l'inizio di due polling, in secondi."""
+        if not self._units:
+            return 0.0
+        return min(MAX_POLL_SPACING, self.poll_spread / len(self._units))
+
+    async def wait_poll_turn(self) -> None:
+        """Attende il proprio turno per iniziare un polling.
+
+        I polling che partirebbero insieme vengono distanziati di
+        poll_spacing secondi, nell'ordine di arrivo.
+        """
+        now = time.monotonic()
+        start = max(now, self._next_poll)
+        self._next_poll = start + self.poll_spacing
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def close(self) -> None:
+        """Chiude tutte le centraline."""
+        for proair in list(self._units):
+            await self.remove_unit(proair)
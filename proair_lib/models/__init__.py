@@ -1,2 +1,3 @@
 from .zone import Zone
 from .control_unit import ControlUnit
+from .schedule import TimeBand, ZoneSchedule
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 
-from .zone import Zone
+from .zone import Zone, _tenths, apply_fields
 
 
 # Costanti modalità operative
@@ -10,8 +10,29 @@ MODE_COOLING = 1        # Raffrescamento (is_cool=1, cool_mod=1)
 MODE_DEHUMIDIFY = 2     # Deumidificazione (is_cool=1, cool_mod=2)
 MODE_VENTILATION = 3    # Ventilazione (is_cool=1, cool_mod=3)
 
+# Campi centralina nel formato completo: chiave JSON -> (attributo, conversione),
+# per apply_delta come in zone.FULL_FIELDS
+FULL_FIELDS = {
+    "is_off": ("is_off", bool),
+    "is_cool": ("is_cooling", bool),
+    "cool_mod": ("operating_mode", None),
+    "master_nr": ("master_nr", None),
+    "ir_present": ("ir_present", bool),
+    "t_can": ("temp_can", _tenths),
+    "f_est": ("f_est", None),
+    "f_inv": ("f_inv", None),
+    "err_cu": ("error_cu", None),
+}
 
-@dataclass
+# Valori delle chiavi assenti in una risposta, per entrambi i formati
+_DEFAULTS = {
+    **{key: 0 for key in FULL_FIELDS},
+    **{key: 0 for key in ("off", "cl", "cl_m", "m_nr", "ir", "tc", "fe", "fi")},
+    "zone": (),
+}
+
+
+@dataclass(slots=True)
 class ControlUnit:
     """Modello della centralina ProAir."""
 
@@ -31,44 +52,117 @@ class ControlUnit:
     error_cu: int = 0          # Bitmask errori centralina
     master_nr: int = 0
     zones: list[Zone] = field(default_factory=list)
+    # Indice zone_id -> Zone, valido finché zones è la stessa lista indicizzata
+    _zone_index: tuple[list[Zone], dict[int, Zone]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
-    def from_status_json(cls, data: dict) -> ControlUnit:
+    def from_status_json(cls, data: dict, reduced: bool | None = None) -> ControlUnit:
         """Parsea la centralina dalla risposta JSON dello stato.
 
         Supporta sia il formato completo (stato) che ridotto (stato_r).
+        Se reduced è None il formato viene dedotto dal campo "c" della risposta.
         """
-        cu = cls()
-
-        # Determina se è formato ridotto
-        cmd = data.get("c", "")
-        is_reduced = cmd == "stato_r"
-
-        if is_reduced:
-            cu.is_off = bool(data.get("off", 0))
-            cu.is_cooling = bool(data.get("cl", 0))
-            cu.operating_mode = data.get("cl_m", 0)
-            cu.master_nr = data.get("m_nr", 0)
-            cu.ir_present = bool(data.get("ir", 0))
-            cu.temp_can = data.get("tc", 0) / 10.0
-            cu.f_est = data.get("fe", 0)
-            cu.f_inv = data.get("fi", 0)
-        else:
-            cu.is_off = bool(data.get("is_off", 0))
-            cu.is_cooling = bool(data.get("is_cool", 0))
-            cu.operating_mode = data.get("cool_mod", 0)
-            cu.master_nr = data.get("master_nr", 0)
-            cu.ir_present = bool(data.get("ir_present", 0))
-            cu.temp_can = data.get("t_can", 0) / 10.0
-            cu.f_est = data.get("f_est", 0)
-            cu.f_inv = data.get("f_inv", 0)
-
-        cu.error_cu = data.get("err_cu", 0)
-
-        # Parse zone
-        zones_data = data.get("zone", [])
-        cu.zones = [Zone.from_status_json(z) for z in zones_data]
+        if reduced is None:
+            reduced = data.get("c", "") == "stato_r"
+
+        # Come Zone.from_status_json: chiavi lette con [] e argomenti
+        # posizionali nell'ordine dei campi. L'indice delle zone lo crea
+        # get_zone() al primo uso.
+        parse_zone = Zone.from_status_json
+        try:
+            zones = [parse_zone(z, reduced) for z in data["zone"]]
+            if reduced:
+                tc = data["tc"]
+                return cls(
+                    "", "", "",                 # serial, name, fw_ver
+                    bool(data["off"]),
+                    bool(data["cl"]),
+                    data["cl_m"],
+                    "", 1235, "",               # ip, port, pin
+                    tc / 10.0 if tc else 0.0,
+                    bool(data["ir"]),
+                    data["fi"],
+                    data["fe"],
+                    data["err_cu"],
+                    data["m_nr"],
+                    zones,
+                )
+            tc = data["t_can"]
+            return cls(
+                "", "", "",                     # serial, name, fw_ver
+                bool(data["is_off"]),
+                bool(data["is_cool"]),
+                data["cool_mod"],
+                "", 1235, "",                   # ip, port, pin
+                tc / 10.0 if tc else 0.0,
+                bool(data["ir_present"]),
+                data["f_inv"],
+                data["f_est"],
+                data["err_cu"],
+                data["master_nr"],
+                zones,
+            )
+        except KeyError:
+            # Chiavi mancanti: valgono i default
+            return cls.from_status_json({**_DEFAULTS, **data}, reduced)
+
+    def get_zone(self, zone_id: int) -> Zone | None:
+        """Zona con l'id dato, o None se non presente."""
+        index = self._zone_index
+        if index is None or index[0] is not self.zones or len(index[1]) != len(self.zones):
+            index = self._index_zones()
+        return index[1].get(zone_id)
 
+    def _index_zones(self) -> tuple[list[Zone], dict[int, Zone]]:
+        index = self._zone_index = (self.zones, {z.zone_id: z for z in self.zones})
+        return index
+
+    def merge_details(self, previous: ControlUnit) -> None:
+        """Completa uno stato ridotto con i dettagli zona di una lettura precedente."""
+        for zone in self.zones:
+            old = previous.get_zone(zone.zone_id)
+            if old is not None:
+                zone.merge_details(old)
+
+    def apply_delta(self, data: dict) -> bool:
+        """Applica una risposta stato_sync: aggiorna solo i campi presenti.
+
+        Ritorna False se la risposta cita zone sconosciute (serve uno stato completo).
+        """
+        for zone_data in data.get("zone", []):
+            zone = self.get_zone(zone_data.get("id_zona", zone_data.get("nr")))
+            if zone is None:
+                return False
+            zone.apply_delta(zone_data)
+
+        apply_fields(self, data, FULL_FIELDS)
+        return True
+
+    def changes(self, previous: ControlUnit) -> tuple[bool, set[int]]:
+        """Confronta con uno stato precedente, campo per campo.
+
+        Ritorna (campi della centralina cambiati, id delle zone cambiate,
+        comprese quelle aggiunte o rimosse).
+        """
+        cu_changed = any(
+            getattr(self, name) != getattr(previous, name) for name in _CU_FIELDS
+        )
+        zones = set()
+        for zone in self.zones:
+            old = previous.get_zone(zone.zone_id)
+            if old is None or old != zone:
+                zones.add(zone.zone_id)
+        for zone in previous.zones:
+            if self.get_zone(zone.zone_id) is None:
+                zones.add(zone.zone_id)
+        return cu_changed, zones
+
+    def copy(self) -> ControlUnit:
+        """Copia della centralina con copie indipendenti delle zone."""
+        cu = replace(self, zones=[z.copy() for z in self.zones])
+        cu._index_zones()
         return cu
 
     @property
@@ -91,3 +185,9 @@ class ControlUnit:
         for z in self.zones:
             lines.append(f"    {z.short_str()}")
         return "\n".join(lines)
+
+
+# Campi propri della centralina confrontati da changes()
+_CU_FIELDS = tuple(
+    f.name for f in fields(ControlUnit) if f.compare and f.name != "zones"
+)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..protocol import codec
+
+DAYS = range(1, 8)              # giorni della settimana, 1=lunedì (come upd_date)
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class TimeBand:
+    """Fascia oraria di un giorno: dalle start alle end (minuti) a set_temp °C."""
+
+    start: int
+    end: int
+    set_temp: float
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.start < self.end <= MINUTES_PER_DAY:
+            raise ValueError(
+                f"Fascia non valida: {self.start}-{self.end} "
+                f"(minuti dalla mezzanotte, 0-{MINUTES_PER_DAY})"
+            )
+
+    @classmethod
+    def from_json(cls, data: dict) -> TimeBand:
+        """Crea la fascia dal formato del protocollo (temperatura x10)."""
+        return cls(int(data["ini"]), int(data["fin"]), int(data["t_set"]) / 10.0)
+
+    def to_json(self) -> dict[str, int]:
+        """Fascia nel formato del protocollo."""
+        return {"ini": self.start, "fin": self.end, "t_set": int(self.set_temp * 10)}
+
+    def __str__(self) -> str:
+        return (
+            f"{self.start // 60:02d}:{self.start % 60:02d}-"
+            f"{self.end // 60:02d}:{self.end % 60:02d} {self.set_temp:.1f}°C"
+        )
+
+
+Day = tuple[TimeBand, ...]
+
+
+def _check_day(day: int, bands: Day) -> Day:
+    """Ordina le fasce di un giorno e verifica che non si sovrappongano."""
+    if day not in DAYS:
+        raise ValueError(f"Giorno non valido: {day} (1=lunedì ... 7=domenica)")
+    bands = tuple(sorted(bands, key=lambda band: band.start))
+    for prev, band in zip(bands, bands[1:]):
+        if band.start < prev.end:
+            raise ValueError(f"Fasce sovrapposte il giorno {day}: {prev}, {band}")
+    return bands
+
+
+@dataclass(slots=True)
+class ZoneSchedule:
+    """Programmazione settimanale (fasce orarie) di una zona.
+
+    days va da giorno (1=lunedì ... 7=domenica) alle fasce di quel giorno;
+    i giorni assenti non hanno fasce. L'hash di ogni giorno permette di
+    inviare con upd_fasce solo i giorni cambiati.
+    """
+
+    zone_id: int
+    days: dict[int, Day] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        for day in self.days:
+            if day not in DAYS:
+                raise ValueError(f"Giorno non valido: {day} (1=lunedì ... 7=domenica)")
+        self.days = {
+            day: _check_day(day, tuple(self.days.get(day, ()))) for day in DAYS
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> ZoneSchedule:
+        """Crea la programmazione dalla risposta a get_fasce."""
+        days: dict[int, Day] = {}
+        for item in data.get("fasce", []):
+            days[int(item["day"])] = tuple(
+                TimeBand.from_json(band) for band in item.get("f", [])
+            )
+        return cls(int(data.get("id_zona", 0)), days)
+
+    def day_json(self, day: int) -> list[dict[str, int]]:
+        """Fasce di un giorno nel formato del protocollo."""
+        return [band.to_json() for band in self.days[day]]
+
+    def day_hash(self, day: int) -> str:
+        """Hash delle fasce di un giorno, come verrebbero inviate."""
+        return hashlib.blake2b(
+            codec.dumps(self.day_json(day)), digest_size=8
+        ).hexdigest()
+
+    def day_hashes(self) -> dict[int, str]:
+        """Hash di ogni giorno della settimana."""
+        return {day: self.day_hash(day) for day in DAYS}
+
+    @property
+    def version(self) -> str:
+        """Hash dell'intera programmazione: cambia se cambia un qualsiasi giorno."""
+        digest = hashlib.blake2b(digest_size=8)
+        for day in DAYS:
+            digest.update(self.day_hash(day).encode())
+        return digest.hexdigest()
+
+    def changed_days(self, hashes: dict[int, str] | None) -> list[int]:
+        """Giorni con fasce diverse da quelle con gli hash dati (tutti se None)."""
+        if hashes is None:
+            return list(DAYS)
+        return [day for day in DAYS if self.day_hash(day) != hashes.get(day)]
+
+    def with_day(self, day: int, bands: Day) -> ZoneSchedule:
+        """Copia con le fasce di un giorno sostituite."""
+        return ZoneSchedule(self.zone_id, {**self.days, day: bands})
+
+    def __str__(self) -> str:
+        names = ("Lun", "Mar", "Mer", "Gio", "Ven", "Sab", "Dom")
+        lines = [f"Programmazione zona {self.zone_id}:"]
+        for day in DAYS:
+            bands = ", ".join(str(band) for band in self.days[day]) or "-"
+            lines.append(f"  {names[day - 1]}: {bands}")
+        return "\n".join(lines)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 _POSITION_DEGREES = {0: "0°", 1: "30°", 2: "60°", 3: "90°"}
 
@@ -22,7 +22,70 @@ def _set_label(value: int) -> str:
     return f"Fisso {_POSITION_DEGREES.get(value, str(value))}"
 
 
-@dataclass
+def _tenths(value) -> float:
+    """Converte un valore x10 del protocollo (es. 215 -> 21.5)."""
+    return value / 10.0 if value else 0.0
+
+
+# Campi zona nel formato completo (stato, stato_zona, stato_sync):
+# chiave JSON -> (attributo, conversione). Nomi e numeri arrivano già come
+# str e int dal JSON e si copiano così come sono (conversione None).
+# La tabella serve ad apply_delta, che aggiorna solo i campi presenti;
+# from_status_json, il percorso del polling, legge le chiavi per esteso.
+FULL_FIELDS = {
+    "name": ("name", None),
+    "is_off": ("is_off", bool),
+    "t": ("temp", _tenths),
+    "t_set": ("set_temp", _tenths),
+    "fan": ("fancoil", None),
+    "fan_set": ("fancoil_set", None),
+    "shu": ("serranda", None),
+    "shu_set": ("serranda_set", None),
+    "EV": ("ev", None),
+    "is_crono": ("is_crono_mode", bool),
+    "crono_on": ("is_crono_active", bool),
+    "u": ("umd", _tenths),
+    "u_set": ("set_umd", _tenths),
+    "c_win": ("c_win", None),
+    "c_badge": ("c_badge", None),
+    "co": ("c_off", None),
+    "err": ("error", None),
+}
+
+
+# Campi non presenti nel formato ridotto (stato_r): arrivano solo da stato/stato_zona
+DETAIL_FIELDS = (
+    "fancoil",
+    "fancoil_set",
+    "serranda",
+    "serranda_set",
+    "ev",
+    "is_crono_mode",
+    "is_crono_active",
+)
+
+# Valori delle chiavi assenti in una risposta, per entrambi i formati
+_DEFAULTS = {
+    **{key: 0 for key in FULL_FIELDS},
+    **{key: 0 for key in ("off", "ts", "us", "w", "b")},
+    "name": "",
+    "n": "",
+}
+
+
+def apply_fields(obj: object, data: dict, table: dict) -> None:
+    """Copia su obj i campi di data presenti nella tabella, convertiti.
+
+    Le chiavi assenti lasciano il valore attuale.
+    """
+    for key, value in data.items():
+        spec = table.get(key)
+        if spec is not None:
+            attr, convert = spec
+            setattr(obj, attr, value if convert is None else convert(value))
+
+
+@dataclass(slots=True)
 class Zone:
     """Modello di una zona della centralina ProAir."""
 
@@ -46,63 +109,75 @@ class Zone:
     error: int = 0             # Bitmask errori
 
     @classmethod
-    def from_status_json(cls, data: dict) -> Zone:
+    def from_status_json(cls, data: dict, reduced: bool = False) -> Zone:
         """Parsea una zona dalla risposta JSON dello stato.
 
-        Supporta sia il formato completo (stato) che ridotto (stato_r).
+        reduced indica il formato ridotto (stato_r) invece di quello completo
+        (stato, stato_zona).
         """
-        zone = cls()
-
-        # Zone ID: "id_zona" in full, "nr" also present
-        zone.zone_id = data.get("id_zona", data.get("nr", 0))
-
-        # Name: "name" in full, "n" in reduced
-        zone.name = data.get("name", data.get("n", ""))
-
-        # Is off: "is_off" in full, "off" in reduced
-        is_off_val = data.get("is_off", data.get("off", 0))
-        zone.is_off = bool(is_off_val)
-
-        # Temperature: always "t", value is x10
-        zone.temp = data.get("t", 0) / 10.0
-
-        # Set temperature: "t_set" in full, "ts" in reduced, value is x10
-        zone.set_temp = data.get("t_set", data.get("ts", 0)) / 10.0
-
-        # Fancoil
-        zone.fancoil = data.get("fan", 0)
-        zone.fancoil_set = data.get("fan_set", 0)
-
-        # Serranda (shutter)
-        zone.serranda = data.get("shu", 0)
-        zone.serranda_set = data.get("shu_set", 0)
-
-        # Elettrovalvola
-        zone.ev = data.get("EV", 0)
-
-        # Crono
-        zone.is_crono_mode = bool(data.get("is_crono", 0))
-        zone.is_crono_active = bool(data.get("crono_on", 0))
-
-        # Umidità: "u" in full, "u" in reduced — valore x10
-        raw_umd = data.get("u", 0)
-        zone.umd = int(raw_umd) / 10.0 if raw_umd else 0.0
-        # Umidità set: "u_set" in full, "us" in reduced — valore x10
-        raw_umd_set = data.get("u_set", data.get("us", 0))
-        zone.set_umd = int(raw_umd_set) / 10.0 if raw_umd_set else 0.0
-
-        # Contatti: "c_win" in full, "w" in reduced
-        zone.c_win = data.get("c_win", data.get("w", 0))
-        # Badge: "c_badge" in full, "b" in reduced
-        zone.c_badge = data.get("c_badge", data.get("b", 0))
-
-        # Cut-off: only in reduced as "co"
-        zone.c_off = data.get("co", 0)
-
-        # Error
-        zone.error = data.get("err", 0)
-
-        return zone
+        # Chiavi lette con [] e argomenti posizionali nell'ordine dei campi:
+        # è il percorso del polling, eseguito per ogni zona a ogni ciclo
+        try:
+            if reduced:
+                # Senza fancoil, serranda, elettrovalvola e crono (DETAIL_FIELDS)
+                t, ts, u, us = data["t"], data["ts"], data["u"], data["us"]
+                return cls(
+                    data["nr"],
+                    data["n"],
+                    bool(data["off"]),
+                    t / 10.0 if t else 0.0,
+                    ts / 10.0 if ts else 0.0,
+                    0, 0, 0, 0, 0,              # serranda, fancoil, ev
+                    False, False,               # crono
+                    u / 10.0 if u else 0.0,
+                    us / 10.0 if us else 0.0,
+                    data["w"],
+                    data["b"],
+                    data["co"],
+                    data["err"],
+                )
+            t, ts, u, us = data["t"], data["t_set"], data["u"], data["u_set"]
+            return cls(
+                data["id_zona"],
+                data["name"],
+                bool(data["is_off"]),
+                t / 10.0 if t else 0.0,
+                ts / 10.0 if ts else 0.0,
+                data["shu"],
+                data["shu_set"],
+                data["fan"],
+                data["fan_set"],
+                data["EV"],
+                bool(data["is_crono"]),
+                bool(data["crono_on"]),
+                u / 10.0 if u else 0.0,
+                us / 10.0 if us else 0.0,
+                data["c_win"],
+                data["c_badge"],
+                data["co"],
+                data["err"],
+            )
+        except KeyError:
+            # Chiavi mancanti: valgono i default. Zone ID da "id_zona" nel
+            # formato completo, altrimenti da "nr" (sempre presente)
+            zone_id = data.get("id_zona", data.get("nr", 0))
+            data = {**_DEFAULTS, **data, "id_zona": zone_id, "nr": zone_id}
+            return cls.from_status_json(data, reduced)
+
+    def merge_details(self, previous: Zone) -> None:
+        """Copia da una lettura precedente i campi assenti nel formato ridotto."""
+        for name in DETAIL_FIELDS:
+            setattr(self, name, getattr(previous, name))
+        if not self.name:
+            self.name = previous.name
+
+    def apply_delta(self, data: dict) -> None:
+        """Aggiorna solo i campi presenti in una risposta stato_sync."""
+        apply_fields(self, data, FULL_FIELDS)
+
+    def copy(self) -> Zone:
+        """Copia indipendente della zona."""
+        return replace(self)
 
     def short_str(self) -> str:
         """Rappresentazione compatta (per elenco da stato centralina).
@@ -4,191 +4,474 @@ Fornisce un'API ad alto livello per controllare la centralina via TCP socket loc
 """
 
 import logging
+import time
+from collections.abc import Callable, Iterable
 from datetime import datetime
 
-from .models import ControlUnit, Zone
+from .models import ControlUnit, Zone, ZoneSchedule
 from .protocol.commands import (
     DEFAULT_PIN,
     DEFAULT_PORT,
+    RES_CMD_NOT_FOUND,
     RES_OK,
-    build_check_pin,
-    build_get_stato,
-    build_get_stato_zona,
-    build_upd_cu,
+    build_get_fasce,
     build_upd_date,
-    build_upd_zona,
+    build_upd_fasce,
 )
+from .protocol.breaker import CircuitBreaker
+from .protocol.metrics import MetricsListener
+from .protocol.rate_limit import RateLimiter
 from .protocol.socket_client import SocketClient, SocketError
+from .protocol.templates import CommandTemplates
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_STATUS_AGE = 60.0   # secondi prima di rileggere lo stato per una scrittura
+
+# Parametri di upd_cu/upd_zona -> attributo del modello aggiornato dopo l'invio
+_CU_WRITE_FIELDS = {
+    "is_off": "is_off",
+    "is_cooling": "is_cooling",
+    "operating_mode": "operating_mode",
+    "t_can": "temp_can",
+    "f_inv": "f_inv",
+    "f_est": "f_est",
+}
+_ZONE_WRITE_FIELDS = {
+    "name": "name",
+    "is_off": "is_off",
+    "set_temp": "set_temp",
+    "fan_set": "fancoil_set",
+    "shu_set": "serranda_set",
+    "is_crono": "is_crono_mode",
+}
+# Temperature inviate in decimi di grado: la centralina le arrotonda così
+_TENTHS_FIELDS = {"t_can", "set_temp"}
+
 
 class ProAirError(Exception):
     """Errore nella comunicazione con la centralina ProAir."""
     pass
 
 
-class ProAir:
-    """Interfaccia ad alto livello per la centralina ProAir."""
+class _ProAirBase:
+    """Logica comune a ProAir e AsyncProAir: costruzione comandi e parsing risposte.
 
-    def __init__(self, host: str, port: int = DEFAULT_PORT, pin: str = DEFAULT_PIN):
+    Non effettua I/O: le sottoclassi si occupano dell'invio dei comandi.
+    L'ultimo stato letto fa da cache write-through: ogni scrittura riuscita
+    viene applicata alla cache, che viene riletta solo se più vecchia di
+    max_status_age secondi. Anche le fasce orarie lette o scritte restano in
+    cache, con l'hash di ogni giorno: upd_fasce invia solo i giorni cambiati.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        pin: str = DEFAULT_PIN,
+        max_status_age: float = DEFAULT_MAX_STATUS_AGE,
+    ):
         self.host = host
         self.port = port
         self.pin = pin
-        self._client = SocketClient(host, port)
+        self.max_status_age = max_status_age
         self._last_status: ControlUnit | None = None
+        self._last_status_time = 0.0
+        # Token dell'ultimo stato visto, per stato_sync
+        self._sync_token: int = 0
+        self.sync_supported = True
+        # True se l'ultimo get_status_sync ha dovuto leggere lo stato completo
+        self.sync_fallback = False
+        self._templates = CommandTemplates(pin)
+        # Ultime fasce orarie note per zona e hash dei loro giorni
+        self._schedules: dict[int, ZoneSchedule] = {}
+        self._schedule_hashes: dict[int, dict[int, str]] = {}
 
-    def check_pin(self) -> bool:
-        """Verifica che il PIN sia corretto."""
-        cmd = build_check_pin(self.pin)
-        try:
-            resp = self._client.send_command(cmd)
-            return resp.get("res") == RES_OK
-        except SocketError:
-            return False
+    @property
+    def _commands(self) -> CommandTemplates:
+        """Comandi precompilati per il PIN corrente (ricompilati se il PIN cambia)."""
+        if self._templates.pin != self.pin:
+            self._templates = CommandTemplates(self.pin)
+        return self._templates
 
-    def get_status(self) -> ControlUnit:
-        """Legge lo stato completo della centralina e di tutte le zone."""
-        cmd = build_get_stato(self.pin)
-        resp = self._client.send_command(cmd)
+    def _status_from_response(self, resp: dict) -> ControlUnit:
+        """Costruisce il modello della centralina dalla risposta a stato."""
         cu = ControlUnit.from_status_json(resp)
         cu.pin = self.pin
         cu.ip = self.host
         cu.port = self.port
-        self._last_status = cu
+        self._set_last_status(cu)
+        # Senza un token valido il prossimo get_status_sync legge lo stato completo
+        self._sync_token = _sync_token(resp.get("sync")) or 0
         return cu
 
-    def get_zone_status(self, zone_id: int) -> Zone:
-        """Legge lo stato di una singola zona."""
-        cmd = build_get_stato_zona(self.pin, zone_id)
-        resp = self._client.send_command(cmd)
+    def _reduced_status_from_response(self, resp: dict) -> ControlUnit:
+        """Costruisce il modello della centralina dalla risposta a stato_r.
+
+        I dettagli zona assenti nel formato ridotto vengono presi dall'ultimo
+        stato noto; senza uno stato precedente il risultato non viene memorizzato.
+        """
+        cu = ControlUnit.from_status_json(resp, reduced=True)
+        cu.pin = self.pin
+        cu.ip = self.host
+        cu.port = self.port
+        if self._last_status is not None:
+            cu.merge_details(self._last_status)
+            self._set_last_status(cu)
+        return cu
+
+    def _sync_status_from_response(self, resp: dict) -> ControlUnit | None:
+        """Applica una risposta stato_sync all'ultimo stato noto.
+
+        Ritorna None se serve uno stato completo: risincronizzazione richiesta
+        dalla centralina, risposta non valida o zone sconosciute.
+        """
+        if resp.get("res") == RES_CMD_NOT_FOUND:
+            logger.info("stato_sync non supportato dal firmware, uso stato")
+            self.sync_supported = False
+            return None
+        token = _sync_token(resp.get("sync"))
+        if (
+            self._last_status is None
+            or resp.get("res") != RES_OK
+            or resp.get("resync")
+            or token is None
+        ):
+            return None
+
+        cu = self._last_status.copy()
+        try:
+            if not cu.apply_delta(resp):
+                return None
+        except (TypeError, ValueError, AttributeError) as err:
+            logger.debug("Risposta stato_sync non valida: %s", err)
+            return None
+
+        self._set_last_status(cu)
+        self._sync_token = token
+        return cu
+
+    @property
+    def _can_sync(self) -> bool:
+        """True se get_status_sync può chiedere solo le variazioni."""
+        return (
+            self._last_status is not None
+            and self.sync_supported
+            and self._sync_token > 0
+        )
+
+    def _set_last_status(self, cu: ControlUnit) -> None:
+        self._last_status = cu
+        self._last_status_time = time.monotonic()
+
+    def _cached_status(self) -> ControlUnit | None:
+        """Ultimo stato noto, se abbastanza recente da basarci una scrittura."""
+        if (
+            self._last_status is None
+            or time.monotonic() - self._last_status_time > self.max_status_age
+        ):
+            return None
+        return self._last_status
+
+    def _remember_cu_write(self, overrides: dict) -> None:
+        """Applica alla cache i valori di un upd_cu riuscito."""
+        if self._last_status is None:
+            return
+        # Copia: lo stato precedente può essere ancora in uso dal chiamante
+        cu = self._last_status.copy()
+        _apply_write(cu, _CU_WRITE_FIELDS, overrides)
+        self._last_status = cu
+
+    def _remember_zone_write(self, zone_id: int, overrides: dict) -> None:
+        """Applica alla cache i valori di un upd_zona riuscito."""
+        if self._last_status is None:
+            return
+        cu = self._last_status.copy()
+        zone = cu.get_zone(zone_id)
+        if zone is not None:
+            _apply_write(zone, _ZONE_WRITE_FIELDS, overrides)
+        self._last_status = cu
 
+    def _schedule_from_response(self, zone_id: int, resp: dict) -> ZoneSchedule:
+        """Costruisce la programmazione dalla risposta a get_fasce e la memorizza."""
+        self._check_response(resp)
+        schedule = ZoneSchedule.from_json(resp)
+        schedule.zone_id = zone_id
+        self._schedules[zone_id] = schedule
+        self._schedule_hashes[zone_id] = schedule.day_hashes()
+        return schedule
+
+    def _cached_schedule(self, zone_id: int, refresh: bool) -> ZoneSchedule | None:
+        """Fasce orarie note di una zona, None se da leggere."""
+        return None if refresh else self._schedules.get(zone_id)
+
+    def _changed_schedule_days(self, schedule: ZoneSchedule) -> list[int]:
+        """Giorni di schedule diversi dalle fasce note della zona."""
+        return schedule.changed_days(self._schedule_hashes.get(schedule.zone_id))
+
+    def _build_schedule_command(self, schedule: ZoneSchedule, day: int) -> bytes:
+        """Costruisce upd_fasce per un giorno della programmazione."""
+        return build_upd_fasce(
+            self.pin, schedule.zone_id, day, schedule.day_json(day)
+        )
+
+    def _remember_schedule_day(self, schedule: ZoneSchedule, day: int) -> None:
+        """Applica alla cache un giorno inviato con successo."""
+        zone_id = schedule.zone_id
+        cached = self._schedules.get(zone_id, ZoneSchedule(zone_id))
+        self._schedules[zone_id] = cached.with_day(day, schedule.days[day])
+        hashes = dict(self._schedule_hashes.get(zone_id, {}))
+        hashes[day] = schedule.day_hash(day)
+        self._schedule_hashes[zone_id] = hashes
+
+    @staticmethod
+    def _zone_from_response(resp: dict) -> Zone:
+        """Costruisce il modello della zona dalla risposta a stato_zona."""
         if "zone" in resp:
             zones = resp["zone"]
             if zones:
                 return Zone.from_status_json(zones[0])
         return Zone.from_status_json(resp)
 
-    def _send_and_check(self, cmd: str) -> dict:
-        """Invia un comando e verifica che res == 1."""
-        resp = self._client.send_command(cmd)
+    @staticmethod
+    def _check_response(resp: dict) -> dict:
+        """Verifica che res == 1."""
         if resp.get("res") != RES_OK:
             raise ProAirError(
                 f"Comando fallito: res={resp.get('res')} - risposta: {resp}"
             )
         return resp
 
+    @staticmethod
+    def _find_zone(cu: ControlUnit, zone_id: int) -> Zone:
+        """Trova una zona nello stato della centralina."""
+        zone = cu.get_zone(zone_id)
+        if zone is None:
+            raise ProAirError(f"Zona {zone_id} non trovata")
+        return zone
+
+    def _build_cu_command(self, cu: ControlUnit, **overrides) -> bytes:
+        """Costruisce upd_cu con i valori della centralina, sovrascrivendo quelli specificati."""
+        params = {
+            "is_off": cu.is_off,
+            "is_cooling": cu.is_cooling,
+            "operating_mode": cu.operating_mode,
+            "t_can": cu.temp_can,
+            "f_inv": cu.f_inv,
+            "f_est": cu.f_est,
+        }
+        params.update(overrides)
+        return self._commands.upd_cu(**params)
+
+    def _build_zone_command(self, zone: Zone, **overrides) -> bytes:
+        """Costruisce upd_zona con i valori della zona, sovrascrivendo quelli specificati."""
+        params = {
+            "zone_id": zone.zone_id,
+            "name": zone.name,
+            "is_off": zone.is_off,
+            "set_temp": zone.set_temp,
+            "fan_set": zone.fancoil_set,
+            "shu_set": zone.serranda_set,
+            "is_crono": zone.is_crono_mode,
+        }
+        params.update(overrides)
+        return self._commands.upd_zona(**params)
+
+    @staticmethod
+    def _validate_cooling_mode(mode: int) -> None:
+        if mode not in (1, 2, 3):
+            raise ValueError("Modalità non valida: usa 1=raff, 2=deum, 3=vent")
+
+    @classmethod
+    def _cu_state_overrides(
+        cls,
+        is_off: bool | None,
+        is_cooling: bool | None,
+        operating_mode: int | None,
+    ) -> dict:
+        """Parametri upd_cu per apply_cu_state (None = invariato)."""
+        overrides: dict = {}
+        if is_off is not None:
+            overrides["is_off"] = is_off
+        if is_cooling is False:
+            # Riscaldamento: la modalità estiva non si applica
+            overrides["is_cooling"] = False
+            overrides["operating_mode"] = 0
+        else:
+            if is_cooling:
+                overrides["is_cooling"] = True
+            if operating_mode is not None:
+                cls._validate_cooling_mode(operating_mode)
+                overrides["operating_mode"] = operating_mode
+        return overrides
+
+    @staticmethod
+    def _validate_fancoil(speed: int) -> None:
+        if speed not in (0, 1, 2, 3, 7):
+            raise ValueError("Velocità fancoil non valida: usa 0, 1, 2, 3 o 7(auto)")
+
+    @staticmethod
+    def _validate_damper(opening: int) -> None:
+        if opening not in (0, 1, 2, 3, 7):
+            raise ValueError("Apertura serranda non valida: usa 0, 1, 2, 3 o 7(auto)")
+
+
+class ProAir(_ProAirBase):
+    """Interfaccia ad alto livello per la centralina ProAir."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        pin: str = DEFAULT_PIN,
+        keep_alive: bool = False,
+        max_status_age: float = DEFAULT_MAX_STATUS_AGE,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        super().__init__(host, port, pin, max_status_age)
+        self.breaker = CircuitBreaker()
+        # Cadenza dei comandi: di default quella di RateLimiter()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._client = SocketClient(
+            host,
+            port,
+            keep_alive=keep_alive,
+            breaker=self.breaker,
+            probe=self._commands.check_pin,
+            rate_limiter=self.rate_limiter,
+        )
+        self.rtt = self._client.rtt
+
+    def add_metrics_listener(self, listener: MetricsListener) -> Callable[[], None]:
+        """Registra una callback chiamata con le CommandMetrics di ogni comando.
+
+        Ritorna la funzione per rimuovere la callback.
+        """
+        return self._client.add_metrics_listener(listener)
+
+    def close(self) -> None:
+        """Chiude l'eventuale connessione persistente con la centralina."""
+        self._client.close()
+
+    def check_pin(self) -> bool:
+        """Verifica che il PIN sia corretto."""
+        cmd = self._commands.check_pin
+        try:
+            resp = self._client.send_command(cmd)
+            return resp.get("res") == RES_OK
+        except SocketError:
+            return False
+
+    def get_status(self) -> ControlUnit:
+        """Legge lo stato completo della centralina e di tutte le zone."""
+        cmd = self._commands.get_stato
+        resp = self._client.send_command(cmd)
+        return self._status_from_response(resp)
+
+    def get_status_reduced(self) -> ControlUnit:
+        """Legge lo stato della centralina in formato ridotto (stato_r).
+
+        Risposta più compatta di get_status: non include fancoil, serranda,
+        elettrovalvola e crono delle zone, che restano quelli dell'ultimo stato noto.
+        """
+        cmd = self._commands.get_stato_r
+        resp = self._client.send_command(cmd)
+        return self._reduced_status_from_response(resp)
+
+    def get_status_sync(self) -> ControlUnit:
+        """Legge solo le variazioni rispetto all'ultimo stato noto (stato_sync).
+
+        Se non c'è uno stato precedente con un token valido, o la centralina
+        chiede una risincronizzazione o risponde con un token non valido,
+        legge lo stato completo (sync_fallback = True).
+        """
+        if self._can_sync:
+            cmd = self._commands.get_stato_sync(self._sync_token)
+            try:
+                resp = self._client.send_command(cmd)
+            except ValueError as err:
+                logger.debug("Risposta stato_sync non decodificabile: %s", err)
+            else:
+                cu = self._sync_status_from_response(resp)
+                if cu is not None:
+                    self.sync_fallback = False
+                    return cu
+
+        self.sync_fallback = True
+        return self.get_status()
+
+    def get_zone_status(self, zone_id: int, deadline: float | None = None) -> Zone:
+        """Legge lo stato di una singola zona, entro deadline (time.monotonic())."""
+        cmd = self._commands.get_stato_zona(zone_id)
+        resp = self._client.send_command(cmd, deadline)
+        return self._zone_from_response(resp)
+
+    def _send_and_check(self, cmd: str) -> dict:
+        """Invia un comando e verifica che res == 1."""
+        return self._check_response(self._client.send_command(cmd))
+
     def _get_current_status(self) -> ControlUnit:
-        """Ritorna l'ultimo stato noto, o lo legge se non disponibile."""
-        if self._last_status is None:
-            self._last_status = self.get_status()
-        return self._last_status
+        """Ritorna l'ultimo stato noto, o lo legge se assente o troppo vecchio."""
+        cu = self._cached_status()
+        if cu is None:
+            cu = self.get_status()
+        return cu
 
     # --- Comandi centralina ---
 
+    def _update_cu(self, **overrides) -> None:
+        """Invia upd_cu con lo stato corrente, sovrascrivendo i valori specificati."""
+        cu = self._get_current_status()
+        self._send_and_check(self._build_cu_command(cu, **overrides))
+        self._remember_cu_write(overrides)
+
     def set_cu_on(self) -> None:
         """Accende la centralina."""
-        cu = self._get_current_status()
-        cmd = build_upd_cu(
-            pin=self.pin,
-            is_off=False,
-            is_cooling=cu.is_cooling,
-            operating_mode=cu.operating_mode,
-            t_can=cu.temp_can,
-            f_inv=cu.f_inv,
-            f_est=cu.f_est,
-        )
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._update_cu(is_off=False)
 
     def set_cu_off(self) -> None:
         """Spegne la centralina."""
-        cu = self._get_current_status()
-        cmd = build_upd_cu(
-            pin=self.pin,
-            is_off=True,
-            is_cooling=cu.is_cooling,
-            operating_mode=cu.operating_mode,
-            t_can=cu.temp_can,
-            f_inv=cu.f_inv,
-            f_est=cu.f_est,
-        )
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._update_cu(is_off=True)
 
     def set_canal_temperature(self, temp_celsius: float) -> None:
         """Imposta la temperatura del canale."""
-        cu = self._get_current_status()
-        cmd = build_upd_cu(
-            pin=self.pin,
-            is_off=cu.is_off,
-            is_cooling=cu.is_cooling,
-            operating_mode=cu.operating_mode,
-            t_can=temp_celsius,
-            f_inv=cu.f_inv,
-            f_est=cu.f_est,
-        )
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._update_cu(t_can=temp_celsius)
 
     def set_cooling_mode(self, mode: int) -> None:
         """Imposta la modalità estiva (1=raff, 2=deum, 3=vent)."""
-        if mode not in (1, 2, 3):
-            raise ValueError("Modalità non valida: usa 1=raff, 2=deum, 3=vent")
-        cu = self._get_current_status()
-        cmd = build_upd_cu(
-            pin=self.pin,
-            is_off=cu.is_off,
-            is_cooling=True,
-            operating_mode=mode,
-            t_can=cu.temp_can,
-            f_inv=cu.f_inv,
-            f_est=cu.f_est,
-        )
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._validate_cooling_mode(mode)
+        self._update_cu(is_cooling=True, operating_mode=mode)
 
     def set_heating_mode(self) -> None:
         """Imposta la modalità riscaldamento (invernale)."""
-        cu = self._get_current_status()
-        cmd = build_upd_cu(
-            pin=self.pin,
-            is_off=cu.is_off,
-            is_cooling=False,
-            operating_mode=0,
-            t_can=cu.temp_can,
-            f_inv=cu.f_inv,
-            f_est=cu.f_est,
-        )
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._update_cu(is_cooling=False, operating_mode=0)
+
+    def apply_cu_state(
+        self,
+        is_off: bool | None = None,
+        is_cooling: bool | None = None,
+        operating_mode: int | None = None,
+    ) -> None:
+        """Imposta accensione e modalità della centralina con un solo upd_cu.
+
+        I parametri lasciati a None restano invariati. Con is_cooling=False
+        imposta il riscaldamento; con is_cooling=True operating_mode è la
+        modalità estiva (1=raff, 2=deum, 3=vent).
+        """
+        overrides = self._cu_state_overrides(is_off, is_cooling, operating_mode)
+        if overrides:
+            self._update_cu(**overrides)
 
     # --- Comandi zona ---
 
     def _get_zone_from_status(self, zone_id: int) -> Zone:
         """Trova una zona nello stato corrente della centralina."""
-        cu = self._get_current_status()
-        for z in cu.zones:
-            if z.zone_id == zone_id:
-                return z
-        raise ProAirError(f"Zona {zone_id} non trovata")
+        return self._find_zone(self._get_current_status(), zone_id)
 
     def _update_zone(self, zone: Zone, **overrides) -> None:
         """Invia upd_zona con i valori della zona, sovrascrivendo quelli specificati."""
-        params = {
-            "pin": self.pin,
-            "zone_id": zone.zone_id,
-            "name": zone.name,
-            "is_off": zone.is_off,
-            "set_temp": zone.set_temp,
-            "fan_set": zone.fancoil_set,
-            "shu_set": zone.serranda_set,
-            "is_crono": zone.is_crono_mode,
-        }
-        params.update(overrides)
-        cmd = build_upd_zona(**params)
-        self._send_and_check(cmd)
-        self._last_status = None
+        self._send_and_check(self._build_zone_command(zone, **overrides))
+        self._remember_zone_write(zone.zone_id, overrides)
 
     def set_zone_temperature(self, zone_id: int, temp_celsius: float) -> None:
         """Imposta la temperatura target di una zona."""
@@ -207,15 +490,13 @@ class ProAir:
 
     def set_zone_fancoil(self, zone_id: int, speed: int) -> None:
         """Imposta la velocità del fancoil di una zona (0, 1, 2, 3, 7=auto)."""
-        if speed not in (0, 1, 2, 3, 7):
-            raise ValueError("Velocità fancoil non valida: usa 0, 1, 2, 3 o 7(auto)")
+        self._validate_fancoil(speed)
         zone = self._get_zone_from_status(zone_id)
         self._update_zone(zone, fan_set=speed)
 
     def set_zone_damper(self, zone_id: int, opening: int) -> None:
         """Imposta l'apertura della serranda di una zona (0, 1, 2, 3, 7=auto)."""
-        if opening not in (0, 1, 2, 3, 7):
-            raise ValueError("Apertura serranda non valida: usa 0, 1, 2, 3 o 7(auto)")
+        self._validate_damper(opening)
         zone = self._get_zone_from_status(zone_id)
         self._update_zone(zone, shu_set=opening)
 
@@ -223,3 +504,62 @@ class ProAir:
         """Sincronizza l'orologio della centralina."""
         cmd = build_upd_date(self.pin, dt)
         self._send_and_check(cmd)
+
+    # --- Fasce orarie ---
+
+    def get_zone_schedule(self, zone_id: int, refresh: bool = False) -> ZoneSchedule:
+        """Legge le fasce orarie settimanali di una zona.
+
+        Ritorna quelle in cache se già lette o scritte, salvo refresh=True.
+        """
+        schedule = self._cached_schedule(zone_id, refresh)
+        if schedule is None:
+            resp = self._client.send_command(build_get_fasce(self.pin, zone_id))
+            schedule = self._schedule_from_response(zone_id, resp)
+        return schedule
+
+    def set_zone_schedule(
+        self, schedule: ZoneSchedule, refresh: bool = False
+    ) -> list[int]:
+        """Scrive le fasce orarie di una zona, inviando solo i giorni cambiati.
+
+        Il confronto è con le fasce in cache (lette prima se assenti, o se
+        refresh=True perché modificate da altri). Ritorna i giorni inviati.
+        """
+        self.get_zone_schedule(schedule.zone_id, refresh)
+        days = self._changed_schedule_days(schedule)
+        for day in days:
+            self._send_and_check(self._build_schedule_command(schedule, day))
+            self._remember_schedule_day(schedule, day)
+        return days
+
+    def set_zone_schedules(
+        self, schedules: Iterable[ZoneSchedule], refresh: bool = False
+    ) -> dict[int, list[int]]:
+        """Scrive le fasce orarie di più zone; ritorna i giorni inviati per zona."""
+        return {
+            schedule.zone_id: self.set_zone_schedule(schedule, refresh)
+            for schedule in schedules
+        }
+
+
+def _sync_token(value) -> int | None:
+    """Token stato_sync da una risposta, None se assente o non valido."""
+    if isinstance(value, bool):
+        return None
+    try:
+        token = int(value)
+    except (TypeError, ValueError):
+        return None
+    return token if token > 0 else None
+
+
+def _apply_write(target, fields: dict, overrides: dict) -> None:
+    """Copia i parametri di un comando di scrittura sugli attributi del modello."""
+    for param, value in overrides.items():
+        attr = fields.get(param)
+        if attr is None:
+            continue
+        if param in _TENTHS_FIELDS:
+            value = int(value * 10) / 10.0
+        setattr(target, attr, value)
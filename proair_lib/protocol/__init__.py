@@ -1,2 +1,9 @@
 from .commands import *
+from .breaker import CircuitBreaker
+from .command_queue import CommandQueue
+from .metrics import CommandMetrics
+from .rate_limit import RateLimiter
+from .retry import READ_POLICY, WRITE_POLICY, RetryPolicy, RttEstimator
 from .socket_client import SocketClient
+from .templates import CommandTemplates
+from .async_socket_client import AsyncSocketClient
@@ -0,0 +1,265 @@
+"""Client TCP asyncio per comunicazione locale con centralina ProAir."""
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from .breaker import CircuitBreaker
+from .client_base import SEND, BaseSocketClient, SocketError, Steps, _decode_frame
+from .command_queue import CommandQueue, command_priority, supersede_key
+from .framing import MAX_RESPONSE_SIZE
+from .metrics import CommandMetrics, command_name
+from .rate_limit import RateLimiter
+from .retry import INITIAL_TIMEOUT, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = 4096           # byte richiesti per lettura
+
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncSocketClient(BaseSocketClient):
+    """Client TCP asyncio per comunicazione locale con centralina ProAir.
+
+    Stesso protocollo di SocketClient, ma senza bloccare il thread chiamante:
+    connessione, letture e pause tra i tentativi sono coroutine.
+    Con keep_alive=True le connessioni vengono restituite a un pool (al più
+    pool_size connessioni inattive) e riusate dai comandi successivi.
+    Con un CircuitBreaker i comandi verso una centralina che non risponde
+    falliscono subito; a fine pausa il comando probe (se dato) fa da sonda.
+    in_flight è un semaforo, anche condiviso tra più client, che limita i
+    comandi in corso.
+    I comandi passano da una CommandQueue: al più pool_size alla volta, le
+    scritture davanti alle letture in attesa e le letture uguali unite.
+    Con un RateLimiter i tentativi sono distanziati e pool_size non supera
+    max_connections.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 1235,
+        timeout: float = INITIAL_TIMEOUT,
+        keep_alive: bool = False,
+        pool_size: int = 1,
+        max_response_size: int = MAX_RESPONSE_SIZE,
+        breaker: CircuitBreaker | None = None,
+        probe: bytes | None = None,
+        rate_limiter: RateLimiter | None = None,
+        in_flight: asyncio.Semaphore | None = None,
+    ):
+        super().__init__(
+            host, port, timeout, keep_alive, max_response_size,
+            breaker, probe, rate_limiter,
+        )
+        if rate_limiter is not None:
+            pool_size = min(pool_size, rate_limiter.max_connections)
+        self.pool_size = pool_size
+        self.in_flight = in_flight
+        self._idle: list[_Connection] = []
+        self.queue = CommandQueue(self._send_limited, workers=pool_size)
+
+    async def send_command(
+        self,
+        command: bytes | str,
+        deadline: float | None = None,
+        policy: RetryPolicy | None = None,
+    ) -> dict:
+        """Invia un comando JSON (bytes UTF-8 dei build_*) e riceve la risposta.
+
+        In modalità normale apre una nuova connessione TCP per ogni comando
+        (come fa l'app originale), invia il JSON, riceve la risposta, chiude
+        la connessione. In modalità keep-alive riusa una connessione del pool.
+        Le scritture passano davanti alle letture in coda; una lettura uguale
+        a una in coda ne prende il posto e ne condivide la risposta.
+
+        I tentativi seguono policy (di default READ_POLICY per le letture e
+        WRITE_POLICY per le scritture), con timeout derivati dal tempo di
+        risposta misurato; deadline (time.monotonic()) limita il tempo
+        totale, pause comprese.
+        """
+        if isinstance(command, str):
+            command = command.encode("utf-8")
+        name = command_name(command)
+        return await self.queue.submit(
+            command,
+            command_priority(name),
+            supersede_key(name, command),
+            deadline,
+            policy,
+        )
+
+    async def _send_limited(
+        self, command: bytes, deadline: float | None, policy: RetryPolicy | None
+    ) -> dict:
+        """Invia un comando uscito dalla coda, entro il limite in_flight."""
+        steps = self._command_steps(
+            command, CommandMetrics(command_name(command)), deadline, policy
+        )
+        if self.in_flight is None:
+            return await self._run(steps)
+        async with self.in_flight:
+            return await self._run(steps)
+
+    async def _run(self, steps: Steps):
+        """Esegue i passi di un comando con I/O asyncio."""
+        value = error = None
+        while True:
+            try:
+                step = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value = error = None
+            try:
+                if step[0] is SEND:
+                    value = await self._try_send(step[1], step[2])
+                else:
+                    await asyncio.sleep(step[1])
+            except BaseException as err:
+                error = err
+
+    async def _try_send(self, command: bytes, metrics: CommandMetrics) -> dict:
+        """Singolo tentativo di invio comando e ricezione risposta."""
+        if self.keep_alive:
+            return await self._try_send_persistent(command, metrics)
+
+        reader, writer = await self._connect(metrics)
+        try:
+            return await self._exchange(reader, writer, command, metrics)
+        finally:
+            await self._close(writer)
+
+    async def _try_send_persistent(
+        self, command: bytes, metrics: CommandMetrics
+    ) -> dict:
+        """Tentativo di invio su una connessione del pool."""
+        conn = self._acquire_idle()
+        if conn is None and not self.keep_alive:
+            # Keep-alive appena disattivato: connessione per comando
+            return await self._try_send(command, metrics)
+
+        reused = metrics.reused = conn is not None
+        if conn is None:
+            conn = await self._connect(metrics)
+
+        try:
+            result = await self._exchange(*conn, command, metrics)
+        except (ConnectionError, SocketError):
+            await self._close(conn[1])
+            if not reused:
+                raise
+            # La connessione riusata era morta: riprova subito su una nuova
+            logger.debug("Connessione persistente persa, riconnessione")
+            if self._note_keep_alive_drop():
+                return await self._try_send(command, metrics)
+            metrics.reused = False
+            conn = await self._connect(metrics)
+            try:
+                result = await self._exchange(*conn, command, metrics)
+            except BaseException:
+                await self._close(conn[1])
+                raise
+        except BaseException:
+            await self._close(conn[1])
+            raise
+        else:
+            if reused:
+                self._keep_alive_drops = 0
+
+        self._release(conn)
+        return result
+
+    def _acquire_idle(self) -> _Connection | None:
+        """Preleva una connessione inattiva ancora aperta dal pool."""
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            # Chiusa dal peer mentre era nel pool
+            writer.close()
+            if self._note_keep_alive_drop():
+                return None
+        return None
+
+    def _release(self, conn: _Connection) -> None:
+        """Restituisce una connessione al pool, o la chiude se non serve."""
+        reader, writer = conn
+        if reader.at_eof() or writer.is_closing():
+            # Chiusa dal peer subito dopo la risposta
+            writer.close()
+            self._note_keep_alive_drop()
+        elif self.keep_alive and len(self._idle) < self.pool_size:
+            self._idle.append(conn)
+        else:
+            writer.close()
+
+    def _drop_idle(self) -> None:
+        """Chiude le connessioni inattive del pool (keep-alive disattivato)."""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+    async def _connect(self, metrics: CommandMetrics) -> _Connection:
+        """Apre una connessione TCP verso la centralina."""
+        logger.debug("Connessione a %s:%d ...", self.host, self.port)
+        start = time.perf_counter()
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), metrics.timeout
+        )
+        metrics.connect_time = time.perf_counter() - start
+        return conn
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+    async def _exchange(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        command: bytes,
+        metrics: CommandMetrics,
+    ) -> dict:
+        """Invia il comando sulla connessione data e legge la risposta."""
+        # Invio comando
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TX: %s", command.decode("utf-8", "replace"))
+        sent = time.perf_counter()
+        writer.write(command)
+        await asyncio.wait_for(writer.drain(), metrics.timeout)
+        metrics.bytes_out += len(command)
+
+        # Ricezione risposta: legge finché l'oggetto JSON non è completo
+        frame = self._readers.acquire()
+        try:
+            while not frame.complete:
+                if frame.is_full:
+                    raise SocketError(
+                        f"Risposta oltre {frame.max_size} byte dalla centralina"
+                    )
+                chunk = await asyncio.wait_for(
+                    reader.read(BUFFER_SIZE), metrics.timeout
+                )
+                if not chunk:
+                    break
+                if metrics.ttfb is None:
+                    metrics.ttfb = time.perf_counter() - sent
+                frame.feed(chunk)
+            metrics.bytes_in = len(frame)
+            return _decode_frame(frame)
+        finally:
+            self._readers.release(frame)
+
+    async def close(self) -> None:
+        """Interrompe i comandi in coda e chiude le connessioni persistenti inattive."""
+        await self.queue.close()
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            await self._close(writer)
+
+    def __repr__(self) -> str:
+        return f"AsyncSocketClient({self.host}:{self.port})"
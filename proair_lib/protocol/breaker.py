@@ -0,0 +1,104 @@
+"""Circuit breaker per le centraline non raggiungibili."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 3       # tentativi falliti di fila prima di aprire il circuito
+COOLDOWN = 30.0             # secondi senza tentativi dopo l'apertura
+MAX_COOLDOWN = 300.0        # la pausa raddoppia a ogni sonda fallita fino a qui
+
+STATE_CLOSED = "closed"         # comunicazione normale
+STATE_OPEN = "open"             # nessun tentativo fino alla fine della pausa
+STATE_HALF_OPEN = "half_open"   # una sola sonda in corso
+
+
+class CircuitBreaker:
+    """Sospende i tentativi verso una centralina che non risponde.
+
+    Dopo failure_threshold tentativi falliti di fila il circuito si apre e
+    per la durata della pausa i client non inviano comandi (CircuitOpenError).
+    Finita la pausa passa un solo comando, la sonda: se riesce il circuito
+    si richiude, altrimenti si riapre con pausa doppia.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at: float | None = None     # time.monotonic() dell'apertura
+        self.trips = 0                          # aperture dall'avvio
+
+    def allow(self) -> bool:
+        """True se si può tentare; a fine pausa passa a half-open (sonda)."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and self.remaining == 0:
+            self.state = STATE_HALF_OPEN
+            return True
+        return False
+
+    @property
+    def blocked(self) -> bool:
+        """True se allow() rifiuterebbe adesso un tentativo (senza cambiare stato)."""
+        return self.state == STATE_HALF_OPEN or self.remaining > 0
+
+    @property
+    def probing(self) -> bool:
+        """True se il prossimo tentativo è la sonda."""
+        return self.state == STATE_HALF_OPEN
+
+    @property
+    def remaining(self) -> float:
+        """Secondi alla fine della pausa (0 se il circuito non è aperto)."""
+        if self.state != STATE_OPEN or self.opened_at is None:
+            return 0.0
+        return max(self.opened_at + self.cooldown - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        """Registra un tentativo riuscito: richiude il circuito."""
+        if self.state != STATE_CLOSED:
+            logger.info("Centralina di nuovo raggiungibile")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Registra un tentativo fallito; apre il circuito se necessario."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            # Sonda fallita: pausa più lunga
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+        elif self.state == STATE_CLOSED and self.failures >= self.failure_threshold:
+            logger.warning(
+                "Centralina non raggiungibile dopo %d tentativi, "
+                "nuovo tentativo tra %.0f s",
+                self.failures, self.cooldown,
+            )
+            self.trips += 1
+            self._open()
+
+    def _open(self) -> None:
+        self.state = STATE_OPEN
+        self.opened_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        """Stato del circuito per i diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "cooldown": self.cooldown,
+            "remaining": round(self.remaining, 1),
+            "trips": self.trips,
+        }
@@ -0,0 +1,288 @@
+"""Logica comune ai client TCP sincrono e asyncio.
+
+Tentativi, scadenze, stima del tempo di risposta, circuit breaker, cadenza
+e metriche sono scritti una volta sola, come generatore di passi
+(_command_steps): il generatore chiede al client di attendere (SLEEP) o di
+fare un tentativo (SEND) e il client esegue il passo con il proprio I/O,
+bloccante o asyncio. Gli errori dell'I/O tornano nel generatore con throw(),
+nel punto in cui il passo era stato chiesto.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Generator
+from typing import Any
+
+from .breaker import STATE_CLOSED, CircuitBreaker
+from .framing import FrameReaderPool, JsonFrameReader
+from .metrics import (
+    CommandMetrics,
+    MetricsListener,
+    add_listener,
+    command_name,
+    describe_error,
+    emit,
+)
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, RttEstimator, policy_for, remaining
+
+logger = logging.getLogger(__name__)
+
+# Connessioni persistenti trovate chiuse di fila prima di tornare a una per comando
+MAX_KEEP_ALIVE_DROPS = 3
+
+# Passi chiesti dal generatore: (SLEEP, secondi) o (SEND, comando, metriche)
+SLEEP = "sleep"
+SEND = "send"
+
+Step = tuple[Any, ...]
+Steps = Generator[Step, Any, Any]
+
+
+class SocketError(Exception):
+    """Errore di comunicazione socket."""
+    pass
+
+
+class CircuitOpenError(SocketError):
+    """Centralina non raggiungibile: comando non inviato (circuito aperto)."""
+    pass
+
+
+def _circuit_open(breaker: CircuitBreaker) -> CircuitOpenError:
+    """Errore per un comando rifiutato dal circuit breaker."""
+    return CircuitOpenError(
+        f"Centralina non raggiungibile, nuovo tentativo tra "
+        f"{breaker.remaining:.0f} s"
+    )
+
+
+def _decode_frame(frame: JsonFrameReader) -> dict:
+    """Decodifica una risposta ricevuta, verificando che sia completa."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("RX: %s", frame.payload().decode("utf-8", "replace"))
+
+    if not frame.complete:
+        if not len(frame):
+            raise SocketError("Risposta vuota dalla centralina")
+        raise SocketError(
+            f"Risposta incompleta dalla centralina ({len(frame)} byte)"
+        )
+
+    return frame.decode()
+
+
+class BaseSocketClient:
+    """Parte dei client TCP indipendente dal tipo di I/O.
+
+    Le sottoclassi eseguono i passi di _command_steps (attese e tentativi
+    con _try_send) e gestiscono le connessioni.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        keep_alive: bool,
+        max_response_size: int,
+        breaker: CircuitBreaker | None,
+        probe: bytes | None,
+        rate_limiter: RateLimiter | None,
+    ):
+        self.host = host
+        self.port = port
+        self.rtt = RttEstimator(timeout)
+        self.keep_alive = keep_alive
+        self.breaker = breaker
+        self.probe = probe
+        self.rate_limiter = rate_limiter
+        self._keep_alive_drops = 0
+        self._readers = FrameReaderPool(max_response_size)
+        self._metrics_listeners: list[MetricsListener] = []
+
+    def add_metrics_listener(self, listener: MetricsListener) -> Callable[[], None]:
+        """Registra una callback chiamata con le CommandMetrics di ogni comando.
+
+        Ritorna la funzione per rimuovere la callback.
+        """
+        return add_listener(self._metrics_listeners, listener)
+
+    def _command_steps(
+        self,
+        command: bytes,
+        metrics: CommandMetrics,
+        deadline: float | None,
+        policy: RetryPolicy | None,
+    ) -> Steps:
+        """Passi di un comando con i tentativi previsti, notificando le metriche."""
+        start = time.perf_counter()
+        try:
+            result = yield from self._retry_steps(
+                command, metrics, deadline, policy or policy_for(metrics.command)
+            )
+        except BaseException as err:
+            metrics.error = describe_error(err)
+            raise
+        else:
+            metrics.success = True
+            metrics.res = result.get("res")
+            return result
+        finally:
+            metrics.total = time.perf_counter() - start
+            if self._metrics_listeners:
+                emit(self._metrics_listeners, metrics)
+
+    def _retry_steps(
+        self,
+        command: bytes,
+        metrics: CommandMetrics,
+        deadline: float | None,
+        policy: RetryPolicy,
+    ) -> Steps:
+        last_error = None
+        breaker = self.breaker
+
+        for attempt in range(1, policy.attempts + 1):
+            if breaker is not None and breaker.blocked:
+                # Rifiutato prima di prendere un token del rate limiter
+                raise _circuit_open(breaker)
+            yield from self._pace_steps(metrics)
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                break
+            if breaker is not None:
+                yield from self._breaker_steps(command, timeout)
+            metrics.start_attempt(attempt, timeout)
+            try:
+                result = yield SEND, command, metrics
+            except TimeoutError as e:
+                last_error = e
+                self.rtt.backoff()
+                logger.warning(
+                    "Timeout dopo %.2f s (tentativo %d/%d): %s",
+                    timeout, attempt, policy.attempts, e,
+                )
+            except (ConnectionError, OSError) as e:
+                last_error = e
+                logger.warning(
+                    "Errore connessione (tentativo %d/%d): %s",
+                    attempt, policy.attempts, e,
+                )
+            except SocketError:
+                # La centralina ha risposto, anche se in modo non valido
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+            except BaseException:
+                if breaker is not None and breaker.probing:
+                    breaker.record_failure()
+                raise
+            else:
+                self._sample_rtt(metrics)
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+            if breaker is not None:
+                breaker.record_failure()
+                if breaker.state != STATE_CLOSED:
+                    raise CircuitOpenError(
+                        f"Centralina non raggiungibile: {last_error}"
+                    ) from last_error
+            if attempt < policy.attempts:
+                pause = policy.delay(attempt)
+                left = remaining(deadline)
+                if left is not None and left <= pause:
+                    break   # nessun margine per un altro tentativo
+                yield SLEEP, pause
+
+        if last_error is None:
+            raise SocketError("Scadenza superata prima dell'invio del comando")
+        raise SocketError(
+            f"Comunicazione fallita dopo {metrics.attempts} tentativi: {last_error}"
+        )
+
+    def _attempt_timeout(self, deadline: float | None) -> float | None:
+        """Timeout del prossimo tentativo, o None se la scadenza è passata."""
+        timeout = self.rtt.timeout
+        left = remaining(deadline)
+        if left is None:
+            return timeout
+        if left <= 0:
+            return None
+        return min(timeout, left)
+
+    def _sample_rtt(self, metrics: CommandMetrics) -> None:
+        """Aggiorna la stima del tempo di risposta con un tentativo riuscito.
+
+        Misura il tempo fino al primo byte della risposta, che comprende
+        l'elaborazione del comando ed è il più lungo tra quelli limitati
+        dal timeout.
+        """
+        if metrics.ttfb is not None:
+            self.rtt.sample(metrics.ttfb)
+
+    def _pace_steps(self, metrics: CommandMetrics) -> Steps:
+        """Attende il token del rate limiter prima di un tentativo."""
+        if self.rate_limiter is None:
+            return
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            metrics.wait += delay
+            yield SLEEP, delay
+
+    def _breaker_steps(self, command: bytes, timeout: float) -> Steps:
+        """Verifica il circuit breaker; a fine pausa invia prima la sonda.
+
+        Senza comando sonda, o se il comando è la sonda stessa, il tentativo
+        del comando fa da sonda.
+        """
+        breaker = self.breaker
+        if not breaker.allow():
+            raise _circuit_open(breaker)
+        if not breaker.probing or self.probe is None or command == self.probe:
+            return
+
+        metrics = CommandMetrics(command_name(self.probe))
+        yield from self._pace_steps(metrics)
+        metrics.start_attempt(1, timeout)
+        start = time.perf_counter()
+        try:
+            yield SEND, self.probe, metrics
+        except SocketError as err:
+            # Risposta non valida, ma la centralina è raggiungibile
+            metrics.error = describe_error(err)
+            breaker.record_success()
+        except BaseException as err:
+            metrics.error = describe_error(err)
+            breaker.record_failure()
+            if isinstance(err, (ConnectionError, OSError)):
+                raise CircuitOpenError(
+                    f"Centralina non raggiungibile: {err}"
+                ) from err
+            raise
+        else:
+            metrics.success = True
+            breaker.record_success()
+        finally:
+            metrics.total = time.perf_counter() - start
+            if self._metrics_listeners:
+                emit(self._metrics_listeners, metrics)
+
+    def _note_keep_alive_drop(self) -> bool:
+        """Conta una connessione persistente persa; True se keep-alive va disattivato."""
+        self._keep_alive_drops += 1
+        if self._keep_alive_drops < MAX_KEEP_ALIVE_DROPS:
+            return False
+        # Il firmware chiude dopo ogni risposta: keep-alive inutile
+        logger.info(
+            "%s chiude la connessione dopo ogni risposta, keep-alive disattivato",
+            self,
+        )
+        self.keep_alive = False
+        self._drop_idle()
+        return True
+
+    def _drop_idle(self) -> None:
+        """Chiude le connessioni persistenti inattive (keep-alive disattivato)."""
@@ -0,0 +1,39 @@
+"""Codifica/decodifica JSON dei messaggi ProAir.
+
+I comandi vengono codificati come json.dumps della libreria standard, nel
+formato di sempre (separatori con spazio, caratteri non ASCII escapati come
+\\uXXXX): è quello verificato con la centralina. Le risposte vengono
+decodificate con orjson se installato (Home Assistant lo include), altrimenti
+con la libreria standard, direttamente dal buffer di ricezione.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    orjson = None
+
+Buffer = bytes | bytearray | memoryview
+
+
+def dumps(obj) -> bytes:
+    """Codifica un comando in bytes, come json.dumps."""
+    return json.dumps(obj).encode("ascii")
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(data: Buffer | str) -> dict:
+        """Decodifica una risposta, anche direttamente da un memoryview."""
+        return orjson.loads(data)
+
+else:
+    BACKEND = "json"
+
+    def loads(data: Buffer | str) -> dict:
+        """Decodifica una risposta (json.loads non accetta memoryview)."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
@@ -0,0 +1,197 @@
+"""Code dei comandi verso una centralina, con priorità.
+
+Le scritture dell'utente passano davanti alle letture di polling in attesa,
+così un upd_zona non resta in coda dietro alle stato_zona di un ciclo.
+Una lettura uguale a una già in coda e non ancora partita non viene
+accodata di nuovo: prende il posto della precedente (che non viene più
+inviata) e tutti i chiamanti ricevono la stessa risposta.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from .retry import WRITE_COMMANDS
+
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+
+
+def command_priority(name: str) -> int:
+    """Priorità di un comando dal suo nome: prima le scritture."""
+    return PRIORITY_WRITE if name in WRITE_COMMANDS else PRIORITY_READ
+
+
+def supersede_key(name: str, command: bytes) -> Hashable | None:
+    """Chiave delle letture che si sostituiscono in coda (None per le scritture).
+
+    Si sostituiscono solo le letture identiche, byte per byte: due stato_sync
+    con token diversi (per esempio di due centraline sullo stesso trasporto)
+    chiedono variazioni diverse e vanno inviate entrambe.
+    """
+    return None if name in WRITE_COMMANDS else command
+
+
+@dataclass(order=True)
+class _Entry:
+    priority: int
+    seq: int
+    command: bytes = field(compare=False)
+    key: Hashable | None = field(compare=False)
+    deadline: float | None = field(compare=False)
+    policy: Any = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    waiters: int = field(default=0, compare=False)
+    started: bool = field(default=False, compare=False)
+
+
+Sender = Callable[[bytes, float | None, Any], Awaitable[dict]]
+
+
+class CommandQueue:
+    """Coda con priorità dei comandi asyncio di una centralina.
+
+    Al più workers comandi vengono inviati alla volta tramite send; gli
+    altri attendono in ordine di priorità e poi di arrivo.
+    """
+
+    def __init__(self, send: Sender, workers: int = 1):
+        self._send = send
+        self.workers = workers
+        self._heap: list[_Entry] = []
+        self._queued: dict[Hashable, _Entry] = {}
+        self._seq = itertools.count()
+        self._tasks: set[asyncio.Task] = set()
+        self.superseded = 0        # letture non inviate perché sostituite
+
+    def __len__(self) -> int:
+        """Comandi in attesa (esclusi quelli in corso)."""
+        return len(self._heap)
+
+    async def submit(
+        self,
+        command: bytes,
+        priority: int,
+        key: Hashable | None = None,
+        deadline: float | None = None,
+        policy: Any = None,
+    ) -> dict:
+        """Accoda un comando e ne attende la risposta."""
+        entry = self._queued.get(key) if key is not None else None
+        if entry is not None:
+            # Lettura già in coda: la più recente prende il suo posto
+            entry.command = command
+            entry.deadline = (
+                None if deadline is None or entry.deadline is None
+                else max(deadline, entry.deadline)
+            )
+            self.superseded += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            # Risposta o errore possono restare senza chiamanti in attesa
+            future.add_done_callback(_consume)
+            entry = _Entry(
+                priority, next(self._seq), command, key, deadline, policy, future
+            )
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._queued[key] = entry
+            if len(self._tasks) < self.workers:
+                task = asyncio.create_task(self._work())
+                self._tasks.add(task)
+                # Per i worker annullati prima di partire; gli altri si
+                # tolgono da soli all'uscita
+                task.add_done_callback(self._tasks.discard)
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.future)
+        except asyncio.CancelledError:
+            entry.waiters -= 1
+            if not entry.waiters and not entry.started:
+                # Nessuno attende più il comando: non viene inviato
+                entry.future.cancel()
+                if entry.key is not None and self._queued.get(entry.key) is entry:
+                    del self._queued[entry.key]
+            raise
+
+    async def _work(self) -> None:
+        """Invia i comandi in coda finché ce ne sono."""
+        try:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                if entry.key is not None and self._queued.get(entry.key) is entry:
+                    del self._queued[entry.key]
+                if entry.future.done():
+                    continue
+                entry.started = True
+                try:
+                    result = await self._send(
+                        entry.command, entry.deadline, entry.policy
+                    )
+                except asyncio.CancelledError:
+                    entry.future.cancel()
+                    raise
+                except BaseException as err:
+                    if not entry.future.done():
+                        entry.future.set_exception(err)
+                else:
+                    if not entry.future.done():
+                        entry.future.set_result(result)
+        finally:
+            # Subito, non con la done callback del task: un submit eseguito
+            # prima di questa lo conterebbe ancora e non avvierebbe un worker
+            self._tasks.discard(asyncio.current_task())
+
+    async def close(self) -> None:
+        """Interrompe i comandi in corso e in coda."""
+        for entry in self._heap:
+            entry.future.cancel()
+        self._heap.clear()
+        self._queued.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _consume(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class PriorityGate:
+    """Serializza i comandi di un client sincrono, dando precedenza alle scritture.
+
+    I thread in attesa entrano in ordine di priorità e poi di arrivo.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._busy = False
+
+    @contextmanager
+    def turn(self, priority: int) -> Iterator[None]:
+        """Attende il proprio turno e lo tiene per la durata del blocco with."""
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while self._busy or self._waiting[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._busy = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -1,8 +1,9 @@
 """Costanti protocollo e builder comandi JSON per centralina ProAir."""
 
-import json
 from datetime import datetime
 
+from . import codec
+
 # --- Comandi protocollo ---
 CMD_STATO = "stato"
 CMD_STATO_R = "stato_r"
@@ -52,6 +53,10 @@ JSON_ERR_CU = "err_cu"
 JSON_MASTER_NR = "master_nr"
 JSON_IR_PRESENT = "ir_present"
 JSON_ZONE = "zone"
+JSON_SYNC = "sync"
+JSON_RESYNC = "resync"
+JSON_FASCE = "fasce"
+JSON_DAY = "day"
 
 # --- Valori fancoil/serranda ---
 FAN_CLOSED = 0
@@ -77,19 +82,29 @@ def _fan_to_wire(value: int) -> int:
     return FAN_AUTO_WIRE if value == FAN_AUTO else value
 
 
-def build_check_pin(pin: str = DEFAULT_PIN) -> str:
+def build_check_pin(pin: str = DEFAULT_PIN) -> bytes:
     """Costruisce comando check_pin."""
-    return json.dumps({"c": CMD_CHECK_PIN, "pin": pin})
+    return codec.dumps({"c": CMD_CHECK_PIN, "pin": pin})
 
 
-def build_get_stato(pin: str = DEFAULT_PIN) -> str:
+def build_get_stato(pin: str = DEFAULT_PIN) -> bytes:
     """Costruisce comando per leggere lo stato completo della centralina."""
-    return json.dumps({"c": CMD_STATO, "pin": pin})
+    return codec.dumps({"c": CMD_STATO, "pin": pin})
+
+
+def build_get_stato_r(pin: str = DEFAULT_PIN) -> bytes:
+    """Costruisce comando per leggere lo stato in formato ridotto."""
+    return codec.dumps({"c": CMD_STATO_R, "pin": pin})
+
 
+def build_get_stato_sync(pin: str = DEFAULT_PIN, sync: int = 0) -> bytes:
+    """Costruisce comando per leggere le variazioni dallo stato con token sync."""
+    return codec.dumps({"c": CMD_STATO_SYNC, "pin": pin, "sync": sync})
 
-def build_get_stato_zona(pin: str = DEFAULT_PIN, zone_id: int = 1) -> str:
+
+def build_get_stato_zona(pin: str = DEFAULT_PIN, zone_id: int = 1) -> bytes:
     """Costruisce comando per leggere lo stato di una zona."""
-    return json.dumps({"c": CMD_STATO_ZONA, "pin": pin, "id_zona": zone_id})
+    return codec.dumps({"c": CMD_STATO_ZONA, "pin": pin, "id_zona": zone_id})
 
 
 def build_upd_cu(
@@ -100,9 +115,9 @@ def build_upd_cu(
     t_can: float = 0.0,
     f_inv: int = 0,
     f_est: int = 0,
-) -> str:
+) -> bytes:
     """Costruisce comando upd_cu per aggiornare lo stato della centralina."""
-    return json.dumps({
+    return codec.dumps({
         "c": CMD_UPD_CU,
         "pin": pin,
         "is_off": 1 if is_off else 0,
@@ -123,9 +138,9 @@ def build_upd_zona(
     fan_set: int,
     shu_set: int,
     is_crono: bool = False,
-) -> str:
+) -> bytes:
     """Costruisce comando upd_zona per aggiornare una zona."""
-    return json.dumps({
+    return codec.dumps({
         "c": CMD_UPD_ZONA,
         "pin": pin,
         "id_zona": zone_id,
@@ -138,12 +153,33 @@ def build_upd_zona(
     })
 
 
-def build_upd_date(pin: str, dt: datetime | None = None) -> str:
+def build_get_fasce(pin: str = DEFAULT_PIN, zone_id: int = 1) -> bytes:
+    """Costruisce comando per leggere le fasce orarie settimanali di una zona."""
+    return codec.dumps({"c": CMD_GET_FASCE, "pin": pin, "id_zona": zone_id})
+
+
+def build_upd_fasce(
+    pin: str, zone_id: int, day: int, bands: list[dict[str, int]]
+) -> bytes:
+    """Costruisce comando upd_fasce per le fasce orarie di un giorno di una zona.
+
+    day va da 1 (lunedì) a 7; bands nel formato di TimeBand.to_json().
+    """
+    return codec.dumps({
+        "c": CMD_UPD_FASCE,
+        "pin": pin,
+        "id_zona": zone_id,
+        "day": day,
+        "f": bands,
+    })
+
+
+def build_upd_date(pin: str, dt: datetime | None = None) -> bytes:
     """Costruisce comando upd_date per sincronizzare l'orologio."""
     if dt is None:
         dt = datetime.now()
 
-    return json.dumps({
+    return codec.dumps({
         "c": CMD_UPD_DATE,
         "pin": pin,
         "h24": 1,
@@ -0,0 +1,140 @@
+"""Lettura delle risposte della centralina con rilevamento della fine del JSON.
+
+La centralina risponde con un singolo oggetto JSON per comando, senza
+terminatore né lunghezza. La risposta è completa quando la graffa di apertura
+più esterna viene chiusa: il lettore tiene traccia di profondità e stringhe
+in modo incrementale, esaminando ogni byte una sola volta.
+"""
+
+import re
+import socket
+
+from . import codec
+
+MAX_RESPONSE_SIZE = 64 * 1024   # byte
+
+# Caratteri strutturali fuori e dentro le stringhe JSON
+_STRUCTURAL = re.compile(rb'[{}"]')
+_IN_STRING = re.compile(rb'["\\]')
+
+_OPEN_BRACE = ord("{")
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+
+class JsonFrameReader:
+    """Accumula una risposta in un buffer preallocato finché il JSON è completo."""
+
+    def __init__(self, max_size: int = MAX_RESPONSE_SIZE):
+        self.max_size = max_size
+        self._buf = bytearray(max_size)
+        self._view = memoryview(self._buf)
+        self.reset()
+
+    def reset(self) -> None:
+        """Prepara il lettore per una nuova risposta."""
+        self._size = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._end = 0
+        self._overflow = False
+
+    @property
+    def complete(self) -> bool:
+        """True quando è arrivato un oggetto JSON completo."""
+        return self._end > 0
+
+    @property
+    def is_full(self) -> bool:
+        """True se la risposta supera la dimensione massima."""
+        return self._overflow or self._size >= self.max_size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def recv_into(self, sock: socket.socket) -> int:
+        """Legge dal socket direttamente nel buffer. Ritorna 0 in caso di EOF."""
+        n = sock.recv_into(self._view[self._size:])
+        if n:
+            self._size += n
+            self._scan()
+        return n
+
+    def feed(self, data: bytes) -> None:
+        """Aggiunge dati ricevuti; l'eccedenza oltre max_size viene scartata."""
+        n = min(len(data), self.max_size - self._size)
+        if n < len(data):
+            self._overflow = True
+        self._view[self._size:self._size + n] = data[:n]
+        self._size += n
+        self._scan()
+
+    def _scan(self) -> None:
+        """Avanza sui byte nuovi aggiornando profondità e stato stringa."""
+        buf = self._buf
+        size = self._size
+        pos = self._pos
+        depth = self._depth
+        in_string = self._in_string
+
+        while pos < size:
+            if in_string:
+                m = _IN_STRING.search(buf, pos, size)
+                if m is None:
+                    pos = size
+                    break
+                start = m.start()
+                if buf[start] == _BACKSLASH:
+                    if start + 1 >= size:
+                        # Escape a cavallo di due letture: riprende da qui
+                        pos = start
+                        break
+                    pos = start + 2
+                    continue
+                in_string = False
+                pos = start + 1
+            else:
+                m = _STRUCTURAL.search(buf, pos, size)
+                if m is None:
+                    pos = size
+                    break
+                c = buf[m.start()]
+                pos = m.start() + 1
+                if c == _QUOTE:
+                    in_string = True
+                elif c == _OPEN_BRACE:
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth <= 0:
+                        self._end = pos
+                        break
+
+        self._pos = pos
+        self._depth = depth
+        self._in_string = in_string
+
+    def payload(self) -> bytes:
+        """Byte ricevuti finora (per log e messaggi di errore)."""
+        return self._view[:self._size].tobytes()
+
+    def decode(self) -> dict:
+        """Decodifica l'oggetto JSON completo."""
+        return codec.loads(self._view[:self._end])
+
+
+class FrameReaderPool:
+    """Riserva di lettori riutilizzabili, uno per comando in corso."""
+
+    def __init__(self, max_size: int = MAX_RESPONSE_SIZE):
+        self.max_size = max_size
+        self._free: list[JsonFrameReader] = []
+
+    def acquire(self) -> JsonFrameReader:
+        reader = self._free.pop() if self._free else JsonFrameReader(self.max_size)
+        reader.reset()
+        return reader
+
+    def release(self, reader: JsonFrameReader) -> None:
+        self._free.append(reader)
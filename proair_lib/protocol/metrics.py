@@ -0,0 +1,93 @@
+"""Misure per comando dei client socket ProAir."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+MetricsListener = Callable[["CommandMetrics"], None]
+
+
+@dataclass
+class CommandMetrics:
+    """Tempi e dimensioni di un comando inviato alla centralina.
+
+    I tempi sono in secondi. timeout, connect_time e ttfb si riferiscono
+    all'ultimo tentativo; connect_time è None se è stata riusata una
+    connessione persistente. total comprende tentativi e pause tra i
+    tentativi, compresa l'attesa dei token del rate limiter (wait).
+    """
+
+    command: str
+    attempts: int = 0
+    timeout: float | None = None        # timeout di connessione e lettura
+    connect_time: float | None = None
+    ttfb: float | None = None          # dall'invio al primo byte della risposta
+    total: float = 0.0
+    wait: float = 0.0                   # attesa dei token, tutti i tentativi
+    bytes_out: int = 0
+    bytes_in: int = 0
+    reused: bool = False
+    success: bool = False
+    res: int | None = None              # codice "res" della risposta
+    error: str | None = None            # motivo dell'ultimo errore
+
+    @property
+    def retries(self) -> int:
+        """Tentativi oltre il primo."""
+        return max(self.attempts - 1, 0)
+
+    def start_attempt(self, attempt: int, timeout: float | None = None) -> None:
+        """Azzera le misure del singolo tentativo."""
+        self.attempts = attempt
+        self.timeout = timeout
+        self.connect_time = None
+        self.ttfb = None
+        self.bytes_in = 0
+        self.reused = False
+
+
+def command_name(command: bytes) -> str:
+    """Nome del comando ("c") da un comando JSON costruito dai build_*.
+
+    I builder mettono "c" come prima chiave: evita di decodificare il JSON.
+    """
+    start = command.find(b'"c":')
+    if start < 0:
+        return "?"
+    start = command.find(b'"', start + 4) + 1
+    end = command.find(b'"', start)
+    if start <= 0 or end < 0:
+        return "?"
+    return command[start:end].decode("utf-8", "replace")
+
+
+def describe_error(err: BaseException) -> str:
+    """Motivo di un errore in forma breve per le metriche."""
+    message = str(err)
+    return f"{type(err).__name__}: {message}" if message else type(err).__name__
+
+
+def add_listener(
+    listeners: list[MetricsListener], listener: MetricsListener
+) -> Callable[[], None]:
+    """Registra un listener; ritorna la funzione per rimuoverlo."""
+    listeners.append(listener)
+
+    def remove() -> None:
+        if listener in listeners:
+            listeners.remove(listener)
+
+    return remove
+
+
+def emit(listeners: list[MetricsListener], metrics: CommandMetrics) -> None:
+    """Notifica le misure ai listener, senza propagare i loro errori."""
+    for listener in list(listeners):
+        try:
+            listener(metrics)
+        except Exception:
+            logger.exception("Errore nel listener delle metriche")
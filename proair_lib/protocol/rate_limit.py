@@ -0,0 +1,90 @@
+"""Cadenza dei comandi verso la centralina.
+
+Il firmware regge male le raffiche di connessioni (per esempio una scena che
+cambia molte zone insieme) e può smettere di rispondere. RateLimiter dà a
+ogni tentativo un token da un token bucket: al più burst tentativi di
+seguito, poi rate al secondo, comunque distanziati di almeno min_interval.
+max_connections limita le connessioni aperte insieme: AsyncProAir e
+ProAirFleet lo impostano a max_concurrency, così l'opzione dell'integrazione
+(1-8) vale davvero anche oltre il default.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+DEFAULT_RATE = 10.0             # token al secondo
+DEFAULT_BURST = 8               # token disponibili a bucket pieno
+DEFAULT_MIN_INTERVAL = 0.02     # secondi tra l'inizio di due tentativi
+DEFAULT_MAX_CONNECTIONS = 4     # connessioni aperte insieme
+
+
+class RateLimiter:
+    """Token bucket con distanza minima tra i tentativi.
+
+    reserve() prenota un token e ritorna quanto attendere prima di usarlo:
+    a bucket vuoto i token successivi sono già prenotati, quindi chi arriva
+    dopo attende di più e l'ordine di arrivo è rispettato.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
+        if rate <= 0 or burst < 1 or max_connections < 1:
+            raise ValueError("rate, burst e max_connections devono essere positivi")
+        self.rate = rate
+        self.burst = burst
+        self.min_interval = min_interval
+        self.max_connections = max_connections
+        self._tokens = float(burst)
+        self._updated: float | None = None      # time.monotonic() dell'ultimo calcolo
+        self._next_start = 0.0                  # primo istante utile per il prossimo
+        self._lock = threading.Lock()
+        self.waits = 0              # tentativi che hanno atteso un token
+        self.total_wait = 0.0       # secondi di attesa complessivi
+
+    def reserve(self) -> float:
+        """Prenota un token; ritorna i secondi da attendere prima di usarlo."""
+        with self._lock:
+            now = time.monotonic()
+            if self._updated is not None:
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+            self._updated = now
+            self._tokens -= 1
+            # Token negativi: prenotati in anticipo da chi attende
+            ready = now - self._tokens / self.rate if self._tokens < 0 else now
+            start = max(ready, self._next_start)
+            self._next_start = start + self.min_interval
+            delay = start - now
+            if delay > 0:
+                self.waits += 1
+                self.total_wait += delay
+            return delay
+
+    @property
+    def tokens(self) -> float:
+        """Token disponibili adesso (negativi se ci sono prenotazioni)."""
+        with self._lock:
+            if self._updated is None:
+                return self._tokens
+            elapsed = time.monotonic() - self._updated
+            return min(self.burst, self._tokens + elapsed * self.rate)
+
+    def as_dict(self) -> dict:
+        """Configurazione e attese per i diagnostics."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "min_interval": self.min_interval,
+            "max_connections": self.max_connections,
+            "tokens": round(self.tokens, 2),
+            "waits": self.waits,
+            "total_wait_ms": round(self.total_wait * 1000, 1),
+        }
@@ -0,0 +1,107 @@
+"""Timeout adattivi e politiche di ripetizione dei comandi ProAir.
+
+Il timeout di ogni tentativo deriva dal tempo di risposta misurato verso la
+centralina, come per il TCP (RFC 6298): media mobile (srtt) e variazione
+(rttvar) dei tempi misurati, timeout = srtt + 4 * rttvar entro
+[MIN_TIMEOUT, MAX_TIMEOUT]. Le pause tra i tentativi crescono in modo
+esponenziale con jitter e non superano mai la scadenza data dal chiamante.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+
+from .commands import CMD_UPD_CU, CMD_UPD_DATE, CMD_UPD_FASCE, CMD_UPD_ZONA
+
+INITIAL_TIMEOUT = 3.0       # secondi, finché non ci sono misure
+MIN_TIMEOUT = 0.5
+MAX_TIMEOUT = 6.0
+_ALPHA = 1 / 8              # peso di una nuova misura in srtt (RFC 6298)
+_BETA = 1 / 4               # peso di una nuova misura in rttvar
+_K = 4
+
+# Comandi che modificano lo stato: ripetuti una volta in più delle letture
+# (impostano valori assoluti, quindi ripeterli è sicuro)
+WRITE_COMMANDS = frozenset({CMD_UPD_CU, CMD_UPD_ZONA, CMD_UPD_DATE, CMD_UPD_FASCE})
+
+
+class RttEstimator:
+    """Stima del tempo di risposta di una centralina e timeout che ne deriva."""
+
+    def __init__(
+        self,
+        initial: float = INITIAL_TIMEOUT,
+        min_timeout: float = MIN_TIMEOUT,
+        max_timeout: float = MAX_TIMEOUT,
+    ):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.timeout = initial
+        self.samples = 0
+
+    def sample(self, rtt: float) -> None:
+        """Aggiunge una misura (secondi) e ricalcola il timeout."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += _BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += _ALPHA * (rtt - self.srtt)
+        self.samples += 1
+        self.timeout = min(
+            max(self.srtt + _K * self.rttvar, self.min_timeout), self.max_timeout
+        )
+
+    def backoff(self) -> None:
+        """Dopo un timeout raddoppia il timeout, fino a max_timeout."""
+        self.timeout = min(self.timeout * 2, self.max_timeout)
+
+    def as_dict(self) -> dict:
+        """Stato della stima per i diagnostics (millisecondi)."""
+        return {
+            "srtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+            "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000, 1),
+            "timeout_ms": round(self.timeout * 1000, 1),
+            "samples": self.samples,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Numero di tentativi e pause tra un tentativo e l'altro.
+
+    La pausa prima del tentativo n+1 è casuale tra 0 e
+    min(base_delay * 2^(n-1), max_delay) ("full jitter").
+    """
+
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+    def delay(self, attempt: int) -> float:
+        """Pausa dopo il tentativo numero attempt (da 1)."""
+        return random.uniform(
+            0, min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        )
+
+
+# Le letture di polling falliscono presto (il prossimo ciclo riproverà),
+# le scritture hanno un tentativo in più
+READ_POLICY = RetryPolicy(attempts=2, base_delay=0.2, max_delay=1.0)
+WRITE_POLICY = RetryPolicy(attempts=3, base_delay=0.2, max_delay=1.0)
+
+
+def policy_for(command: str) -> RetryPolicy:
+    """Politica di default per un comando, dal suo nome."""
+    return WRITE_POLICY if command in WRITE_COMMANDS else READ_POLICY
+
+
+def remaining(deadline: float | None) -> float | None:
+    """Secondi alla scadenza (time.monotonic()), None se non c'è scadenza."""
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
@@ -1,102 +1,220 @@
 """Client TCP socket per comunicazione locale con centralina ProAir."""
 
-import json
 import logging
+import select
 import socket
+import threading
 import time
 
-logger = logging.getLogger(__name__)
-
-BUFFER_SIZE = 1000
-CONNECT_TIMEOUT = 1.0       # secondi
-READ_TIMEOUT = 1.0           # secondi
-RETRY_PAUSE = 0.8            # 800ms tra tentativi di connessione
-TIMEOUT_RETRY_PAUSE = 0.5   # 500ms tra tentativi per timeout
-MAX_CONNECT_RETRIES = 2
-MAX_TIMEOUT_RETRIES = 3
-
-
-class SocketError(Exception):
-    """Errore di comunicazione socket."""
-    pass
+from .breaker import CircuitBreaker
+from .client_base import (
+    SEND,
+    BaseSocketClient,
+    CircuitOpenError,
+    SocketError,
+    Steps,
+    _decode_frame,
+)
+from .command_queue import PriorityGate, command_priority
+from .framing import MAX_RESPONSE_SIZE
+from .metrics import CommandMetrics, command_name
+from .rate_limit import RateLimiter
+from .retry import INITIAL_TIMEOUT, RetryPolicy
 
+logger = logging.getLogger(__name__)
 
-class SocketClient:
-    """Client TCP per comunicazione locale con centralina ProAir."""
+# SocketError e CircuitOpenError si importano anche da qui
+__all__ = ["CircuitOpenError", "SocketClient", "SocketError"]
+
+
+class SocketClient(BaseSocketClient):
+    """Client TCP per comunicazione locale con centralina ProAir.
+
+    Di default apre una connessione per comando. Con keep_alive=True riusa
+    un'unica connessione verso l'host finché la centralina la tiene aperta.
+    Con un CircuitBreaker i comandi verso una centralina che non risponde
+    falliscono subito; a fine pausa il comando probe (se dato) fa da sonda.
+    I comandi chiamati da più thread vengono inviati uno alla volta, con le
+    scritture davanti alle letture in attesa; con un RateLimiter i tentativi
+    sono anche distanziati (una sola connessione alla volta).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 1235,
+        timeout: float = INITIAL_TIMEOUT,
+        keep_alive: bool = False,
+        max_response_size: int = MAX_RESPONSE_SIZE,
+        breaker: CircuitBreaker | None = None,
+        probe: bytes | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        super().__init__(
+            host, port, timeout, keep_alive, max_response_size,
+            breaker, probe, rate_limiter,
+        )
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+        self._gate = PriorityGate()
+
+    def send_command(
+        self,
+        command: bytes | str,
+        deadline: float | None = None,
+        policy: RetryPolicy | None = None,
+    ) -> dict:
+        """Invia un comando JSON (bytes UTF-8 dei build_*) e riceve la risposta.
+
+        In modalità normale apre una nuova connessione TCP per ogni comando
+        (come fa l'app originale), invia il JSON, riceve la risposta, chiude
+        la connessione. In modalità keep-alive riusa la connessione aperta.
+        Un comando alla volta: le scritture passano davanti alle letture in
+        attesa del proprio turno.
+
+        I tentativi seguono policy (di default READ_POLICY per le letture e
+        WRITE_POLICY per le scritture), con timeout derivati dal tempo di
+        risposta misurato; deadline (time.monotonic()) limita il tempo
+        totale, pause comprese.
+        """
+        if isinstance(command, str):
+            command = command.encode("utf-8")
+        metrics = CommandMetrics(command_name(command))
+        with self._gate.turn(command_priority(metrics.command)):
+            return self._run(self._command_steps(command, metrics, deadline, policy))
+
+    def _run(self, steps: Steps):
+        """Esegue i passi di un comando con I/O bloccante."""
+        value = error = None
+        while True:
+            try:
+                step = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value = error = None
+            try:
+                if step[0] is SEND:
+                    value = self._try_send(step[1], step[2])
+                else:
+                    time.sleep(step[1])
+            except BaseException as err:
+                error = err
+
+    def _try_send(self, command: bytes, metrics: CommandMetrics) -> dict:
+        """Singolo tentativo di invio comando e ricezione risposta."""
+        if self.keep_alive:
+            return self._try_send_persistent(command, metrics)
 
-    def __init__(self, host: str, port: int = 1235, timeout: float = 3.0):
-        self.host = host
-        self.port = port
-        self.timeout = timeout
+        sock = self._connect(metrics)
+        try:
+            return self._exchange(sock, command, metrics)
+        finally:
+            sock.close()
 
-    def send_command(self, command_json: str) -> dict:
-        """Invia un comando JSON e riceve la risposta.
+    def _try_send_persistent(self, command: bytes, metrics: CommandMetrics) -> dict:
+        """Tentativo di invio sulla connessione persistente."""
+        with self._lock:
+            sock = self._sock
+            if sock is not None and not self._is_reusable(sock):
+                self._close_persistent()
+                sock = None
+                if self._note_keep_alive_drop():
+                    return self._try_send(command, metrics)
 
-        Apre una nuova connessione TCP per ogni comando (come fa l'app originale),
-        invia il JSON, riceve la risposta, chiude la connessione.
-        """
-        last_error = None
+            reused = metrics.reused = sock is not None
+            if sock is None:
+                sock = self._sock = self._connect(metrics)
 
-        for attempt in range(1, MAX_TIMEOUT_RETRIES + 1):
             try:
-                result = self._try_send(command_json)
-                return result
-            except (socket.timeout, TimeoutError) as e:
-                last_error = e
-                logger.warning(
-                    "Timeout (tentativo %d/%d): %s",
-                    attempt, MAX_TIMEOUT_RETRIES, e,
-                )
-                if attempt < MAX_TIMEOUT_RETRIES:
-                    time.sleep(TIMEOUT_RETRY_PAUSE)
-            except (ConnectionError, OSError) as e:
-                last_error = e
-                logger.warning(
-                    "Errore connessione (tentativo %d/%d): %s",
-                    attempt, MAX_TIMEOUT_RETRIES, e,
-                )
-                if attempt < MAX_TIMEOUT_RETRIES:
-                    time.sleep(RETRY_PAUSE)
-
-        raise SocketError(
-            f"Comunicazione fallita dopo {MAX_TIMEOUT_RETRIES} tentativi: {last_error}"
-        )
-
-    def _try_send(self, command_json: str) -> dict:
-        """Singolo tentativo di invio comando e ricezione risposta."""
+                result = self._exchange(sock, command, metrics)
+            except (ConnectionError, SocketError):
+                self._close_persistent()
+                if not reused:
+                    raise
+                # La connessione riusata era morta: riprova subito su una nuova
+                logger.debug("Connessione persistente persa, riconnessione")
+                if self._note_keep_alive_drop():
+                    return self._try_send(command, metrics)
+                metrics.reused = False
+                sock = self._sock = self._connect(metrics)
+                try:
+                    result = self._exchange(sock, command, metrics)
+                except BaseException:
+                    self._close_persistent()
+                    raise
+            except BaseException:
+                self._close_persistent()
+                raise
+            else:
+                if reused:
+                    self._keep_alive_drops = 0
+            return result
+
+    def _connect(self, metrics: CommandMetrics) -> socket.socket:
+        """Apre una connessione TCP verso la centralina."""
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
-
+        sock.settimeout(metrics.timeout)
+        start = time.perf_counter()
         try:
             logger.debug("Connessione a %s:%d ...", self.host, self.port)
             sock.connect((self.host, self.port))
+        except BaseException:
+            sock.close()
+            raise
+        metrics.connect_time = time.perf_counter() - start
+        return sock
 
-            # Invio comando
-            logger.debug("TX: %s", command_json)
-            sock.sendall(command_json.encode("utf-8"))
+    @staticmethod
+    def _is_reusable(sock: socket.socket) -> bool:
+        """Verifica che una connessione inattiva sia ancora utilizzabile.
 
-            # Ricezione risposta
-            response_data = b""
-            while True:
-                chunk = sock.recv(BUFFER_SIZE)
-                if not chunk:
-                    break
-                response_data += chunk
-                if len(chunk) < BUFFER_SIZE:
+        Una connessione a riposo leggibile è stata chiusa dal peer (EOF)
+        oppure contiene dati inattesi: in entrambi i casi va scartata.
+        """
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def _close_persistent(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _exchange(
+        self, sock: socket.socket, command: bytes, metrics: CommandMetrics
+    ) -> dict:
+        """Invia il comando sulla connessione data e legge la risposta."""
+        # Invio comando
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TX: %s", command.decode("utf-8", "replace"))
+        sock.settimeout(metrics.timeout)   # la connessione può essere riusata
+        sent = time.perf_counter()
+        sock.sendall(command)
+        metrics.bytes_out += len(command)
+
+        # Ricezione risposta: legge finché l'oggetto JSON non è completo
+        frame = self._readers.acquire()
+        try:
+            while not frame.complete:
+                if frame.is_full:
+                    raise SocketError(
+                        f"Risposta oltre {frame.max_size} byte dalla centralina"
+                    )
+                if not frame.recv_into(sock):
                     break
-                # Se il buffer è pieno, aspetta 100ms e rilegge
-                time.sleep(0.1)
-
-            response_str = response_data.decode("utf-8")
-            logger.debug("RX: %s", response_str)
-
-            if not response_str:
-                raise SocketError("Risposta vuota dalla centralina")
-
-            return json.loads(response_str)
-
+                if metrics.ttfb is None:
+                    metrics.ttfb = time.perf_counter() - sent
+            metrics.bytes_in = len(frame)
+            return _decode_frame(frame)
         finally:
-            sock.close()
+            self._readers.release(frame)
+
+    def close(self) -> None:
+        """Chiude l'eventuale connessione persistente."""
+        with self._lock:
+            self._close_persistent()
 
     def __repr__(self) -> str:
         return f"SocketClient({self.host}:{self.port})"
@@ -0,0 +1,106 @@
+"""Comandi precompilati per un PIN, pronti da inviare come bytes.
+
+I comandi costanti (check_pin, stato, stato_r, stato_zona per zona) vengono
+codificati una sola volta e riusati a ogni polling. I comandi con parametri
+(stato_sync, upd_cu, upd_zona) sono template bytes in cui vengono inseriti
+solo i valori: il risultato è identico, byte per byte, a quello dei build_*.
+"""
+
+from . import codec
+from .commands import (
+    CMD_STATO_SYNC,
+    CMD_UPD_CU,
+    CMD_UPD_ZONA,
+    build_check_pin,
+    build_get_stato,
+    build_get_stato_r,
+    build_get_stato_zona,
+    _fan_to_wire,
+)
+
+
+def _template(command: str, pin: str, fields: bytes) -> bytes:
+    """Template %-format: intestazione codificata dal codec seguita dai campi."""
+    head = codec.dumps({"c": command, "pin": pin})[:-1]
+    return head.replace(b"%", b"%%") + fields
+
+
+class CommandTemplates:
+    """Comandi ProAir per un PIN, codificati una volta sola."""
+
+    def __init__(self, pin: str):
+        self.pin = pin
+        self.check_pin = build_check_pin(pin)
+        self.get_stato = build_get_stato(pin)
+        self.get_stato_r = build_get_stato_r(pin)
+        self._stato_zona: dict[int, bytes] = {}
+        self._names: dict[str, bytes] = {}     # nomi zona già codificati
+
+        # Stesso ordine delle chiavi dei build_*; i valori entrano con %
+        self._stato_sync = _template(CMD_STATO_SYNC, pin, b', "sync": %d}')
+        self._upd_cu = _template(
+            CMD_UPD_CU,
+            pin,
+            b', "is_off": %d, "is_cool": %d, "cool_mod": %d, "t_can": %d, '
+            b'"f_inv": %d, "f_est": %d}',
+        )
+        self._upd_zona = _template(
+            CMD_UPD_ZONA,
+            pin,
+            b', "id_zona": %d, "name": %b, "is_off": %d, "t_set": "%d", '
+            b'"fan_set": %d, "shu_set": %d, "is_crono": %d}',
+        )
+
+    def get_stato_zona(self, zone_id: int) -> bytes:
+        """Comando stato_zona per una zona (in cache dopo il primo uso)."""
+        cmd = self._stato_zona.get(zone_id)
+        if cmd is None:
+            cmd = self._stato_zona[zone_id] = build_get_stato_zona(self.pin, zone_id)
+        return cmd
+
+    def get_stato_sync(self, sync: int = 0) -> bytes:
+        """Comando stato_sync con il token dato."""
+        return self._stato_sync % sync
+
+    def upd_cu(
+        self,
+        is_off: bool,
+        is_cooling: bool,
+        operating_mode: int,
+        t_can: float = 0.0,
+        f_inv: int = 0,
+        f_est: int = 0,
+    ) -> bytes:
+        """Comando upd_cu, come build_upd_cu."""
+        return self._upd_cu % (
+            1 if is_off else 0,
+            1 if is_cooling else 0,
+            operating_mode,
+            int(t_can * 10),
+            f_inv,
+            f_est,
+        )
+
+    def upd_zona(
+        self,
+        zone_id: int,
+        name: str,
+        is_off: bool,
+        set_temp: float,
+        fan_set: int,
+        shu_set: int,
+        is_crono: bool = False,
+    ) -> bytes:
+        """Comando upd_zona, come build_upd_zona."""
+        name_json = self._names.get(name)
+        if name_json is None:
+            name_json = self._names[name] = codec.dumps(name)
+        return self._upd_zona % (
+            zone_id,
+            name_json,
+            1 if is_off else 0,
+            int(set_temp * 10),
+            _fan_to_wire(fan_set),
+            _fan_to_wire(shu_set),
+            1 if is_crono else 0,
+        )
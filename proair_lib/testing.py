@@ -0,0 +1,409 @@
+"""Simulatore locale della centralina ProAir, per test e benchmark.
+
+FakeProAirServer è un server TCP asyncio che risponde ai comandi del
+protocollo con payload realistici, mantenendo in memoria lo stato di
+centralina e zone. Latenza, jitter, risposte spezzate, cadute di connessione
+ed errori PIN sono configurabili, così da poter misurare il comportamento
+della libreria senza una centralina reale.
+
+Esempio:
+
+    async with FakeProAirServer(zones=8, latency=0.02) as server:
+        proair = AsyncProAir(server.host, server.port, server.pin)
+        cu = await proair.get_status()
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+from collections import Counter
+
+from .protocol.commands import (
+    CMD_CHECK_PIN,
+    CMD_GET_FASCE,
+    CMD_STATO,
+    CMD_STATO_R,
+    CMD_STATO_SYNC,
+    CMD_STATO_ZONA,
+    CMD_UPD_CU,
+    CMD_UPD_DATE,
+    CMD_UPD_FASCE,
+    CMD_UPD_ZONA,
+    DEFAULT_PIN,
+    RES_CMD_NOT_FOUND,
+    RES_ERROR_PIN,
+    RES_OK,
+)
+from .protocol.framing import JsonFrameReader
+
+logger = logging.getLogger(__name__)
+
+RES_ERROR = 0
+
+# Campi zona nel formato completo -> chiave nel formato ridotto (stato_r)
+_REDUCED_ZONE_KEYS = {
+    "nr": "nr",
+    "name": "n",
+    "is_off": "off",
+    "t": "t",
+    "t_set": "ts",
+    "u": "u",
+    "u_set": "us",
+    "c_win": "w",
+    "c_badge": "b",
+    "co": "co",
+    "err": "err",
+}
+_REDUCED_CU_KEYS = {
+    "is_off": "off",
+    "is_cool": "cl",
+    "cool_mod": "cl_m",
+    "master_nr": "m_nr",
+    "ir_present": "ir",
+    "t_can": "tc",
+    "f_est": "fe",
+    "f_inv": "fi",
+    "err_cu": "err_cu",
+}
+_UPD_CU_KEYS = ("is_off", "is_cool", "cool_mod", "t_can", "f_inv", "f_est")
+_UPD_ZONA_KEYS = ("name", "is_off", "t_set", "fan_set", "shu_set", "is_crono")
+
+
+def make_zone_state(zone_id: int) -> dict:
+    """Stato iniziale realistico di una zona (formato completo)."""
+    return {
+        "id_zona": zone_id,
+        "nr": zone_id,
+        "name": f"Zona {zone_id}",
+        "is_off": 0,
+        "t": 195 + (zone_id * 7) % 40,
+        "t_set": 200 + (zone_id % 3) * 10,
+        "fan": -1,
+        "fan_set": 0,
+        "shu": 17,
+        "shu_set": 0,
+        "EV": -1,
+        "is_crono": 0,
+        "crono_on": 0,
+        "u": 450 + (zone_id * 13) % 150,
+        "u_set": 0,
+        "c_win": 0,
+        "c_badge": 0,
+        "co": 0,
+        "err": 0,
+    }
+
+
+def make_zone_schedule() -> dict[int, list[dict]]:
+    """Fasce orarie di default di una zona: giorno (1-7) -> fasce (get_fasce)."""
+    weekday = [
+        {"ini": 390, "fin": 510, "t_set": 210},
+        {"ini": 1020, "fin": 1320, "t_set": 210},
+    ]
+    weekend = [{"ini": 480, "fin": 1380, "t_set": 205}]
+    return {
+        day: [dict(band) for band in (weekday if day <= 5 else weekend)]
+        for day in range(1, 8)
+    }
+
+
+def make_cu_state() -> dict:
+    """Stato iniziale realistico della centralina (formato completo)."""
+    return {
+        "is_off": 0,
+        "is_cool": 0,
+        "cool_mod": 0,
+        "master_nr": 1,
+        "ir_present": 0,
+        "t_can": 350,
+        "f_est": 0,
+        "f_inv": 0,
+        "err_cu": 0,
+    }
+
+
+class FakeProAirServer:
+    """Centralina ProAir simulata su una porta TCP locale.
+
+    latency può essere un numero (secondi, per tutti i comandi) o un dict
+    comando -> secondi. jitter aggiunge un ritardo casuale uniforme in
+    [0, jitter]. Con chunk_size > 0 le risposte vengono inviate a pezzi,
+    con chunk_delay secondi tra un pezzo e l'altro. drop_rate è la
+    probabilità di chiudere la connessione senza rispondere. Con
+    keep_alive=False la connessione viene chiusa dopo ogni risposta, come
+    fa il firmware. I comandi in unsupported ricevono res=4.
+    """
+
+    def __init__(
+        self,
+        zones: int = 8,
+        pin: str = DEFAULT_PIN,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float | dict[str, float] = 0.0,
+        jitter: float = 0.0,
+        chunk_size: int = 0,
+        chunk_delay: float = 0.0,
+        drop_rate: float = 0.0,
+        keep_alive: bool = False,
+        unsupported: tuple[str, ...] = (),
+        seed: int | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.pin = pin
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.drop_rate = drop_rate
+        self.keep_alive = keep_alive
+        self.unsupported = set(unsupported)
+        self._random = random.Random(seed)
+
+        self.cu = make_cu_state()
+        self.zones = {z: make_zone_state(z) for z in range(1, zones + 1)}
+        self.schedules = {z: make_zone_schedule() for z in self.zones}
+        self.clock: dict | None = None
+
+        # Versione dello stato per stato_sync: (zona o None, chiave) -> versione
+        self.version = 1
+        self._changes: dict[tuple[int | None, str], int] = {}
+
+        # Statistiche
+        self.commands: Counter[str] = Counter()
+        self.connections = 0
+        self.drops = 0
+
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    # --- Ciclo di vita ---
+
+    async def start(self) -> None:
+        """Avvia il server; se port=0 viene scelta una porta libera."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.debug("FakeProAirServer in ascolto su %s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Ferma il server e chiude le connessioni aperte."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "FakeProAirServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    # --- Modifica dello stato (lato "centralina") ---
+
+    def set_zone_value(self, zone_id: int, key: str, value) -> None:
+        """Modifica un campo di una zona come farebbe la centralina."""
+        self._set(self.zones[zone_id], zone_id, key, value)
+
+    def set_cu_value(self, key: str, value) -> None:
+        """Modifica un campo della centralina come farebbe la centralina."""
+        self._set(self.cu, None, key, value)
+
+    def _set(self, target: dict, zone_id: int | None, key: str, value) -> None:
+        if target.get(key) == value:
+            return
+        target[key] = value
+        self.version += 1
+        self._changes[(zone_id, key)] = self.version
+
+    # --- Connessioni ---
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        frame = JsonFrameReader()
+        try:
+            while True:
+                frame.reset()
+                while not frame.complete and not frame.is_full:
+                    chunk = await reader.read(4096)
+                    if not chunk:
+                        return
+                    frame.feed(chunk)
+                if not frame.complete:
+                    return
+
+                try:
+                    request = frame.decode()
+                except ValueError:
+                    return
+                command = request.get("c", "")
+                self.commands[command] += 1
+
+                await self._delay(command)
+                if self.drop_rate and self._random.random() < self.drop_rate:
+                    self.drops += 1
+                    return
+
+                await self._send(writer, self.handle_command(request))
+                if not self.keep_alive:
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError, asyncio.CancelledError):
+                await writer.wait_closed()
+
+    async def _delay(self, command: str) -> None:
+        if isinstance(self.latency, dict):
+            delay = self.latency.get(command, 0.0)
+        else:
+            delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _send(self, writer: asyncio.StreamWriter, response: dict) -> None:
+        data = json.dumps(response).encode("utf-8")
+        if self.chunk_size <= 0:
+            writer.write(data)
+            await writer.drain()
+            return
+        for start in range(0, len(data), self.chunk_size):
+            writer.write(data[start:start + self.chunk_size])
+            await writer.drain()
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+
+    # --- Comandi ---
+
+    def handle_command(self, request: dict) -> dict:
+        """Risposta al comando, come la darebbe la centralina."""
+        command = request.get("c", "")
+        if command in self.unsupported:
+            return {"res": RES_CMD_NOT_FOUND, "c": command}
+        if request.get("pin") != self.pin:
+            return {"res": RES_ERROR_PIN, "c": command}
+
+        handler = {
+            CMD_CHECK_PIN: self._cmd_check_pin,
+            CMD_STATO: self._cmd_stato,
+            CMD_STATO_R: self._cmd_stato_r,
+            CMD_STATO_ZONA: self._cmd_stato_zona,
+            CMD_STATO_SYNC: self._cmd_stato_sync,
+            CMD_UPD_CU: self._cmd_upd_cu,
+            CMD_UPD_ZONA: self._cmd_upd_zona,
+            CMD_UPD_DATE: self._cmd_upd_date,
+            CMD_GET_FASCE: self._cmd_get_fasce,
+            CMD_UPD_FASCE: self._cmd_upd_fasce,
+        }.get(command)
+        if handler is None:
+            return {"res": RES_CMD_NOT_FOUND, "c": command}
+        return handler(request)
+
+    def _cmd_check_pin(self, request: dict) -> dict:
+        return {"res": RES_OK, "c": CMD_CHECK_PIN}
+
+    def _cmd_stato(self, request: dict) -> dict:
+        return {
+            "res": RES_OK,
+            "c": CMD_STATO,
+            "sync": self.version,
+            **self.cu,
+            "zone": [dict(z) for z in self.zones.values()],
+        }
+
+    def _cmd_stato_r(self, request: dict) -> dict:
+        response = {"res": RES_OK, "c": CMD_STATO_R}
+        for key, short in _REDUCED_CU_KEYS.items():
+            response[short] = self.cu[key]
+        response["zone"] = [
+            {short: z[key] for key, short in _REDUCED_ZONE_KEYS.items()}
+            for z in self.zones.values()
+        ]
+        return response
+
+    def _cmd_stato_zona(self, request: dict) -> dict:
+        zone = self.zones.get(request.get("id_zona"))
+        if zone is None:
+            return {"res": RES_ERROR, "c": CMD_STATO_ZONA}
+        return {"res": RES_OK, "c": CMD_STATO_ZONA, "zone": [dict(zone)]}
+
+    def _cmd_stato_sync(self, request: dict) -> dict:
+        since = request.get("sync", 0)
+        if not since or since > self.version:
+            return {"res": RES_OK, "c": CMD_STATO_SYNC, "resync": 1}
+
+        response: dict = {"res": RES_OK, "c": CMD_STATO_SYNC, "sync": self.version}
+        zones: dict[int, dict] = {}
+        for (zone_id, key), version in self._changes.items():
+            if version <= since:
+                continue
+            if zone_id is None:
+                response[key] = self.cu[key]
+            else:
+                zones.setdefault(zone_id, {"id_zona": zone_id})[key] = (
+                    self.zones[zone_id][key]
+                )
+        if zones:
+            response["zone"] = [zones[z] for z in sorted(zones)]
+        return response
+
+    def _cmd_upd_cu(self, request: dict) -> dict:
+        for key in _UPD_CU_KEYS:
+            if key in request:
+                self.set_cu_value(key, request[key])
+        return {"res": RES_OK, "c": CMD_UPD_CU}
+
+    def _cmd_upd_zona(self, request: dict) -> dict:
+        zone_id = request.get("id_zona")
+        if zone_id not in self.zones:
+            return {"res": RES_ERROR, "c": CMD_UPD_ZONA}
+        for key in _UPD_ZONA_KEYS:
+            if key in request:
+                value = request[key]
+                # t_set arriva come stringa nei comandi di scrittura
+                if key == "t_set":
+                    value = int(value)
+                self.set_zone_value(zone_id, key, value)
+        return {"res": RES_OK, "c": CMD_UPD_ZONA}
+
+    def _cmd_upd_date(self, request: dict) -> dict:
+        self.clock = {k: request[k] for k in ("h24", "day", "hour", "minute") if k in request}
+        return {"res": RES_OK, "c": CMD_UPD_DATE}
+
+    def _cmd_get_fasce(self, request: dict) -> dict:
+        zone_id = request.get("id_zona")
+        schedule = self.schedules.get(zone_id)
+        if schedule is None:
+            return {"res": RES_ERROR, "c": CMD_GET_FASCE}
+        return {
+            "res": RES_OK,
+            "c": CMD_GET_FASCE,
+            "id_zona": zone_id,
+            "fasce": [
+                {"day": day, "f": [dict(band) for band in bands]}
+                for day, bands in schedule.items()
+            ],
+        }
+
+    def _cmd_upd_fasce(self, request: dict) -> dict:
+        schedule = self.schedules.get(request.get("id_zona"))
+        day = request.get("day")
+        if schedule is None or day not in schedule:
+            return {"res": RES_ERROR, "c": CMD_UPD_FASCE}
+        schedule[day] = [dict(band) for band in request.get("f", [])]
+        return {"res": RES_OK, "c": CMD_UPD_FASCE}
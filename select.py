@@ -7,9 +7,7 @@ from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ProAirConfigEntry
 from .const import (
@@ -17,9 +15,9 @@ from .const import (
     CU_MODE_DEHUMIDIFY,
     CU_MODE_HEATING,
     CU_MODE_VENTILATION,
-    DOMAIN,
 )
 from .coordinator import ProAirCoordinator
+from .entity import ProAirEntity
 from .proair_lib.models.control_unit import (
     MODE_COOLING,
     MODE_DEHUMIDIFY,
@@ -56,10 +54,9 @@ async def async_setup_entry(
     async_add_entities([ProAirModeSelect(coordinator, entry)])
 
 
-class ProAirModeSelect(CoordinatorEntity[ProAirCoordinator], SelectEntity):
+class ProAirModeSelect(ProAirEntity, SelectEntity):
     """Select entity for the CU operating mode."""
 
-    _attr_has_entity_name = True
     _attr_options = [
         CU_MODE_HEATING,
         CU_MODE_COOLING,
@@ -79,17 +76,6 @@ class ProAirModeSelect(CoordinatorEntity[ProAirCoordinator], SelectEntity):
         self._attr_unique_id = f"{host}_mode"
         self._attr_name = "Operating mode"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for the control unit."""
-        host = self.coordinator.proair.host
-        return DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name="ProAir Centralina",
-            manufacturer="Tecnosystemi",
-            model="ProAir",
-        )
-
     @property
     def current_option(self) -> str | None:
         """Return the current operating mode."""
@@ -105,15 +91,12 @@ class ProAirModeSelect(CoordinatorEntity[ProAirCoordinator], SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Set the operating mode."""
-        proair = self.coordinator.proair
-
-        if option == CU_MODE_HEATING:
-            await self.hass.async_add_executor_job(proair.set_heating_mode)
-        elif option == CU_MODE_COOLING:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 1)
-        elif option == CU_MODE_DEHUMIDIFY:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 2)
-        elif option == CU_MODE_VENTILATION:
-            await self.hass.async_add_executor_job(proair.set_cooling_mode, 3)
-
-        await self.coordinator.async_request_refresh()
+        if option not in SELECT_TO_CU:
+            return
+        is_cooling, mode = SELECT_TO_CU[option]
+        await self.coordinator.async_write(
+            self.coordinator.proair.apply_cu_state(
+                is_cooling=is_cooling, operating_mode=mode
+            ),
+            cu_fields={"is_cooling": is_cooling, "operating_mode": mode},
+        )
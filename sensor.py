@@ -2,26 +2,82 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ProAirConfigEntry
-from .const import DOMAIN
 from .coordinator import ProAirCoordinator
+from .entity import ProAirEntity, ProAirZoneEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class ProAirStatsSensorDescription(SensorEntityDescription):
+    """Describes a communication statistics sensor."""
+
+    value_fn: Callable[[ProAirCoordinator], float | None]
+
+
+STATS_SENSORS: tuple[ProAirStatsSensorDescription, ...] = (
+    ProAirStatsSensorDescription(
+        key="latency_p50",
+        translation_key="latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.stats.latency_percentile(50),
+    ),
+    ProAirStatsSensorDescription(
+        key="latency_p95",
+        translation_key="latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.stats.latency_percentile(95),
+    ),
+    ProAirStatsSensorDescription(
+        key="success_rate",
+        translation_key="success_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: coordinator.stats.success_rate,
+    ),
+    ProAirStatsSensorDescription(
+        key="data_age",
+        translation_key="data_age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.data_age,
+    ),
+    ProAirStatsSensorDescription(
+        key="last_cycle_duration",
+        translation_key="last_cycle_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.last_cycle_duration,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ProAirConfigEntry,
@@ -30,13 +86,18 @@ async def async_setup_entry(
     """Set up ProAir sensor entities."""
     coordinator = entry.runtime_data
     cu = coordinator.data
-    host = entry.data["host"]
 
     entities: list[SensorEntity] = []
 
     # Sensore temperatura canale (CU)
     entities.append(ProAirCanalTempSensor(coordinator, entry))
 
+    # Sensori diagnostici sulla comunicazione con la centralina
+    entities.extend(
+        ProAirStatsSensor(coordinator, entry, description)
+        for description in STATS_SENSORS
+    )
+
     # Sensori per ogni zona
     for zone in cu.zones:
         entities.append(ProAirZoneTempSensor(coordinator, entry, zone.zone_id))
@@ -45,10 +106,9 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class ProAirCanalTempSensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
+class ProAirCanalTempSensor(ProAirEntity, SensorEntity):
     """Sensor for canal temperature of the control unit."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -65,27 +125,15 @@ class ProAirCanalTempSensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
         self._attr_unique_id = f"{host}_canal_temp"
         self._attr_name = "Canal temperature"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for the control unit."""
-        host = self.coordinator.proair.host
-        return DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name="ProAir Centralina",
-            manufacturer="Tecnosystemi",
-            model="ProAir",
-        )
-
     @property
     def native_value(self) -> float | None:
         """Return the canal temperature."""
         return self.coordinator.data.temp_can
 
 
-class ProAirZoneTempSensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
+class ProAirZoneTempSensor(ProAirZoneEntity, SensorEntity):
     """Sensor for zone temperature."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -98,34 +146,11 @@ class ProAirZoneTempSensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
         zone_id: int,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, zone_id)
         host = entry.data["host"]
-        self._zone_id = zone_id
         self._attr_unique_id = f"{host}_{zone_id}_temp"
         self._attr_name = "Temperature"
 
-    @property
-    def _zone(self):
-        """Get the zone data from coordinator."""
-        for z in self.coordinator.data.zones:
-            if z.zone_id == self._zone_id:
-                return z
-        return None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this zone."""
-        host = self.coordinator.proair.host
-        zone = self._zone
-        zone_name = zone.name if zone else f"Zone {self._zone_id}"
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{host}_zone_{self._zone_id}")},
-            name=f"ProAir {zone_name}",
-            manufacturer="Tecnosystemi",
-            model="ProAir Zone",
-            via_device=(DOMAIN, host),
-        )
-
     @property
     def native_value(self) -> float | None:
         """Return the zone temperature."""
@@ -133,10 +158,9 @@ class ProAirZoneTempSensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
         return zone.temp if zone else None
 
 
-class ProAirZoneHumiditySensor(CoordinatorEntity[ProAirCoordinator], SensorEntity):
+class ProAirZoneHumiditySensor(ProAirZoneEntity, SensorEntity):
     """Sensor for zone humidity."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.HUMIDITY
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
@@ -149,34 +173,11 @@ class ProAirZoneHumiditySensor(CoordinatorEntity[ProAirCoordinator], SensorEntit
         zone_id: int,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, zone_id)
         host = entry.data["host"]
-        self._zone_id = zone_id
         self._attr_unique_id = f"{host}_{zone_id}_humidity"
         self._attr_name = "Humidity"
 
-    @property
-    def _zone(self):
-        """Get the zone data from coordinator."""
-        for z in self.coordinator.data.zones:
-            if z.zone_id == self._zone_id:
-                return z
-        return None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for this zone."""
-        host = self.coordinator.proair.host
-        zone = self._zone
-        zone_name = zone.name if zone else f"Zone {self._zone_id}"
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"{host}_zone_{self._zone_id}")},
-            name=f"ProAir {zone_name}",
-            manufacturer="Tecnosystemi",
-            model="ProAir Zone",
-            via_device=(DOMAIN, host),
-        )
-
     @property
     def native_value(self) -> float | None:
         """Return the zone humidity."""
@@ -184,3 +185,36 @@ class ProAirZoneHumiditySensor(CoordinatorEntity[ProAirCoordinator], SensorEntit
         if zone and zone.umd > 0:
             return zone.umd
         return None
+
+
+class ProAirStatsSensor(ProAirEntity, SensorEntity):
+    """Diagnostic sensor for the communication with the control unit."""
+
+    entity_description: ProAirStatsSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: ProAirCoordinator,
+        entry: ProAirConfigEntry,
+        description: ProAirStatsSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        # Le statistiche cambiano a ogni ciclo, anche senza variazioni di stato
+        super().__init__(coordinator, context=None)
+        self.entity_description = description
+        host = entry.data["host"]
+        self._attr_unique_id = f"{host}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Statistics stay available while the control unit is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the statistic."""
+        return self.entity_description.value_fn(self.coordinator)
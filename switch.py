@@ -7,13 +7,11 @@ from typing import Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ProAirConfigEntry
-from .const import DOMAIN
 from .coordinator import ProAirCoordinator
+from .entity import ProAirEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,10 +26,9 @@ async def async_setup_entry(
     async_add_entities([ProAirPowerSwitch(coordinator, entry)])
 
 
-class ProAirPowerSwitch(CoordinatorEntity[ProAirCoordinator], SwitchEntity):
+class ProAirPowerSwitch(ProAirEntity, SwitchEntity):
     """Switch to turn the ProAir control unit on/off."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SwitchDeviceClass.SWITCH
     _attr_translation_key = "power"
 
@@ -46,17 +43,6 @@ class ProAirPowerSwitch(CoordinatorEntity[ProAirCoordinator], SwitchEntity):
         self._attr_unique_id = f"{host}_power"
         self._attr_name = "Power"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info for the control unit."""
-        host = self.coordinator.proair.host
-        return DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name="ProAir Centralina",
-            manufacturer="Tecnosystemi",
-            model="ProAir",
-        )
-
     @property
     def is_on(self) -> bool:
         """Return true if the CU is on."""
@@ -64,10 +50,14 @@ class ProAirPowerSwitch(CoordinatorEntity[ProAirCoordinator], SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the CU on."""
-        await self.hass.async_add_executor_job(self.coordinator.proair.set_cu_on)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_cu_on(),
+            cu_fields={"is_off": False},
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the CU off."""
-        await self.hass.async_add_executor_job(self.coordinator.proair.set_cu_off)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_write(
+            self.coordinator.proair.set_cu_off(),
+            cu_fields={"is_off": True},
+        )
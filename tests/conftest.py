@@ -0,0 +1,34 @@
+"""Configurazione pytest: rende importabile proair_lib dalla root del repository.
+
+La root va aggiunta in fondo a sys.path: la piattaforma select.py
+dell'integrazione nasconderebbe il modulo select della libreria standard.
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+INTEGRATION = "proair"
+
+sys.path.append(str(ROOT))
+
+
+@pytest.fixture
+def integration():
+    """Importa l'integrazione (la root del repository) come package proair.
+
+    Richiede Home Assistant: senza, il test viene saltato.
+    """
+    pytest.importorskip("homeassistant")
+    if INTEGRATION not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            INTEGRATION, ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[INTEGRATION] = module
+        spec.loader.exec_module(module)
+    return importlib.import_module
@@ -0,0 +1,14 @@
+"""Plugin pytest: la root del repository non è un package di test."""
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collect_directory(path, parent):
+    if path == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,86 @@
+"""Test della notifica delle sole entità la cui zona o centralina è cambiata."""
+
+from proair_lib.models import ControlUnit, Zone
+
+
+def _status() -> ControlUnit:
+    return ControlUnit(
+        name="Casa",
+        zones=[
+            Zone(zone_id=1, name="Zona 1", temp=20.5, set_temp=21.0),
+            Zone(zone_id=2, name="Zona 2", temp=19.0, set_temp=20.0),
+        ],
+    )
+
+
+def test_unchanged_status_has_no_changes():
+    assert _status().changes(_status()) == (False, set())
+
+
+def test_zone_change_reports_only_that_zone():
+    cu = _status()
+    cu.get_zone(2).temp = 19.5
+    assert cu.changes(_status()) == (False, {2})
+
+
+def test_cu_change_reports_no_zone():
+    cu = _status()
+    cu.is_off = True
+    assert cu.changes(_status()) == (True, set())
+
+
+def test_added_and_removed_zones_are_changes():
+    cu = _status()
+    cu.zones = [cu.zones[0], Zone(zone_id=3, name="Zona 3")]
+    assert cu.changes(_status()) == (False, {2, 3})
+
+
+def test_only_affected_listeners_are_notified(integration):
+    """Il coordinator chiama solo i listener con un contesto cambiato.
+
+    Senza contesto un listener riceve ogni aggiornamento; un cambio di
+    disponibilità li notifica tutti.
+    """
+    coordinator_module = integration("proair.coordinator")
+    coordinator_cls = coordinator_module.ProAirCoordinator
+    cu_context = coordinator_module.CONTEXT_CU
+
+    # Solo lo stato usato da async_update_listeners, senza hass
+    coordinator = coordinator_cls.__new__(coordinator_cls)
+    coordinator.data = _status()
+    coordinator.last_update_success = True
+    coordinator._notified_data = None
+    coordinator._notified_success = True
+
+    notified: list[str] = []
+    contexts = {
+        "zona 1": 1,
+        "zona 2": 2,
+        "centralina": cu_context,
+        "clima 1": (1, cu_context),
+        "statistiche": None,
+    }
+    coordinator._listeners = {
+        object(): (lambda name=name: notified.append(name), context)
+        for name, context in contexts.items()
+    }
+
+    def refresh(cu: ControlUnit, success: bool = True) -> list[str]:
+        notified.clear()
+        coordinator.data = cu
+        coordinator.last_update_success = success
+        coordinator.async_update_listeners()
+        return sorted(notified)
+
+    assert refresh(_status()) == sorted(contexts)     # primo stato: tutti
+
+    cu = _status()
+    cu.get_zone(2).temp = 19.5
+    assert refresh(cu) == ["statistiche", "zona 2"]
+
+    cu = cu.copy()
+    cu.operating_mode = 2
+    assert refresh(cu) == ["centralina", "clima 1", "statistiche"]
+
+    assert refresh(cu.copy()) == ["statistiche"]
+    assert refresh(cu.copy(), success=False) == sorted(contexts)
@@ -0,0 +1,89 @@
+"""Test dell'unione delle scritture ravvicinate."""
+
+import asyncio
+
+from proair_lib import AsyncProAir
+from proair_lib.coalescer import WriteCoalescer
+from proair_lib.testing import FakeProAirServer
+
+
+def test_burst_is_flushed_once_with_last_values():
+    """Una raffica sulla stessa chiave diventa una sola scrittura; l'ultimo valore vince."""
+    flushed = []
+
+    async def flush(key, fields) -> None:
+        flushed.append((key, dict(fields)))
+
+    async def main() -> None:
+        writes = WriteCoalescer(flush, delay=0.02)
+        await asyncio.gather(
+            writes.submit(1, t_set=20.0),
+            writes.submit(1, t_set=20.5, is_off=False),
+            writes.submit(1, t_set=21.0),
+            writes.submit(2, is_off=True),
+        )
+
+    asyncio.run(main())
+    assert sorted(flushed, key=str) == [
+        (1, {"t_set": 21.0, "is_off": False}),
+        (2, {"is_off": True}),
+    ]
+
+
+def test_flush_error_reaches_every_caller():
+    """Se la scrittura unificata fallisce, l'errore arriva a tutti i chiamanti."""
+
+    async def flush(key, fields) -> None:
+        raise ConnectionError("centralina spenta")
+
+    async def main() -> list:
+        writes = WriteCoalescer(flush, delay=0.01)
+        return await asyncio.gather(
+            writes.submit(1, t_set=20.0),
+            writes.submit(1, t_set=21.0),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert len(results) == 2
+    assert all(isinstance(r, ConnectionError) for r in results)
+
+
+def test_flush_all_sends_pending_writes_now():
+    """flush_all non attende la fine della finestra."""
+    flushed = []
+
+    async def flush(key, fields) -> None:
+        flushed.append(key)
+
+    async def main() -> None:
+        writes = WriteCoalescer(flush, delay=60)
+        pending = asyncio.create_task(writes.submit("cu", is_off=True))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(writes.flush_all(), 1)
+        await pending
+
+    asyncio.run(main())
+    assert flushed == ["cu"]
+
+
+def test_setpoint_burst_sends_one_upd_zona():
+    """Contro la centralina simulata: una raffica di setpoint invia un solo upd_zona."""
+
+    async def main() -> FakeProAirServer:
+        async with FakeProAirServer(zones=2) as server:
+            proair = AsyncProAir(
+                server.host, server.port, server.pin, write_delay=0.05
+            )
+            try:
+                await proair.get_status()
+                await asyncio.gather(
+                    *(proair.set_zone_temperature(1, t) for t in (20.0, 20.5, 21.5))
+                )
+            finally:
+                await proair.close()
+            return server
+
+    server = asyncio.run(main())
+    assert server.commands["upd_zona"] == 1
+    assert server.zones[1]["t_set"] == 215
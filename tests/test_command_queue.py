@@ -0,0 +1,129 @@
+"""Test della coda dei comandi contro la centralina simulata."""
+
+import asyncio
+
+from proair_lib import ProAirFleet
+from proair_lib.protocol import AsyncSocketClient
+from proair_lib.protocol.commands import (
+    build_get_stato,
+    build_get_stato_zona,
+    build_upd_zona,
+)
+from proair_lib.testing import FakeProAirServer
+
+
+def test_identical_reads_share_one_request():
+    """Letture identiche in coda partono una volta sola e condividono la risposta."""
+
+    async def main() -> tuple[list[dict], int, FakeProAirServer]:
+        async with FakeProAirServer(zones=2, latency={"stato_zona": 0.1}) as server:
+            client = AsyncSocketClient(server.host, server.port, pool_size=1)
+            try:
+                # Worker occupato: le letture successive restano in coda
+                busy = asyncio.create_task(
+                    client.send_command(build_get_stato_zona(server.pin, 1))
+                )
+                await asyncio.sleep(0.02)
+                results = await asyncio.gather(
+                    *(client.send_command(build_get_stato(server.pin)) for _ in range(3)),
+                    client.send_command(build_get_stato_zona(server.pin, 2)),
+                )
+                await busy
+                return results, client.queue.superseded, server
+            finally:
+                await client.close()
+
+    results, superseded, server = asyncio.run(main())
+    assert results[0] == results[1] == results[2]
+    assert results[3]["c"] == "stato_zona"
+    assert superseded == 2
+    assert server.commands == {"stato_zona": 2, "stato": 1}
+
+
+def test_write_goes_ahead_of_queued_reads():
+    """Un upd_zona accodato dopo le letture di un polling viene inviato prima."""
+
+    async def main() -> list[str]:
+        async with FakeProAirServer(zones=3, latency={"stato_zona": 0.05}) as server:
+            client = AsyncSocketClient(server.host, server.port, pool_size=1)
+            sent: list[str] = []
+            client.add_metrics_listener(lambda metrics: sent.append(metrics.command))
+            try:
+                reads = [
+                    asyncio.create_task(
+                        client.send_command(build_get_stato_zona(server.pin, zone))
+                    )
+                    for zone in (1, 2, 3)
+                ]
+                await asyncio.sleep(0.02)
+                write = build_upd_zona(server.pin, 2, "Zona 2", False, 21.0, 7, 7)
+                await client.send_command(write)
+                await asyncio.gather(*reads)
+                return sent
+            finally:
+                await client.close()
+
+    assert asyncio.run(main()) == ["stato_zona", "upd_zona", "stato_zona", "stato_zona"]
+
+
+def test_command_right_after_worker_exit_is_sent():
+    """Un comando accodato mentre l'ultimo worker termina non resta in attesa."""
+
+    async def main() -> dict:
+        async with FakeProAirServer(zones=2) as server:
+            client = AsyncSocketClient(server.host, server.port, pool_size=1)
+            done = asyncio.get_running_loop().create_future()
+
+            def on_metrics(metrics) -> None:
+                # Chiamato dal worker subito prima che esca: il chiamante
+                # riprende prima che l'event loop esegua altre callback
+                if not done.done():
+                    done.set_result(None)
+
+            client.add_metrics_listener(on_metrics)
+
+            async def poll_after_first() -> dict:
+                await done
+                return await client.send_command(build_get_stato_zona(server.pin, 1))
+
+            second = asyncio.create_task(poll_after_first())
+            await client.send_command(build_get_stato(server.pin))
+            try:
+                return await asyncio.wait_for(second, 2)
+            finally:
+                await client.close()
+
+    assert asyncio.run(main())["c"] == "stato_zona"
+
+
+def test_sync_with_older_token_is_not_superseded():
+    """Due unità sullo stesso trasporto: ognuna riceve le variazioni dal proprio token."""
+
+    async def main() -> tuple[float, float]:
+        async with FakeProAirServer(zones=2, latency={"stato_zona": 0.2}) as server:
+            fleet = ProAirFleet()
+            first = fleet.add_unit(server.host, server.port, server.pin, max_concurrency=1)
+            second = fleet.add_unit(
+                server.host, server.port, server.pin, max_concurrency=1
+            )
+            try:
+                await first.get_status()
+                server.set_zone_value(1, "t_set", 250)
+                await second.get_status()
+
+                # Worker occupato: le due stato_sync restano in coda insieme
+                busy = asyncio.create_task(first.get_zone_status(2))
+                await asyncio.sleep(0.05)
+                first_cu, second_cu = await asyncio.gather(
+                    first.get_status_sync(), second.get_status_sync()
+                )
+                await busy
+                assert not first.sync_fallback
+                return (
+                    first_cu.get_zone(1).set_temp,
+                    second_cu.get_zone(1).set_temp,
+                )
+            finally:
+                await fleet.close()
+
+    assert asyncio.run(main()) == (25.0, 25.0)
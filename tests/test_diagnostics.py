@@ -0,0 +1,42 @@
+"""Test dei diagnostics dell'integrazione (richiedono Home Assistant)."""
+
+import asyncio
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+from proair_lib.models import ControlUnit, Zone
+from proair_lib.protocol import CircuitBreaker, RateLimiter
+from proair_lib.protocol.retry import RttEstimator
+
+PIN = "4711"
+
+
+def test_pin_is_redacted(integration):
+    """Il PIN non compare nei diagnostics, né nella configurazione né nello stato."""
+    diagnostics = integration("proair.diagnostics")
+    coordinator = SimpleNamespace(
+        data=ControlUnit(pin=PIN, zones=[Zone(zone_id=1, name="Zona 1")]),
+        poll_mode="full",
+        update_interval=timedelta(seconds=30),
+        last_update_success=True,
+        last_cycle_duration=0.1,
+        scheduler=SimpleNamespace(failures=0),
+        stale=False,
+        data_age=1.0,
+        stale_limit=3,
+        proair=SimpleNamespace(
+            breaker=CircuitBreaker(), rtt=RttEstimator(), rate_limiter=RateLimiter()
+        ),
+        stats=SimpleNamespace(as_dict=lambda: {}),
+    )
+    entry = SimpleNamespace(
+        data={"host": "192.0.2.1", "port": 1235, "pin": PIN},
+        options={},
+        runtime_data=coordinator,
+    )
+
+    result = asyncio.run(diagnostics.async_get_config_entry_diagnostics(None, entry))
+
+    assert PIN not in json.dumps(result, default=str)
+    assert result["status"]["zones"][0]["name"] == "Zona 1"
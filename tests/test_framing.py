@@ -0,0 +1,93 @@
+"""Test del rilevamento della fine delle risposte JSON."""
+
+import asyncio
+import json
+
+import pytest
+
+from proair_lib.protocol import AsyncSocketClient, SocketClient
+from proair_lib.protocol.commands import build_get_stato
+from proair_lib.protocol.framing import JsonFrameReader
+from proair_lib.protocol.socket_client import SocketError
+from proair_lib.testing import FakeProAirServer
+
+RESPONSE = json.dumps(
+    {"res": 1, "name": 'sala {"grande"} \\ }', "zone": [{"nr": 1}, {"nr": 2}]}
+).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, len(RESPONSE)])
+def test_object_completes_at_closing_brace(chunk):
+    """La risposta è completa solo alla graffa finale, anche letta a pezzi.
+
+    Graffe, virgolette ed escape dentro le stringhe non contano, anche se
+    l'escape arriva a cavallo di due pezzi.
+    """
+    frame = JsonFrameReader()
+    for start in range(0, len(RESPONSE), chunk):
+        assert not frame.complete
+        frame.feed(RESPONSE[start:start + chunk])
+    assert frame.complete
+    assert frame.decode() == json.loads(RESPONSE)
+
+
+def test_bytes_after_object_are_ignored():
+    """I byte oltre l'oggetto JSON non fanno parte della risposta."""
+    frame = JsonFrameReader()
+    frame.feed(RESPONSE + b'{"res": 0}')
+    assert frame.decode() == json.loads(RESPONSE)
+
+
+def test_oversized_response_is_full():
+    """Oltre max_size il lettore si ferma senza una risposta completa."""
+    frame = JsonFrameReader(max_size=16)
+    frame.feed(RESPONSE)
+    assert frame.is_full
+    assert not frame.complete
+    assert len(frame) == 16
+
+
+def test_reset_reuses_reader():
+    """Dopo reset il lettore riparte da una risposta vuota."""
+    frame = JsonFrameReader()
+    frame.feed(b'{"res": 1, "x": "{')
+    frame.reset()
+    frame.feed(RESPONSE)
+    assert frame.decode() == json.loads(RESPONSE)
+
+
+def test_chunked_response_from_server():
+    """Risposte inviate a pezzi dalla centralina simulata, con entrambi i client."""
+
+    async def main() -> tuple[dict, dict]:
+        async with FakeProAirServer(zones=8, chunk_size=5) as server:
+            command = build_get_stato(server.pin)
+            client = AsyncSocketClient(server.host, server.port)
+            try:
+                async_status = await client.send_command(command)
+            finally:
+                await client.close()
+            sync_client = SocketClient(server.host, server.port)
+            sync_status = await asyncio.to_thread(sync_client.send_command, command)
+            return async_status, sync_status
+
+    async_status, sync_status = asyncio.run(main())
+    assert async_status == sync_status
+    assert len(async_status["zone"]) == 8
+
+
+def test_oversized_response_from_server():
+    """Una risposta oltre max_response_size è un errore, non un troncamento."""
+
+    async def main() -> None:
+        async with FakeProAirServer(zones=8) as server:
+            client = AsyncSocketClient(
+                server.host, server.port, max_response_size=64
+            )
+            try:
+                with pytest.raises(SocketError, match="oltre 64 byte"):
+                    await client.send_command(build_get_stato(server.pin))
+            finally:
+                await client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+"""Test del parsing dello stato nei modelli."""
+
+import json
+from pathlib import Path
+
+from proair_lib.models import ControlUnit, Zone
+
+CORPUS = Path(__file__).resolve().parent.parent / "benchmarks" / "corpus"
+
+
+def _corpus(name: str) -> dict:
+    return json.loads((CORPUS / name).read_text())
+
+
+def test_full_status_matches_field_table():
+    """from_status_json assegna ogni chiave al campo di FULL_FIELDS."""
+    data = _corpus("stato_8.json")
+    cu = ControlUnit.from_status_json(data)
+    expected = ControlUnit(zones=[Zone(zone_id=z["id_zona"]) for z in data["zone"]])
+    assert expected.apply_delta(data)
+    assert cu == expected
+
+
+def test_reduced_status_matches_full_status():
+    """stato_r dà gli stessi valori di stato, esclusi i dettagli zona."""
+    full = ControlUnit.from_status_json(_corpus("stato_8.json"))
+    reduced = ControlUnit.from_status_json(_corpus("stato_r_8.json"))
+    reduced.merge_details(full)
+    assert reduced == full
+
+
+def test_missing_keys_use_defaults():
+    """Le chiavi assenti valgono i default del modello."""
+    zone = Zone.from_status_json({"nr": 4, "t": 215})
+    assert zone == Zone(zone_id=4, temp=21.5)
+    cu = ControlUnit.from_status_json({"c": "stato_r", "off": 1, "zone": [{"nr": 2}]})
+    assert cu == ControlUnit(is_off=True, zones=[Zone(zone_id=2)])
+    assert cu.get_zone(2) is cu.zones[0]
@@ -0,0 +1,22 @@
+"""Test della programmazione settimanale delle zone."""
+
+import pytest
+
+from proair_lib.models.schedule import TimeBand, ZoneSchedule
+
+
+def test_unknown_day_is_rejected():
+    """Un giorno fuori da 1-7 è un errore, non viene scartato."""
+    band = TimeBand(480, 600, 21.0)
+    with pytest.raises(ValueError):
+        ZoneSchedule(1, {0: (band,)})
+    with pytest.raises(ValueError):
+        ZoneSchedule(1, {8: (band,)})
+    with pytest.raises(ValueError):
+        ZoneSchedule(1, {1: (band,)}).with_day(9, (band,))
+
+
+def test_missing_days_have_no_bands():
+    """I giorni assenti restano senza fasce."""
+    schedule = ZoneSchedule(1, {3: (TimeBand(480, 600, 21.0),)})
+    assert schedule.days[3] and not schedule.days[1]
@@ -0,0 +1,128 @@
+"""Test del circuit breaker e del rate limiter dei client."""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from proair_lib.protocol import AsyncSocketClient, SocketClient
+from proair_lib.protocol.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from proair_lib.protocol.commands import build_check_pin, build_get_stato
+from proair_lib.protocol.rate_limit import RateLimiter
+from proair_lib.protocol.socket_client import CircuitOpenError
+from proair_lib.testing import FakeProAirServer
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    return breaker
+
+
+def _free_port() -> int:
+    """Porta locale su cui non ascolta nessuno."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_breaker_opens_after_threshold():
+    """Il circuito si apre dopo failure_threshold fallimenti di fila."""
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.blocked
+    assert not breaker.allow()
+    assert breaker.trips == 1
+
+
+def test_failed_probe_doubles_cooldown():
+    """A fine pausa passa una sola sonda; se fallisce la pausa raddoppia."""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.01, max_cooldown=0.03)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()      # una sonda alla volta
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.cooldown == 0.02
+    time.sleep(0.03)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.cooldown == 0.03     # limitata a max_cooldown
+    time.sleep(0.04)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.cooldown == 0.01
+
+
+def test_client_fails_fast_then_probes():
+    """Centralina giù: errori immediati; quando torna, prima la sonda e poi il comando."""
+    port = _free_port()
+
+    async def main() -> tuple[CircuitBreaker, FakeProAirServer]:
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=0.2)
+        client = AsyncSocketClient(
+            "127.0.0.1", port, breaker=breaker, probe=build_check_pin("0000")
+        )
+        try:
+            with pytest.raises(CircuitOpenError):
+                await client.send_command(build_get_stato("0000"))
+            assert breaker.state == STATE_OPEN
+
+            start = time.monotonic()
+            with pytest.raises(CircuitOpenError):
+                await client.send_command(build_get_stato("0000"))
+            assert time.monotonic() - start < 0.1
+
+            async with FakeProAirServer(zones=1, port=port) as server:
+                await asyncio.sleep(breaker.remaining)
+                status = await client.send_command(build_get_stato(server.pin))
+            assert status["res"] == 1
+            return breaker, server
+        finally:
+            await client.close()
+
+    breaker, server = asyncio.run(main())
+    assert breaker.state == STATE_CLOSED
+    assert server.commands == {"check_pin": 1, "stato": 1}
+
+
+def test_open_circuit_takes_no_token():
+    """Un comando rifiutato a circuito aperto non consuma token."""
+    limiter = RateLimiter(burst=1)
+    client = SocketClient("127.0.0.1", breaker=_open_breaker(), rate_limiter=limiter)
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            client.send_command(build_get_stato("0000"))
+    assert limiter.tokens == 1
+
+
+def test_open_circuit_takes_no_token_async():
+    """Come sopra, con il client asyncio."""
+    limiter = RateLimiter(burst=1)
+
+    async def main() -> None:
+        client = AsyncSocketClient(
+            "127.0.0.1", breaker=_open_breaker(), rate_limiter=limiter
+        )
+        for _ in range(3):
+            with pytest.raises(CircuitOpenError):
+                await client.send_command(build_get_stato("0000"))
+
+    asyncio.run(main())
+    assert limiter.tokens == 1